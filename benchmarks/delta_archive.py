@@ -0,0 +1,197 @@
+"""
+Delta archive benchmark: disk size and read time against JSONStorage snapshots
+
+Builds an evolving hourly history per location from a stand-in page (each
+refresh drops the past hour, adds a new one and revises a share of the
+rest), saves it with JSONStorage and into a delta archive per codec, then
+compares bytes on disk, full-history reads and random single-snapshot reads.
+
+    python -m benchmarks.delta_archive
+    python -m benchmarks.delta_archive --snapshots 336 --locations 5 --json bench_output.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.parsers.bbc_parser import BBCWeatherParser
+from src.standin.pages import build_page
+from src.storage.delta_archive import DeltaArchive, _CODECS
+from src.storage.json_storage import JSONStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+
+LOCATIONS = ("2643743", "2643123", "2653822", "2655603", "2644210", "2650225", "2641673", "2638077")
+
+# Share of the remaining hours revised at each refresh
+REVISED = 0.15
+
+
+def evolving_history(location_id: str, snapshots: int, seed: int = 0) -> Iterator[dict]:
+    rng = random.Random(f"{location_id}:{seed}")
+    issued = datetime(2025, 1, 6, 6, tzinfo=timezone.utc)
+    base = BBCWeatherParser().parse_html(build_page(location_id, issued_at=issued), location_id)
+    snapshot = base.model_dump(mode="json")
+
+    for _ in range(snapshots):
+        yield snapshot
+        snapshot = copy.deepcopy(snapshot)
+        issued += timedelta(hours=1)
+        snapshot["last_updated"] = snapshot["issue_date"] = issued.isoformat().replace("+00:00", "Z")
+
+        hours = snapshot["hourly_forecast"]
+        last = hours[-1]
+        added = dict(last)
+        when = datetime.fromisoformat(f"{last['local_date']}T{last['timeslot']}") + timedelta(hours=1)
+        added["local_date"], added["timeslot"] = when.date().isoformat(), when.strftime("%H:%M")
+        hours = hours[1:] + [added]
+
+        for report in rng.sample(hours, int(len(hours) * REVISED)):
+            report["temperature_c"] += rng.choice((-1, 1))
+            report["temperature_f"] = round(report["temperature_c"] * 9 / 5 + 32)
+            report["precipitation_probability_percent"] = min(100, max(0, report["precipitation_probability_percent"] + rng.choice((-10, -5, 5, 10))))
+            report["wind_speed_kph"] = max(0, report["wind_speed_kph"] + rng.choice((-2, 0, 2)))
+        snapshot["hourly_forecast"] = hours
+        snapshot["current_conditions"] = hours[0]
+
+
+def directory_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def run(snapshots: int, locations: int, keyframe_interval: int, reads: int) -> List[dict]:
+    from src.models.weather import WeatherData
+
+    results = []
+    location_ids = LOCATIONS[:locations]
+    histories = {location_id: list(evolving_history(location_id, snapshots)) for location_id in location_ids}
+    rng = random.Random(1)
+    picks = [(rng.choice(location_ids), rng.randrange(snapshots)) for _ in range(reads)]
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        root = Path(tmp)
+        settings.storage_layout = "flat"
+        logger.remove()
+
+        storage = JSONStorage(root / "json")
+        paths = {location_id: [] for location_id in location_ids}
+        start = time.perf_counter()
+        for location_id, history in histories.items():
+            for i, snapshot in enumerate(history):
+                paths[location_id].append(
+                    asyncio.run(storage.save(WeatherData(**snapshot), f"weather_{location_id}_{i:05d}"))
+                )
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for location_id in location_ids:
+            for path in paths[location_id]:
+                with open(path, encoding="utf-8") as f:
+                    json.load(f)
+        history_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for location_id, index in picks:
+            with open(paths[location_id][index], encoding="utf-8") as f:
+                json.load(f)
+        random_s = time.perf_counter() - start
+
+        json_bytes = directory_bytes(root / "json")
+        results.append(
+            {
+                "format": "json (JSONStorage)",
+                "bytes": json_bytes,
+                "ratio": 1.0,
+                "write_ms_per_snapshot": write_s / (snapshots * locations) * 1000,
+                "history_ms_per_snapshot": history_s / (snapshots * locations) * 1000,
+                "random_read_ms": random_s / reads * 1000,
+            }
+        )
+
+        for codec in _CODECS:
+            try:
+                archive = DeltaArchive(root / codec, codec=codec, keyframe_interval=keyframe_interval)
+            except Exception as e:
+                results.append({"format": f"deltas ({codec})", "error": str(e)})
+                continue
+
+            start = time.perf_counter()
+            for history in histories.values():
+                for snapshot in history:
+                    archive.append(snapshot)
+            write_s = time.perf_counter() - start
+
+            # A fresh reader, so header scans are part of the measured reads
+            archive = DeltaArchive(root / codec, codec=codec, keyframe_interval=keyframe_interval)
+            start = time.perf_counter()
+            for location_id in location_ids:
+                for restored, original in zip(archive.history(location_id), histories[location_id]):
+                    if restored != original:
+                        raise AssertionError(f"{codec} history of {location_id} does not round-trip")
+            history_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for location_id, index in picks:
+                archive.get(location_id, index)
+            random_s = time.perf_counter() - start
+
+            size = directory_bytes(root / codec)
+            results.append(
+                {
+                    "format": f"deltas ({codec})",
+                    "bytes": size,
+                    "ratio": round(json_bytes / size, 1),
+                    "write_ms_per_snapshot": write_s / (snapshots * locations) * 1000,
+                    "history_ms_per_snapshot": history_s / (snapshots * locations) * 1000,
+                    "random_read_ms": random_s / reads * 1000,
+                }
+            )
+
+    for result in results:
+        for key in ("write_ms_per_snapshot", "history_ms_per_snapshot", "random_read_ms"):
+            if key in result:
+                result[key] = round(result[key], 3)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--snapshots", type=int, default=168, help="Hourly snapshots per location")
+    parser.add_argument("--locations", type=int, default=3, help=f"Locations (at most {len(LOCATIONS)})")
+    parser.add_argument("--keyframe-interval", type=int, default=24, help="Snapshots per keyframe")
+    parser.add_argument("--reads", type=int, default=200, help="Random single-snapshot reads")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.snapshots, min(args.locations, len(LOCATIONS)), args.keyframe_interval, args.reads)
+
+    print(f"{'Format':<20} {'MB':<9} {'x smaller':<10} {'write ms':<10} {'history ms':<11} {'random ms':<10}")
+    print("-" * 74)
+    for result in results:
+        if "error" in result:
+            print(f"{result['format']:<20} skipped: {result['error']}")
+            continue
+        print(
+            f"{result['format']:<20} {result['bytes'] / 1e6:<9.2f} {result['ratio']:<10} "
+            f"{result['write_ms_per_snapshot']:<10} {result['history_ms_per_snapshot']:<11} {result['random_read_ms']:<10}"
+        )
+    print("history ms: per snapshot when reading a location's whole history; random ms: one arbitrary snapshot")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Import-time regression benchmark for CLI startup paths
+
+Runs each scenario in a fresh interpreter with ``-X importtime`` and fails
+when the cumulative import time exceeds its budget or a heavy engine module
+is imported where it should not be.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules only the scrapers and analytics need; none of these belong on the startup path
+HEAVY_MODULES = ("scrapy", "twisted", "playwright", "scrapy_playwright", "numpy")
+
+SCENARIOS = [
+    {
+        "name": "cli_import",
+        "args": ["-c", "import src.main"],
+        "budget_ms": 600,
+    },
+    {
+        "name": "cli_help",
+        "args": ["-m", "src.main", "--help"],
+        "budget_ms": 650,
+    },
+    {
+        "name": "parser_import",
+        "args": ["-c", "import src.parsers.bbc_parser"],
+        "budget_ms": 600,
+    },
+]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map module name to cumulative import time in microseconds"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.rstrip()] = int(cumulative)
+
+    return modules
+
+
+def total_import_us(stderr: str) -> int:
+    # Top-level entries have no indentation; their cumulative times add up to the total
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total += int(cumulative)
+
+    return total
+
+
+def run_scenario(scenario: dict, runs: int, budget_scale: float = 1.0) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    totals: List[float] = []
+    heavy: set = set()
+
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *scenario["args"]],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{scenario['name']} failed:\n{proc.stderr[-2000:]}")
+
+        modules = parse_importtime(proc.stderr)
+        totals.append(total_import_us(proc.stderr) / 1000)
+        heavy.update(
+            name.strip()
+            for name in modules
+            if name.strip().split(".")[0] in HEAVY_MODULES
+        )
+
+    median_ms = statistics.median(totals)
+    budget_ms = scenario["budget_ms"] * budget_scale
+
+    return {
+        "name": scenario["name"],
+        "runs": runs,
+        "median_ms": round(median_ms, 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "budget_ms": round(budget_ms, 1),
+        "heavy_modules": sorted(heavy),
+        "passed": median_ms <= budget_ms and not heavy,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="Multiply budgets, e.g. 2.0 on slow CI"
+    )
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [run_scenario(scenario, args.runs, args.budget_scale) for scenario in SCENARIOS]
+
+    print(f"{'Scenario':<16} {'Median (ms)':<12} {'Budget (ms)':<12} {'Result':<8}")
+    print("-" * 60)
+    for result in results:
+        status = "OK" if result["passed"] else "FAIL"
+        print(f"{result['name']:<16} {result['median_ms']:<12} {result['budget_ms']:<12} {status:<8}")
+        if result["heavy_modules"]:
+            print(f"  heavy imports: {', '.join(result['heavy_modules'][:5])}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    return 0 if all(result["passed"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
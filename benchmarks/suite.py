@@ -0,0 +1,363 @@
+"""
+Offline benchmark suite with per-stage timings
+
+Serves recorded (or synthetic) BBC Weather pages from the local stand-in and
+runs each scenario N times, timing every stage of a scrape: browser launch,
+navigation, readiness wait, content retrieval, JSON extraction, model
+validation and storage. Reports p50/p95/p99 per stage and end-to-end
+throughput, and writes JSON that can be compared across commits.
+
+    python -m benchmarks.suite --runs 50 --scenario parse
+    python -m benchmarks.suite --runs 20 --json bench_new.json --compare bench_old.json
+    python -m benchmarks.suite --scenario logging
+
+Scenarios:
+    parse    - fetch the page over HTTP and run the parse/storage stages
+    browser  - full Playwright path against the local server (needs Chromium)
+    logging  - per-call logger cost on the calling thread, development vs
+               production mode, including tail latency while logs rotate
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.standin.server import StandInServer
+from src.utils import logger as logger_module
+from src.utils.config import settings
+
+SCENARIOS = ["parse", "browser", "logging"]
+STAGES = [
+    "browser_launch",
+    "navigation",
+    "readiness_wait",
+    "content_retrieval",
+    "json_extraction",
+    "model_validation",
+    "storage",
+]
+LOG_MODES = ("development", "production")
+LOG_STAGES = [
+    "debug_suppressed_fstring",
+    "debug_suppressed_lazy",
+    *(f"{stage}_{mode}" for mode in LOG_MODES for stage in ("info", "exception", "info_rotating")),
+]
+# Log calls timed per stage in each run; exceptions format a traceback, so fewer
+LOG_CALLS = 100
+LOG_EXCEPTION_CALLS = 5
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    # Nearest-rank, so p99 of a small run is its slowest sample rather than an interpolation
+    rank = max(1, min(len(ordered), int(round(pct / 100 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> dict:
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+async def parse_stages(timer: StageTimer, html: str, location_name: str, storage, run: int):
+    from src.models.weather import BBCWeatherResponse, WeatherData
+    from src.parsers.bbc_parser import BBCWeatherParser
+
+    parser = BBCWeatherParser()
+
+    with timer.stage("json_extraction"):
+        raw = parser.extract_raw_json(html)
+
+    with timer.stage("model_validation"):
+        response = BBCWeatherResponse(**raw)
+        if not parser.validate_response(response):
+            raise RuntimeError("Fixture page failed response validation")
+        weather_data = WeatherData.from_bbc_response(response, location_name)
+
+    with timer.stage("storage"):
+        await storage.save(weather_data, f"bench_{run}")
+
+
+async def run_parse(base_url: str, location_id: str, runs: int, warmup: int, storage) -> StageTimer:
+    import httpx
+
+    timer = StageTimer()
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for run in range(warmup + runs):
+            run_timer = timer if run >= warmup else StageTimer()
+            with run_timer.stage("total"):
+                with run_timer.stage("content_retrieval"):
+                    response = await client.get(f"/{location_id}")
+                    response.raise_for_status()
+                    html = response.text
+                await parse_stages(run_timer, html, "Benchmark", storage, run)
+    return timer
+
+
+async def run_browser(location_id: str, runs: int, warmup: int, storage) -> StageTimer:
+    from src.services.browser_service import BrowserService
+
+    timer = StageTimer()
+    url = settings.get_weather_url(location_id)
+
+    for run in range(warmup + runs):
+        run_timer = timer if run >= warmup else StageTimer()
+        browser_service = BrowserService()
+        try:
+            with run_timer.stage("total"):
+                with run_timer.stage("browser_launch"):
+                    await browser_service.initialize()
+                    page = await browser_service.new_page()
+
+                with run_timer.stage("navigation"):
+                    await browser_service.navigate(page, url)
+                with run_timer.stage("readiness_wait"):
+                    await browser_service.wait_until_ready(page, url)
+                with run_timer.stage("content_retrieval"):
+                    html = await browser_service.get_content(page)
+
+                await browser_service.close_page(page)
+                await parse_stages(run_timer, html, "Benchmark", storage, run)
+        finally:
+            await browser_service.cleanup()
+
+    return timer
+
+
+def configure_logging(mode: str, level: str, log_file: Path, rotation: str = "10 MB"):
+    settings.log_mode = mode
+    settings.log_level = level
+    settings.log_rotation = rotation
+    settings.log_file = log_file
+    logger_module.setup_logger()
+
+
+def run_logging(runs: int, warmup: int, log_dir: Path) -> StageTimer:
+    from src.utils.logger import logger
+
+    timer = StageTimer()
+    page = "x" * 2_000_000
+    message = "Weather data saved to: " + "x" * 200
+
+    def failing():
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Scrape failed")
+
+    # Console output goes to a buffer; the sink cost is still paid by the caller
+    with contextlib.redirect_stderr(io.StringIO()):
+        for mode in LOG_MODES:
+            plain = log_dir / f"{mode}.log"
+            # Small rotation size so zip compression runs repeatedly during the stage
+            rotating = log_dir / f"rotating_{mode}" / "bench.log"
+            cases = [
+                (f"info_{mode}", plain, "10 MB", lambda: logger.info("Navigation completed successfully"), LOG_CALLS),
+                (f"exception_{mode}", plain, "10 MB", failing, LOG_EXCEPTION_CALLS),
+                (f"info_rotating_{mode}", rotating, "64 KB", lambda: logger.info(message), LOG_CALLS),
+            ]
+            if mode == "development":
+                cases[:0] = [
+                    (
+                        "debug_suppressed_fstring",
+                        plain,
+                        "10 MB",
+                        lambda: logger.debug(f"Retrieved HTML content ({len(page)} characters) from {settings.bbc_weather_base_url}"),
+                        LOG_CALLS,
+                    ),
+                    (
+                        "debug_suppressed_lazy",
+                        plain,
+                        "10 MB",
+                        lambda: logger.debug("Retrieved HTML content ({} characters) from {}", len(page), settings.bbc_weather_base_url),
+                        LOG_CALLS,
+                    ),
+                ]
+
+            for name, log_file, rotation, call, calls in cases:
+                configure_logging(mode, "INFO", log_file, rotation)
+                for run in range(warmup + runs):
+                    run_timer = timer if run >= warmup else StageTimer()
+                    for _ in range(calls):
+                        with run_timer.stage(name):
+                            call()
+                # Drain the background queue so the next stage starts clean
+                logger.complete()
+
+    timer.samples["total"] = [sample for name in LOG_STAGES for sample in timer.samples.get(name, [])]
+    return timer
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(scenario: str, timer: StageTimer, runs: int, location_id: str) -> dict:
+    stages = {
+        name: summarize(timer.samples[name]) for name in STAGES + LOG_STAGES if name in timer.samples
+    }
+    total = summarize(timer.samples["total"])
+    return {
+        "scenario": scenario,
+        "location_id": location_id,
+        "runs": runs,
+        "stages": stages,
+        "total": total,
+        "throughput_per_s": round(1000 / total["mean_ms"], 3) if total["mean_ms"] else None,
+    }
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    print(f"\nScenario: {report['scenario']} ({report['runs']} runs)")
+    header = f"{'Stage':<26} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+    if baseline:
+        header += f" {'p50 delta':>11}"
+    print(header)
+    print("-" * len(header))
+
+    rows = list(report["stages"].items()) + [("total", report["total"])]
+    base_rows = {}
+    if baseline:
+        base_rows = dict(baseline["stages"], total=baseline["total"])
+
+    for name, stats in rows:
+        line = (
+            f"{name:<26} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+            f"{stats['p99_ms']:>10.3f} {stats['max_ms']:>10.3f}"
+        )
+        if name in base_rows and base_rows[name]["p50_ms"]:
+            change = (stats["p50_ms"] - base_rows[name]["p50_ms"]) / base_rows[name]["p50_ms"]
+            line += f" {change:>+10.1%}"
+        print(line)
+
+    if report["scenario"] != "logging":
+        print(f"Throughput: {report['throughput_per_s']} scrapes/s")
+
+
+async def run(args) -> dict:
+    results = {
+        "metadata": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "runs": args.runs,
+            "warmup": args.warmup,
+        },
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp, StandInServer() as server:
+        tmp_dir = Path(tmp)
+        settings.output_dir = tmp_dir / "data"
+        settings.log_file = tmp_dir / "bench.log"
+        settings.log_level = "WARNING"
+        settings.bbc_weather_base_url = server.base_url
+        settings.browser_daemon_enabled = False
+        if args.page_load_wait is not None:
+            settings.page_load_wait = args.page_load_wait
+        logger_module.setup_logger()
+
+        from src.storage.json_storage import JSONStorage
+
+        storage = JSONStorage(settings.output_dir)
+
+        for scenario in args.scenarios:
+            try:
+                if scenario == "parse":
+                    timer = await run_parse(server.base_url, args.location_id, args.runs, args.warmup, storage)
+                elif scenario == "logging":
+                    log_mode = settings.log_mode
+                    timer = run_logging(args.runs, args.warmup, tmp_dir / "logging")
+                    configure_logging(log_mode, "WARNING", tmp_dir / "bench.log")
+                else:
+                    timer = await run_browser(args.location_id, args.runs, args.warmup, storage)
+            except Exception as e:
+                print(f"[SKIP] {scenario}: {e}", file=sys.stderr)
+                continue
+            results["scenarios"][scenario] = build_report(scenario, timer, args.runs, args.location_id)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured runs before timing")
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        help="Scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--location-id", default="2643743", help="Recording to serve")
+    parser.add_argument(
+        "--page-load-wait",
+        type=int,
+        help="Override PAGE_LOAD_WAIT (ms) for the browser scenario",
+    )
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON to show p50 changes against")
+    args = parser.parse_args(argv)
+    args.scenarios = args.scenarios or SCENARIOS
+
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"Comparing against {args.compare} (commit {baseline['metadata'].get('commit')})")
+
+    for scenario, report in results["scenarios"].items():
+        base_report = baseline["scenarios"].get(scenario) if baseline else None
+        print_report(report, base_report)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
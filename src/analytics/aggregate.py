@@ -0,0 +1,199 @@
+"""
+Vectorized daily, regional, ranking and threshold-alert aggregates over a ForecastFrame
+"""
+
+import operator
+import re
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from .derived import DERIVED
+from .frame import METRICS, ForecastFrame
+
+STATS = ("min", "max", "mean")
+
+_OPERATORS = {">=": operator.ge, ">": operator.gt, "<=": operator.le, "<": operator.lt}
+_THRESHOLD = re.compile(r"^\s*(\w+)\s*(>=|<=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def _groups(*keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row order that makes equal key tuples contiguous, and where each group starts"""
+    order = np.lexsort(keys[::-1])
+    if not len(order):
+        return order, order
+    changed = np.zeros(len(order), dtype=bool)
+    changed[0] = True
+    for key in keys:
+        sorted_key = key[order]
+        changed[1:] |= sorted_key[1:] != sorted_key[:-1]
+    return order, np.flatnonzero(changed)
+
+
+def _reduce(values: np.ndarray, order: np.ndarray, starts: np.ndarray, stat: str) -> np.ndarray:
+    grouped = values[order]
+    if stat == "min":
+        return np.fmin.reduceat(grouped, starts)
+    if stat == "max":
+        return np.fmax.reduceat(grouped, starts)
+    present = ~np.isnan(grouped)
+    totals = np.add.reduceat(np.where(present, grouped, 0), starts)
+    counts = np.add.reduceat(present, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts
+
+
+class DailyAggregates:
+    """One row per (group, day); stats are keyed '<metric>_<min|max|mean>'"""
+
+    def __init__(self, groups: np.ndarray, labels: np.ndarray, names: np.ndarray, date: np.ndarray, stats: Dict[str, np.ndarray]):
+        self.groups = groups
+        self.labels = labels
+        self.names = names
+        self.date = date
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def __getitem__(self, stat: str) -> np.ndarray:
+        return self.stats[stat]
+
+    def on(self, day) -> "DailyAggregates":
+        mask = self.date == np.datetime64(day, "D")
+        return DailyAggregates(
+            self.groups[mask], self.labels, self.names, self.date[mask],
+            {stat: column[mask] for stat, column in self.stats.items()},
+        )
+
+    def to_records(self, indices: Optional[np.ndarray] = None) -> List[dict]:
+        indices = np.arange(len(self)) if indices is None else indices
+        records = []
+        for i in indices.tolist():
+            record = {
+                "id": str(self.labels[self.groups[i]]),
+                "name": str(self.names[self.groups[i]]),
+                "date": str(self.date[i]),
+            }
+            for stat, column in self.stats.items():
+                value = column[i]
+                record[stat] = None if np.isnan(value) else round(float(value), 2)
+            records.append(record)
+        return records
+
+
+def daily(frame: ForecastFrame) -> DailyAggregates:
+    """Min/max/mean of every metric per location per local day"""
+    order, starts = _groups(frame.row_location, frame.date.astype(np.int64))
+    stats = {
+        f"{metric}_{stat}": _reduce(frame[metric], order, starts, stat)
+        for metric in frame.values
+        for stat in STATS
+    }
+    first = order[starts]
+    return DailyAggregates(
+        frame.row_location[first], frame.location_ids, frame.location_names, frame.date[first], stats
+    )
+
+
+def regional(days: DailyAggregates, regions: Optional[Mapping[str, str]] = None) -> DailyAggregates:
+    """Combine per-location days into per-region days: min of mins, max of maxes, mean of means.
+
+    regions maps location ID to region name; unmapped locations fall into 'other',
+    and with no mapping everything is one 'all' region.
+    """
+    location_region = np.array(
+        [regions.get(str(location_id), "other") if regions else "all" for location_id in days.labels],
+        dtype=str,
+    )
+    labels, region_index = np.unique(location_region, return_inverse=True)
+    row_region = region_index[days.groups] if len(days) else days.groups
+    order, starts = _groups(row_region, days.date.astype(np.int64))
+
+    stats = {}
+    for key, column in days.stats.items():
+        stats[key] = _reduce(column, order, starts, key.rsplit("_", 1)[1])
+
+    first = order[starts]
+    return DailyAggregates(row_region[first], labels, labels, days.date[first], stats)
+
+
+def rank(days: DailyAggregates, stat: str, day=None, n: int = 20, largest: bool = True) -> List[dict]:
+    """Top n rows by one stat, e.g. rank(days, 'gust_speed_kph_max', tomorrow) for the windiest"""
+    if day is not None:
+        days = days.on(day)
+    values = days[stat]
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid) or n <= 0:
+        return []
+
+    keyed = -values[valid] if largest else values[valid]
+    if len(valid) > n:
+        # argpartition keeps this linear; only the n winners get sorted
+        top = np.argpartition(keyed, n - 1)[:n]
+        valid, keyed = valid[top], keyed[top]
+    return days.to_records(valid[np.argsort(keyed, kind="stable")])
+
+
+class Threshold(BaseModel):
+    metric: str
+    op: str
+    value: float
+
+    def __str__(self) -> str:
+        return f"{self.metric}{self.op}{self.value:g}"
+
+
+def parse_threshold(text: str) -> Threshold:
+    match = _THRESHOLD.match(text)
+    metrics = (*METRICS, *DERIVED)
+    if not match or match.group(1) not in metrics:
+        raise ValueError(f"Invalid threshold '{text}', expected e.g. gust_speed_kph>=60 with one of: {', '.join(metrics)}")
+    return Threshold(metric=match.group(1), op=match.group(2), value=float(match.group(3)))
+
+
+class Alert(BaseModel):
+    location_id: str
+    location_name: str
+    threshold: str
+    first_date: date
+    first_hour: int
+    peak: float
+    hours: int
+
+
+def alerts(frame: ForecastFrame, thresholds: List[Threshold]) -> List[Alert]:
+    """Per location and threshold: when it is first crossed, the peak value and hours affected"""
+    results = []
+    for threshold in thresholds:
+        values = frame[threshold.metric]
+        hits = np.flatnonzero(_OPERATORS[threshold.op](values, threshold.value))
+        if not len(hits):
+            continue
+
+        locations = frame.row_location[hits]
+        # Sort hits by location then time so each group's first row is the earliest
+        order = np.lexsort((frame.hour[hits], frame.date[hits], locations))
+        hits, locations = hits[order], locations[order]
+        starts = np.flatnonzero(np.r_[True, locations[1:] != locations[:-1]])
+        counts = np.diff(np.r_[starts, len(hits)])
+        reducer = np.fmax if threshold.op in (">", ">=") else np.fmin
+        peaks = reducer.reduceat(values[hits], starts)
+
+        for start, count, peak in zip(starts.tolist(), counts.tolist(), peaks.tolist()):
+            row = hits[start]
+            location = frame.row_location[row]
+            results.append(
+                Alert(
+                    location_id=str(frame.location_ids[location]),
+                    location_name=str(frame.location_names[location]),
+                    threshold=str(threshold),
+                    first_date=frame.date[row].item(),
+                    first_hour=int(frame.hour[row]),
+                    peak=peak,
+                    hours=count,
+                )
+            )
+    return results
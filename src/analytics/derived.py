@@ -0,0 +1,114 @@
+"""
+Derived weather metrics (dew point, heat index, wind chill, pressure tendency) as array operations
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.models.weather import DERIVED_FIELDS, WeatherData
+
+DERIVED = DERIVED_FIELDS
+
+# Pressure tendency is the change over the previous three hours, as in synoptic reports
+TENDENCY_HOURS = 3
+
+
+def dew_point(temperature_c: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """Magnus formula (Alduchov & Eskridge constants)"""
+    a, b = 17.625, 243.04
+    relative = np.clip(humidity, 1, 100) / 100.0
+    gamma = np.log(relative) + a * temperature_c / (b + temperature_c)
+    return b * gamma / (a - gamma)
+
+
+def heat_index(temperature_c: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """NWS heat index: Steadman's simple form, Rothfusz regression from 80°F upwards"""
+    t = temperature_c * 9 / 5 + 32
+    rh = humidity.astype(np.float64)
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+        - 0.00683783 * t * t - 0.05481717 * rh * rh + 0.00122874 * t * t * rh
+        + 0.00085282 * t * rh * rh - 0.00000199 * t * t * rh * rh
+    )
+    dry = (rh < 13) & (t >= 80) & (t <= 112)
+    full = np.where(dry, full - (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), full)
+    humid = (rh > 85) & (t >= 80) & (t <= 87)
+    full = np.where(humid, full + (rh - 85) / 10 * (87 - t) / 5, full)
+
+    index_f = np.where((simple + t) / 2 >= 80, full, simple)
+    return (index_f - 32) * 5 / 9
+
+
+def wind_chill(temperature_c: np.ndarray, wind_kph: np.ndarray) -> np.ndarray:
+    """North American wind chill index; NaN where it is undefined (above 10°C or below 4.8 km/h)"""
+    v = np.power(np.clip(wind_kph, 0, None), 0.16)
+    chill = 13.12 + 0.6215 * temperature_c - 11.37 * v + 0.3965 * temperature_c * v
+    return np.where((temperature_c <= 10) & (wind_kph > 4.8), chill, np.nan)
+
+
+def pressure_tendency(pressure: np.ndarray, hours: np.ndarray, groups: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pressure change over the previous TENDENCY_HOURS within each forecast.
+
+    hours is the row time in hours on any common origin and groups identifies
+    the forecast each row belongs to. Gaps are linearly interpolated; rows
+    with no history far enough back get NaN.
+    """
+    if not len(pressure):
+        return np.empty(0)
+    groups = np.zeros(len(pressure), dtype=np.int64) if groups is None else groups.astype(np.int64)
+    hours = hours.astype(np.float64)
+
+    # Offset each group onto its own stretch of the time axis so one interp call serves them all
+    span = hours.max() - hours.min() + 2 * TENDENCY_HOURS + 1
+    timeline = (hours - hours.min()) + groups * span
+    order = np.argsort(timeline, kind="stable")
+    earlier = np.interp(timeline - TENDENCY_HOURS, timeline[order], pressure[order].astype(np.float64))
+
+    starts = np.full(groups.max() + 1, np.inf)
+    np.minimum.at(starts, groups, timeline)
+    has_history = timeline - TENDENCY_HOURS >= starts[groups]
+    return np.where(has_history, pressure - earlier, np.nan)
+
+
+def derived_columns(
+    temperature_c: np.ndarray,
+    humidity: np.ndarray,
+    wind_kph: np.ndarray,
+    pressure: np.ndarray,
+    hours: np.ndarray,
+    groups: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    temperature_c = temperature_c.astype(np.float64)
+    return {
+        "dew_point_c": dew_point(temperature_c, humidity),
+        "heat_index_c": heat_index(temperature_c, humidity),
+        "wind_chill_c": wind_chill(temperature_c, wind_kph),
+        "pressure_tendency_mb": pressure_tendency(pressure, hours, groups),
+    }
+
+
+def add_derived_metrics(data: WeatherData) -> WeatherData:
+    """Fill the derived fields of every hourly report in place"""
+    reports = data.hourly_forecast
+    if not reports:
+        return data
+
+    columns = derived_columns(
+        np.array([r.temperature_c for r in reports], dtype=np.float64),
+        np.array([r.humidity for r in reports], dtype=np.float64),
+        np.array([r.wind_speed_kph for r in reports], dtype=np.float64),
+        np.array([r.pressure for r in reports], dtype=np.float64),
+        np.array([r.local_date.toordinal() * 24 + int(r.timeslot[:2]) for r in reports], dtype=np.float64),
+    )
+    rounded = {name: np.round(values, 1).tolist() for name, values in columns.items()}
+
+    for i, report in enumerate(reports):
+        for name in DERIVED:
+            value = rounded[name][i]
+            setattr(report, name, None if value != value else value)
+
+    # current_conditions is the first hourly report object, so it is already filled
+    return data
@@ -0,0 +1,251 @@
+"""
+Forecast snapshot diffs: rows aligned by (local_date, timeslot) and compared as arrays
+"""
+
+import hashlib
+import json
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.models.exceptions import StorageException
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+NUMERIC_FIELDS = (
+    "temperature_c",
+    "temperature_f",
+    "feels_like_temperature_c",
+    "feels_like_temperature_f",
+    "weather_type",
+    "extended_weather_type",
+    "precipitation_probability_percent",
+    "wind_speed_kph",
+    "wind_speed_mph",
+    "gust_speed_kph",
+    "gust_speed_mph",
+    "humidity",
+    "pressure",
+    "timeslot_length",
+)
+TEXT_FIELDS = (
+    "enhanced_weather_description",
+    "weather_type_text",
+    "precipitation_probability_text",
+    "wind_direction",
+    "wind_direction_abbreviation",
+    "wind_direction_full",
+    "wind_description",
+    "visibility",
+)
+# Derived metrics are left out: they change exactly when their inputs do
+FIELDS = NUMERIC_FIELDS + TEXT_FIELDS
+_TEMPERATURE = FIELDS.index("temperature_c")
+
+forecast_diffs = metrics.counter("forecast_diffs_total", "Snapshots diffed against the previous one")
+forecast_rows_changed = metrics.counter("forecast_rows_changed_total", "Hourly rows changed between snapshots")
+
+
+@lru_cache(maxsize=8192)
+def _text_code(value: str) -> int:
+    # Text becomes a stable 63-bit code so a whole row compares as one integer vector
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little") >> 1
+
+
+def _row_key(local_date: str, timeslot: str) -> int:
+    hours, minutes = timeslot.split(":")
+    return date.fromisoformat(local_date).toordinal() * 1440 + int(hours) * 60 + int(minutes)
+
+
+def _key_label(key: int) -> str:
+    day, minutes = divmod(int(key), 1440)
+    return f"{date.fromordinal(day).isoformat()} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def slot_label(local_date: str, timeslot: str) -> str:
+    """The slot string a ForecastDiff uses for an hourly row"""
+    return _key_label(_row_key(local_date, timeslot))
+
+
+class SnapshotArrays:
+    """One snapshot as a sorted key vector and a rows x FIELDS int64 matrix"""
+
+    def __init__(self, location_id: str, last_updated: str, keys: np.ndarray, values: np.ndarray):
+        order = np.argsort(keys, kind="stable")
+        self.location_id = location_id
+        self.last_updated = last_updated
+        self.keys = keys[order]
+        self.values = values[order]
+
+    @classmethod
+    def from_rows(cls, location_id: str, last_updated: str, rows: List[dict]) -> "SnapshotArrays":
+        """rows are hourly reports as dicts keyed by field name, as in saved JSON"""
+        keys = np.fromiter((_row_key(str(r["local_date"]), r["timeslot"]) for r in rows), np.int64, len(rows))
+        values = np.empty((len(rows), len(FIELDS)), dtype=np.int64)
+        for column, field in enumerate(NUMERIC_FIELDS):
+            values[:, column] = [r.get(field) or 0 for r in rows]
+        for column, field in enumerate(TEXT_FIELDS, len(NUMERIC_FIELDS)):
+            values[:, column] = [_text_code(r.get(field) or "") for r in rows]
+        return cls(location_id, last_updated, keys, values)
+
+    @classmethod
+    def from_weather(cls, data: WeatherData) -> "SnapshotArrays":
+        rows = [report.__dict__ for report in data.hourly_forecast]
+        return cls.from_rows(data.location_id, data.last_updated.isoformat(), rows)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SnapshotArrays":
+        """Read a saved snapshot without building pydantic models (CSV goes through CSVStorage)"""
+        if path.suffix == ".csv":
+            import asyncio
+            from src.storage.csv_storage import CSVStorage
+
+            return cls.from_weather(asyncio.run(CSVStorage(path.parent).load(path)))
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_rows(data["location_id"], data["last_updated"], data.get("hourly_forecast", []))
+
+    def save(self, path: Path):
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, keys=self.keys, values=self.values, meta=np.array([self.location_id, self.last_updated]))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SnapshotArrays":
+        with np.load(path) as arrays:
+            location_id, last_updated = arrays["meta"].tolist()
+            return cls(location_id, last_updated, arrays["keys"], arrays["values"])
+
+
+class RowChange(BaseModel):
+    slot: str
+    fields: List[str]
+    temperature_delta: int = 0
+
+
+class ForecastDiff(BaseModel):
+    location_id: str
+    previous_last_updated: str
+    last_updated: str
+    compared: int = 0
+    added: List[str] = Field(default_factory=list)
+    dropped: List[str] = Field(default_factory=list)
+    changed: List[RowChange] = Field(default_factory=list)
+    field_changes: Dict[str, int] = Field(default_factory=dict)
+    max_temperature_delta: int = 0
+    mean_abs_temperature_delta: float = 0.0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.dropped or self.changed)
+
+
+def diff_snapshots(old: SnapshotArrays, new: SnapshotArrays) -> ForecastDiff:
+    _, old_index, new_index = np.intersect1d(old.keys, new.keys, assume_unique=True, return_indices=True)
+    added = np.setdiff1d(new.keys, old.keys, assume_unique=True)
+    dropped = np.setdiff1d(old.keys, new.keys, assume_unique=True)
+
+    before, after = old.values[old_index], new.values[new_index]
+    differs = before != after
+    changed_rows = np.flatnonzero(differs.any(axis=1))
+    temperature_delta = after[:, _TEMPERATURE] - before[:, _TEMPERATURE]
+    field_counts = differs.sum(axis=0)
+
+    names = np.array(FIELDS)
+    changed = [
+        RowChange(
+            slot=_key_label(new.keys[new_index[row]]),
+            fields=names[differs[row]].tolist(),
+            temperature_delta=int(temperature_delta[row]),
+        )
+        for row in changed_rows.tolist()
+    ]
+
+    # Largest move in either direction, sign kept
+    peak = int(temperature_delta[np.argmax(np.abs(temperature_delta))]) if len(temperature_delta) else 0
+    return ForecastDiff(
+        location_id=new.location_id,
+        previous_last_updated=old.last_updated,
+        last_updated=new.last_updated,
+        compared=len(old_index),
+        added=[_key_label(key) for key in added.tolist()],
+        dropped=[_key_label(key) for key in dropped.tolist()],
+        changed=changed,
+        field_changes={field: int(count) for field, count in zip(FIELDS, field_counts.tolist()) if count},
+        max_temperature_delta=peak,
+        mean_abs_temperature_delta=round(float(np.abs(temperature_delta).mean()), 3) if len(temperature_delta) else 0.0,
+    )
+
+
+class DiffTracker:
+    """Streaming mode: diff each saved snapshot against the previous one for its location.
+
+    The previous snapshot lives in memory as arrays and in diff_dir as a small
+    .npz, so a refresh never re-reads the full stored forecast. Diffs with
+    changes are appended to diff_dir/<location_id>.ndjson.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory or settings.diff_dir
+        self._last: Dict[str, SnapshotArrays] = {}
+        self._lock = threading.Lock()
+
+    def _previous(self, location_id: str) -> Optional[SnapshotArrays]:
+        previous = self._last.get(location_id)
+        if previous is None:
+            path = self.directory / f"{location_id}.npz"
+            if path.exists():
+                try:
+                    previous = SnapshotArrays.load(path)
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Ignoring unreadable diff state {path}: {e}")
+        return previous
+
+    def observe(self, data: WeatherData) -> Optional[ForecastDiff]:
+        current = SnapshotArrays.from_weather(data)
+        with self._lock:
+            previous = self._previous(data.location_id)
+            self._last[data.location_id] = current
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                current.save(self.directory / f"{data.location_id}.npz")
+
+                unchanged = previous is not None and (
+                    previous.last_updated == current.last_updated
+                    and np.array_equal(previous.keys, current.keys)
+                    and np.array_equal(previous.values, current.values)
+                )
+                if previous is None or unchanged:
+                    return None
+
+                diff = diff_snapshots(previous, current)
+                forecast_diffs.inc()
+                forecast_rows_changed.inc(len(diff.changed))
+                if diff.has_changes:
+                    with open(self.directory / f"{data.location_id}.ndjson", "a", encoding="utf-8") as f:
+                        f.write(json.dumps({"recorded_at": datetime.now().isoformat(), **diff.model_dump()}) + "\n")
+
+            except OSError as e:
+                logger.error(f"Failed to record forecast diff: {e}")
+                raise StorageException(f"Diff tracking failed: {str(e)}") from e
+
+        logger.debug(
+            "Diff for {}: {} changed, {} added, {} dropped, max temperature delta {}",
+            data.location_id,
+            len(diff.changed),
+            len(diff.added),
+            len(diff.dropped),
+            diff.max_temperature_delta,
+        )
+        return diff
+
+
+diff_tracker = DiffTracker()
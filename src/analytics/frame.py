@@ -0,0 +1,314 @@
+"""
+Columnar NumPy view of many locations' hourly forecasts
+"""
+
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.models.exceptions import StorageException
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from .derived import DERIVED, dew_point, heat_index, pressure_tendency, wind_chill
+
+# Frame column -> (WeatherData JSON field, CSV column)
+METRICS: Dict[str, tuple] = {
+    "temperature_c": ("temperature_c", "temp_c"),
+    "feels_like_c": ("feels_like_temperature_c", "feels_like_c"),
+    "precipitation_probability": ("precipitation_probability_percent", "precip_probability"),
+    "wind_speed_kph": ("wind_speed_kph", "wind_speed_kph"),
+    "gust_speed_kph": ("gust_speed_kph", "gust_speed_kph"),
+    "humidity": ("humidity", "humidity"),
+    "pressure": ("pressure", "pressure"),
+}
+# Derived at ingest; same name in WeatherData JSON and CSV
+STORED_DERIVED: Dict[str, tuple] = {name: (name, name) for name in DERIVED}
+
+
+def _utc_seconds(value) -> np.datetime64:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+
+class _Builder:
+    def __init__(self):
+        self.location_ids: List[str] = []
+        self.location_names: List[Optional[str]] = []
+        self._location_index: Dict[str, int] = {}
+        self.snapshot_location: List[int] = []
+        self.snapshot_updated: List[np.datetime64] = []
+        self.row_snapshot: List[int] = []
+        self.dates: List[str] = []
+        self.hours: List[int] = []
+        self.values: Dict[str, List[float]] = {metric: [] for metric in (*METRICS, *DERIVED)}
+        # Whether the row came with its derived metrics; dew point is always defined when they were computed
+        self.derived_stored: List[bool] = []
+
+    def snapshot(self, location_id: str, location_name: Optional[str], last_updated) -> int:
+        index = self._location_index.get(location_id)
+        if index is None:
+            index = self._location_index[location_id] = len(self.location_ids)
+            self.location_ids.append(location_id)
+            self.location_names.append(location_name)
+        elif location_name:
+            self.location_names[index] = location_name
+
+        self.snapshot_location.append(index)
+        self.snapshot_updated.append(_utc_seconds(last_updated))
+        return len(self.snapshot_location) - 1
+
+    def row(self, snapshot: int, local_date: str, timeslot: str, values: Dict[str, float]):
+        self.row_snapshot.append(snapshot)
+        self.dates.append(local_date)
+        self.hours.append(int(timeslot[:2]))
+        for metric, column in self.values.items():
+            value = values.get(metric)
+            column.append(np.nan if value in (None, "") else value)
+        self.derived_stored.append(values.get("dew_point_c") not in (None, ""))
+
+    def _derived(self, values: Dict[str, np.ndarray], dates, hours, row_snapshot) -> Dict[str, np.ndarray]:
+        """Derived columns as stored at ingest, computed only for rows saved without them"""
+        derived = {name: values[name] for name in DERIVED}
+        missing = ~np.array(self.derived_stored, dtype=bool)
+        if not missing.any():
+            return derived
+
+        t = values["temperature_c"][missing].astype(np.float64)
+        humidity = values["humidity"][missing]
+        derived["dew_point_c"][missing] = dew_point(t, humidity)
+        derived["heat_index_c"][missing] = heat_index(t, humidity)
+        derived["wind_chill_c"][missing] = wind_chill(t, values["wind_speed_kph"][missing])
+
+        # Tendency needs each forecast's neighbouring hours, so compute it per affected snapshot
+        rows = np.isin(row_snapshot, np.unique(row_snapshot[missing]))
+        tendency = pressure_tendency(
+            values["pressure"][rows], (dates.astype(np.int64) * 24 + hours)[rows], row_snapshot[rows]
+        )
+        derived["pressure_tendency_mb"][missing] = tendency[missing[rows]]
+        return derived
+
+    def build(self) -> "ForecastFrame":
+        snapshot_location = np.array(self.snapshot_location, dtype=np.int32)
+        row_snapshot = np.array(self.row_snapshot, dtype=np.int32)
+        dates = np.array(self.dates, dtype="datetime64[D]")
+        hours = np.array(self.hours, dtype=np.int8)
+        values = {metric: np.array(column, dtype=np.float32) for metric, column in self.values.items()}
+
+        values.update(self._derived(values, dates, hours, row_snapshot))
+
+        return ForecastFrame(
+            location_ids=np.array(self.location_ids, dtype=str),
+            location_names=np.array([name or "" for name in self.location_names], dtype=str),
+            snapshot_location=snapshot_location,
+            snapshot_updated=np.array(self.snapshot_updated, dtype="datetime64[s]"),
+            row_snapshot=row_snapshot,
+            row_location=snapshot_location[row_snapshot] if len(row_snapshot) else row_snapshot,
+            date=dates,
+            hour=hours,
+            values=values,
+        )
+
+
+class ForecastFrame:
+    """Hourly rows of many snapshots as parallel arrays.
+
+    Locations and snapshots are stored once and referenced from each row by
+    index, so per-location and per-day groupings are integer array operations.
+    """
+
+    def __init__(
+        self,
+        location_ids: np.ndarray,
+        location_names: np.ndarray,
+        snapshot_location: np.ndarray,
+        snapshot_updated: np.ndarray,
+        row_snapshot: np.ndarray,
+        row_location: np.ndarray,
+        date: np.ndarray,
+        hour: np.ndarray,
+        values: Dict[str, np.ndarray],
+    ):
+        self.location_ids = location_ids
+        self.location_names = location_names
+        self.snapshot_location = snapshot_location
+        self.snapshot_updated = snapshot_updated
+        self.row_snapshot = row_snapshot
+        self.row_location = row_location
+        self.date = date
+        self.hour = hour
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.row_snapshot)
+
+    @property
+    def snapshots(self) -> int:
+        return len(self.snapshot_location)
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.values[metric]
+
+    @classmethod
+    def from_weather(cls, snapshots: Iterable[WeatherData]) -> "ForecastFrame":
+        builder = _Builder()
+        for data in snapshots:
+            snapshot = builder.snapshot(data.location_id, data.location_name, data.last_updated)
+            for report in data.hourly_forecast:
+                builder.row(
+                    snapshot,
+                    report.local_date.isoformat(),
+                    report.timeslot,
+                    {metric: getattr(report, field) for metric, (field, _) in (*METRICS.items(), *STORED_DERIVED.items())},
+                )
+        return builder.build()
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Path]) -> "ForecastFrame":
+        """Load saved JSON/CSV snapshots and .jsonl(.gz) archives without building pydantic models"""
+        builder = _Builder()
+        loaded = 0
+        for path in paths:
+            try:
+                if path.suffix == ".csv":
+                    cls._read_csv(builder, path)
+                    loaded += 1
+                elif path.name.endswith((".jsonl", ".jsonl.gz")):
+                    loaded += cls._read_archive(builder, path)
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        cls._read_snapshot(builder, json.load(f))
+                    loaded += 1
+            except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+
+        logger.debug("Loaded {} snapshots, {} rows", loaded, len(builder.row_snapshot))
+        return builder.build()
+
+    @staticmethod
+    def _read_snapshot(builder: _Builder, data: dict):
+        snapshot = builder.snapshot(data["location_id"], data.get("location_name"), data["last_updated"])
+        for report in data.get("hourly_forecast", []):
+            builder.row(
+                snapshot,
+                report["local_date"],
+                report["timeslot"],
+                {metric: report.get(field) for metric, (field, _) in (*METRICS.items(), *STORED_DERIVED.items())},
+            )
+
+    @classmethod
+    def _read_archive(cls, builder: _Builder, path: Path) -> int:
+        count = 0
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                cls._read_snapshot(builder, json.loads(line))
+                count += 1
+        return count
+
+    @staticmethod
+    def _read_csv(builder: _Builder, path: Path):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            return
+        first = rows[0]
+        snapshot = builder.snapshot(first["location_id"], first.get("location_name"), first["last_updated"])
+        for row in rows:
+            builder.row(
+                snapshot,
+                row["date"],
+                row["time"],
+                {metric: float(row[column]) if row.get(column) else None for metric, (_, column) in (*METRICS.items(), *STORED_DERIVED.items())},
+            )
+
+    @classmethod
+    def from_directory(cls, *directories: Path) -> "ForecastFrame":
+        """Every snapshot under the given directories, partitioned or flat, archives included"""
+        # The binary store and delta archive may be configured inside a scanned directory;
+        # their files (e.g. the binary store's strings.jsonl) are not snapshots
+        stores = [settings.binary_dir.resolve(), settings.delta_dir.resolve()]
+        paths = sorted(
+            path
+            for directory in directories
+            if directory.is_dir()
+            for path in directory.rglob("*")
+            if (path.suffix in (".json", ".csv", ".jsonl") or path.name.endswith(".jsonl.gz"))
+            and not any(path.resolve().is_relative_to(store) for store in stores)
+        )
+        return cls.from_files(paths)
+
+    def take(self, mask: np.ndarray) -> "ForecastFrame":
+        """Frame restricted to the rows selected by a boolean mask or index array"""
+        return ForecastFrame(
+            location_ids=self.location_ids,
+            location_names=self.location_names,
+            snapshot_location=self.snapshot_location,
+            snapshot_updated=self.snapshot_updated,
+            row_snapshot=self.row_snapshot[mask],
+            row_location=self.row_location[mask],
+            date=self.date[mask],
+            hour=self.hour[mask],
+            values={metric: column[mask] for metric, column in self.values.items()},
+        )
+
+    def latest(self) -> "ForecastFrame":
+        """Only rows from each location's most recently updated snapshot"""
+        if not self.snapshots:
+            return self
+        # Sort snapshots by (location, updated) and keep the last of each location run
+        order = np.lexsort((self.snapshot_updated, self.snapshot_location))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = self.snapshot_location[order][1:] != self.snapshot_location[order][:-1]
+        keep = np.zeros(self.snapshots, dtype=bool)
+        keep[order[last]] = True
+        return self.take(keep[self.row_snapshot])
+
+    def save(self, path: Path):
+        """Store as .npz so repeat analyses skip parsing the snapshot files"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                path,
+                location_ids=self.location_ids,
+                location_names=self.location_names,
+                snapshot_location=self.snapshot_location,
+                snapshot_updated=self.snapshot_updated,
+                row_snapshot=self.row_snapshot,
+                row_location=self.row_location,
+                date=self.date,
+                hour=self.hour,
+                **{f"value_{metric}": column for metric, column in self.values.items()},
+            )
+        except OSError as e:
+            logger.error(f"Failed to save forecast frame: {e}")
+            raise StorageException(f"Frame save failed: {str(e)}") from e
+
+    @classmethod
+    def load(cls, path: Path) -> "ForecastFrame":
+        try:
+            with np.load(path) as arrays:
+                return cls(
+                    location_ids=arrays["location_ids"],
+                    location_names=arrays["location_names"],
+                    snapshot_location=arrays["snapshot_location"],
+                    snapshot_updated=arrays["snapshot_updated"],
+                    row_snapshot=arrays["row_snapshot"],
+                    row_location=arrays["row_location"],
+                    date=arrays["date"],
+                    hour=arrays["hour"],
+                    values={
+                        key[len("value_"):]: arrays[key] for key in arrays.files if key.startswith("value_")
+                    },
+                )
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"Failed to load forecast frame: {e}")
+            raise StorageException(f"Frame load failed: {str(e)}") from e
@@ -0,0 +1,182 @@
+"""
+Inverse-distance interpolation of point forecasts onto arbitrary coordinates and grids
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.constants.locations import get_coordinates
+from src.models.location import Coordinates
+from src.utils.logger import logger
+from .frame import ForecastFrame
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Rows of query points handled per block, bounding the query x station distance matrix
+_BLOCK = 4096
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def grid(
+    lat_min: float, lat_max: float, lon_min: float, lon_max: float, step: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of every node of a regular grid, as two 2-D arrays"""
+    latitudes = np.arange(lat_min, lat_max + step / 2, step)
+    longitudes = np.arange(lon_min, lon_max + step / 2, step)
+    return np.meshgrid(latitudes, longitudes, indexing="ij")
+
+
+class NeighbourIndex:
+    """For each query point, its k nearest stations and their normalized IDW weights.
+
+    Built once per set of query points; apply() then interpolates any number
+    of fields and time steps with a single gather and weighted sum.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], neighbours: np.ndarray, weights: np.ndarray, distance_km: np.ndarray):
+        self.shape = shape
+        self.neighbours = neighbours
+        self.weights = weights
+        self.distance_km = distance_km
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """values is (stations,) or (stations, times); returns (*shape) or (*shape, times).
+
+        Missing station values (NaN) drop out and the remaining weights are renormalized.
+        """
+        gathered = values[self.neighbours]
+        weights = self.weights if gathered.ndim == 2 else self.weights[..., None]
+        present = ~np.isnan(gathered)
+        total = np.sum(np.where(present, gathered, 0.0) * weights, axis=1)
+        norm = np.sum(present * weights, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = total / norm
+        return result.reshape(self.shape + result.shape[1:])
+
+
+class IDWInterpolator:
+    def __init__(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        neighbours: int = 8,
+        power: float = 2.0,
+        max_distance_km: Optional[float] = None,
+    ):
+        if not len(latitudes):
+            raise ValueError("IDW interpolation needs at least one station")
+        self.stations = _unit_vectors(np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64))
+        self.neighbours = min(neighbours, len(self.stations))
+        self.power = power
+        self.max_distance_km = max_distance_km
+
+    def index(self, latitudes, longitudes) -> NeighbourIndex:
+        latitudes, longitudes = np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)
+        shape = latitudes.shape
+        queries = _unit_vectors(latitudes.ravel(), longitudes.ravel())
+        k = self.neighbours
+
+        neighbours = np.empty((len(queries), k), dtype=np.intp)
+        distances = np.empty((len(queries), k))
+        for start in range(0, len(queries), _BLOCK):
+            block = queries[start:start + _BLOCK]
+            # |a - b|^2 = 2 - 2 a.b for unit vectors; one matrix product per block
+            chord_sq = np.clip(2.0 - 2.0 * block @ self.stations.T, 0.0, None)
+            nearest = np.argpartition(chord_sq, k - 1, axis=1)[:, :k] if k < chord_sq.shape[1] else np.broadcast_to(
+                np.arange(k), chord_sq.shape
+            )
+            neighbours[start:start + len(block)] = nearest
+            distances[start:start + len(block)] = _chord_to_km(
+                np.sqrt(np.take_along_axis(chord_sq, nearest, axis=1))
+            )
+
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / np.power(distances, self.power)
+        # A query on top of a station takes that station's value exactly
+        exact = distances < 1e-6
+        on_station = exact.any(axis=1)
+        weights[on_station] = exact[on_station].astype(np.float64)
+        if self.max_distance_km is not None:
+            weights[distances > self.max_distance_km] = 0.0
+        weights /= np.where(weights.sum(axis=1, keepdims=True) > 0, weights.sum(axis=1, keepdims=True), 1.0)
+
+        return NeighbourIndex(shape, neighbours, weights, distances)
+
+
+class StationFields:
+    """Latest forecast of each located station on a shared hourly time axis: (stations, times) per metric"""
+
+    def __init__(
+        self,
+        location_ids: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        times: np.ndarray,
+        values: Dict[str, np.ndarray],
+    ):
+        self.location_ids = location_ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.times = times
+        self.values = values
+
+    @classmethod
+    def from_frame(
+        cls, frame: ForecastFrame, coordinates: Optional[Dict[str, Coordinates]] = None
+    ) -> "StationFields":
+        """coordinates maps location ID to Coordinates; missing IDs are looked up in the common list and catalog"""
+        frame = frame.latest()
+        coordinates = dict(coordinates or {})
+        located = []
+        missing = []
+        for index, location_id in enumerate(frame.location_ids.tolist()):
+            point = coordinates.get(location_id) or get_coordinates(location_id)
+            if point is None:
+                missing.append(location_id)
+                continue
+            located.append((index, point))
+
+        if missing:
+            logger.warning(
+                f"No coordinates for {len(missing)} locations (e.g. {missing[0]}); left out of interpolation"
+            )
+
+        station_of_location = np.full(len(frame.location_ids), -1, dtype=np.intp)
+        station_of_location[[index for index, _ in located]] = np.arange(len(located))
+
+        row_time = frame.date.astype("datetime64[h]") + frame.hour.astype("timedelta64[h]")
+        times, time_index = np.unique(row_time, return_inverse=True)
+        station = station_of_location[frame.row_location]
+        keep = station >= 0
+
+        values = {}
+        for metric, column in frame.values.items():
+            field = np.full((len(located), len(times)), np.nan, dtype=np.float32)
+            field[station[keep], time_index[keep]] = column[keep]
+            values[metric] = field
+
+        return cls(
+            location_ids=frame.location_ids[[index for index, _ in located]],
+            latitudes=np.array([point.latitude for _, point in located]),
+            longitudes=np.array([point.longitude for _, point in located]),
+            times=times,
+            values=values,
+        )
+
+    def interpolator(self, **options) -> IDWInterpolator:
+        return IDWInterpolator(self.latitudes, self.longitudes, **options)
+
+    def time_index(self, when) -> int:
+        position = int(np.searchsorted(self.times, np.datetime64(when, "h")))
+        if position >= len(self.times) or self.times[position] != np.datetime64(when, "h"):
+            raise ValueError(f"No forecast hour {when}; available {self.times[0]} .. {self.times[-1]}")
+        return position
@@ -0,0 +1,106 @@
+"""
+On-disk cache tier storing one file per key
+"""
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.utils.logger import logger
+
+
+class DiskCache:
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int,
+        max_age: Optional[float] = None,
+        suffix: str = ".json",
+        prune_interval: int = 100,
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.suffix = suffix
+        self.prune_interval = prune_interval
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+        return self.cache_dir / f"{safe_key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+
+        try:
+            if self.max_age is not None:
+                age = time.time() - path.stat().st_mtime
+                if age > self.max_age:
+                    self.delete(key)
+                    return None
+
+            return path.read_text(encoding="utf-8")
+
+        except FileNotFoundError:
+            return None
+
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry {path}: {e}")
+            return None
+
+    def set(self, key: str, value: str):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f"{self.suffix}.tmp")
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(value, encoding="utf-8")
+            os.replace(tmp_path, path)
+
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            return
+
+        # Directory scans are not free, so prune on the first write and periodically
+        if self._writes % self.prune_interval == 0:
+            self.prune()
+        self._writes += 1
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def prune(self):
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        now = time.time()
+
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+            if self.max_age is not None and now - mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                continue
+
+            entries.append((mtime, path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[: len(entries) - self.max_entries]:
+                path.unlink(missing_ok=True)
+
+    def clear(self):
+        if not self.cache_dir.exists():
+            return
+
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            path.unlink(missing_ok=True)
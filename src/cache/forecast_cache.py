@@ -0,0 +1,252 @@
+"""
+Two-tier forecast cache with freshness derived from BBC update cadence
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Set
+
+from pydantic import BaseModel
+
+from src.models.location import Location
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import cache_requests
+from src.utils.single_flight import SingleFlight
+from .disk import DiskCache
+from .lru import LRUCache
+
+
+class CacheEntry(BaseModel):
+    data: WeatherData
+    fetched_at: datetime
+    fresh_until: datetime
+    stale_until: datetime
+    cadence_seconds: float
+
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        return (now or _utcnow()) < self.fresh_until
+
+    def is_servable_stale(self, now: Optional[datetime] = None) -> bool:
+        return (now or _utcnow()) < self.stale_until
+
+    def seconds_until_expiry(self, now: Optional[datetime] = None) -> float:
+        return (self.fresh_until - (now or _utcnow())).total_seconds()
+
+
+class FreshnessPolicy:
+    def __init__(
+        self,
+        default_interval: float,
+        min_ttl: float,
+        max_ttl: float,
+        stale_ttl: float,
+    ):
+        self.default_interval = default_interval
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.stale_ttl = stale_ttl
+
+    def observe_cadence(
+        self, previous: Optional[CacheEntry], data: WeatherData
+    ) -> float:
+        if previous is None:
+            return self.default_interval
+
+        cadence = previous.cadence_seconds
+        old = previous.data
+
+        delta = (data.last_updated - old.last_updated).total_seconds()
+        if delta <= 0 and data.issue_date and old.issue_date:
+            delta = (data.issue_date - old.issue_date).total_seconds()
+
+        if delta > 0:
+            # Smooth so one late BBC update does not swing the schedule
+            cadence = 0.5 * cadence + 0.5 * delta
+
+        return max(cadence, self.min_ttl)
+
+    def build_entry(
+        self, data: WeatherData, previous: Optional[CacheEntry] = None
+    ) -> CacheEntry:
+        now = _utcnow()
+        cadence = self.observe_cadence(previous, data)
+
+        anchor = _as_utc(data.last_updated)
+        if data.issue_date:
+            anchor = max(anchor, _as_utc(data.issue_date))
+
+        expected_update = anchor + timedelta(seconds=cadence)
+        fresh_until = min(
+            max(expected_update, now + timedelta(seconds=self.min_ttl)),
+            now + timedelta(seconds=self.max_ttl),
+        )
+
+        return CacheEntry(
+            data=data,
+            fetched_at=now,
+            fresh_until=fresh_until,
+            stale_until=fresh_until + timedelta(seconds=self.stale_ttl),
+            cadence_seconds=cadence,
+        )
+
+
+class ForecastCache:
+    def __init__(
+        self,
+        memory: Optional[LRUCache] = None,
+        disk: Optional[DiskCache] = None,
+        policy: Optional[FreshnessPolicy] = None,
+    ):
+        self.memory = memory or LRUCache(max_entries=settings.cache_max_entries)
+        self.disk = disk or DiskCache(
+            cache_dir=settings.cache_dir,
+            max_entries=settings.cache_disk_max_entries,
+            max_age=settings.cache_max_ttl + settings.cache_stale_ttl,
+        )
+        self.policy = policy or FreshnessPolicy(
+            default_interval=settings.forecast_update_interval,
+            min_ttl=settings.cache_min_ttl,
+            max_ttl=settings.cache_max_ttl,
+            stale_ttl=settings.cache_stale_ttl,
+        )
+        self._flights = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        self._listeners: List[Callable[[Optional[CacheEntry], CacheEntry], None]] = []
+
+    def add_listener(self, listener: Callable[[Optional[CacheEntry], CacheEntry], None]):
+        """Call listener(previous, entry) after every put; it must not block"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Optional[CacheEntry], CacheEntry], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_entry(self, location_id: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(location_id)
+        if entry is not None:
+            return entry
+
+        raw = self.disk.get(location_id)
+        if raw is None:
+            return None
+
+        try:
+            entry = CacheEntry.model_validate_json(raw)
+        except ValueError as e:
+            logger.warning(f"Discarding corrupt cache entry for {location_id}: {e}")
+            self.disk.delete(location_id)
+            return None
+
+        if not entry.is_servable_stale():
+            self.disk.delete(location_id)
+            return None
+
+        self.memory.set(location_id, entry)
+        return entry
+
+    def get(self, location_id: str, allow_stale: bool = False) -> Optional[WeatherData]:
+        entry = self.get_entry(location_id)
+        if entry is None:
+            return None
+
+        if entry.is_fresh() or (allow_stale and entry.is_servable_stale()):
+            return entry.data
+
+        return None
+
+    def put(self, data: WeatherData) -> CacheEntry:
+        previous = self.get_entry(data.location_id)
+        entry = self.policy.build_entry(data, previous)
+
+        self.memory.set(data.location_id, entry)
+        self.disk.set(data.location_id, entry.model_dump_json())
+
+        logger.debug(
+            "Cached forecast for {} until {}", data.location_id, entry.fresh_until
+        )
+
+        for listener in self._listeners:
+            try:
+                listener(previous, entry)
+            except Exception as e:
+                logger.warning(f"Cache listener failed for {data.location_id}: {e}")
+
+        return entry
+
+    def invalidate(self, location_id: str):
+        self.memory.delete(location_id)
+        self.disk.delete(location_id)
+
+    async def get_or_fetch(
+        self,
+        location: Location,
+        fetch: Callable[[], Awaitable[WeatherData]],
+        allow_stale: Optional[bool] = None,
+    ) -> WeatherData:
+        allow_stale = settings.cache_serve_stale if allow_stale is None else allow_stale
+        location_id = location.location_id
+
+        entry = self.get_entry(location_id)
+
+        if entry is not None and entry.is_fresh():
+            logger.debug("Cache hit for {} ({})", location.name, location_id)
+            cache_requests.inc(result="hit")
+            return entry.data
+
+        if entry is not None and allow_stale and entry.is_servable_stale():
+            logger.debug("Serving stale forecast for {}, revalidating", location.name)
+            cache_requests.inc(result="stale")
+            self._revalidate(location, fetch)
+            return entry.data
+
+        logger.debug("Cache miss for {} ({})", location.name, location_id)
+        cache_requests.inc(result="miss")
+        return await self.refresh(location, fetch)
+
+    async def refresh(
+        self, location: Location, fetch: Callable[[], Awaitable[WeatherData]]
+    ) -> WeatherData:
+        return await self._flights.do(
+            location.location_id, lambda: self._fetch_and_store(fetch)
+        )
+
+    async def _fetch_and_store(
+        self, fetch: Callable[[], Awaitable[WeatherData]]
+    ) -> WeatherData:
+        data = await fetch()
+        self.put(data)
+        return data
+
+    def _revalidate(
+        self, location: Location, fetch: Callable[[], Awaitable[WeatherData]]
+    ):
+        if self._flights.in_flight(location.location_id):
+            return
+
+        async def refresh():
+            try:
+                await self._flights.do(
+                    location.location_id, lambda: self._fetch_and_store(fetch)
+                )
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {location.name}: {e}")
+
+        task = asyncio.ensure_future(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+forecast_cache = ForecastCache()
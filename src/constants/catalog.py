@@ -0,0 +1,380 @@
+"""
+Location catalog: GeoNames places compiled to a memory-mapped binary index
+"""
+
+import bisect
+import heapq
+import math
+import mmap
+import struct
+import sys
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.models.exceptions import CatalogException
+from src.models.location import Coordinates, Location
+from src.utils.config import settings
+from src.utils.logger import logger
+
+MAGIC = b"WXCAT1" + (b"LE" if sys.byteorder == "little" else b"BE")
+# magic, records, keys, name blob bytes, key blob bytes
+HEADER = struct.Struct("<8sIIII")
+EARTH_RADIUS_KM = 6371.0088
+
+# GeoNames dump columns (geoname table, tab separated)
+_ID, _NAME, _ASCII, _LAT, _LON, _COUNTRY, _POPULATION = 0, 1, 2, 4, 5, 8, 14
+
+
+class CatalogEntry(BaseModel):
+    location_id: str
+    name: str
+    country_code: str
+    latitude: float
+    longitude: float
+    population: int
+    distance_km: Optional[float] = None
+    edit_distance: Optional[int] = None
+
+    def to_location(self) -> Location:
+        return Location(
+            location_id=self.location_id,
+            name=self.name,
+            country=self.country_code or None,
+            coordinates=Coordinates(latitude=self.latitude, longitude=self.longitude),
+        )
+
+
+def normalize(name: str) -> str:
+    """Search key: lowercase ASCII with accents stripped, so 'Zürich' matches 'zurich'"""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return " ".join(folded.lower().replace("-", " ").split())
+
+
+def _unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def _chord_to_km(chord_sq: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord_sq) / 2))
+
+
+def _pad(blob: bytes) -> bytes:
+    return blob + b"\0" * (-len(blob) % 4)
+
+
+def _build_tree(order: List[int], points: List[Tuple[float, float, float]], lo: int, hi: int, depth: int):
+    """Arrange order[lo:hi] as an implicit k-d tree: the median splits each range"""
+    if hi - lo <= 1:
+        return
+    axis = depth % 3
+    order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+    mid = (lo + hi) // 2
+    _build_tree(order, points, lo, mid, depth + 1)
+    _build_tree(order, points, mid + 1, hi, depth + 1)
+
+
+def read_geonames(
+    source: Path, min_population: int = 0, countries: Optional[Iterable[str]] = None
+) -> List[tuple]:
+    wanted = {code.upper() for code in countries} if countries else None
+    places = {}
+
+    with open(source, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) <= _POPULATION or line.startswith("#"):
+                continue
+            try:
+                place = (
+                    int(fields[_ID]),
+                    fields[_NAME],
+                    fields[_ASCII],
+                    float(fields[_LAT]),
+                    float(fields[_LON]),
+                    fields[_COUNTRY][:2].upper(),
+                    int(fields[_POPULATION] or 0),
+                )
+            except ValueError:
+                logger.debug("Skipping malformed GeoNames line {}", line_number)
+                continue
+            if place[6] < min_population or (wanted and place[5] not in wanted):
+                continue
+            places[place[0]] = place
+
+    # Records are stored by ID so ID lookups can bisect the mapped array directly
+    return [places[geoname_id] for geoname_id in sorted(places)]
+
+
+def compile_catalog(
+    source: Path,
+    target: Optional[Path] = None,
+    min_population: int = 0,
+    countries: Optional[Iterable[str]] = None,
+) -> Path:
+    """Compile a GeoNames dump (e.g. GB.txt, cities500.txt) into the binary catalog"""
+    target = target or settings.catalog_path
+    try:
+        places = read_geonames(source, min_population, countries)
+    except OSError as e:
+        logger.error(f"Failed to read GeoNames file {source}: {e}")
+        raise CatalogException(f"Failed to read GeoNames file: {str(e)}") from e
+
+    if not places:
+        raise CatalogException(f"No places found in {source}")
+    if len(places) >= 2**32 - 1:
+        raise CatalogException("Too many places for the catalog format")
+
+    ids, latitudes, longitudes, populations = array("I"), array("f"), array("f"), array("I")
+    countries_blob = bytearray()
+    name_offsets, names_blob = array("I", [0]), bytearray()
+    keys = []
+    points = []
+
+    for index, (geoname_id, name, ascii_name, lat, lon, country, population) in enumerate(places):
+        ids.append(geoname_id)
+        latitudes.append(lat)
+        longitudes.append(lon)
+        populations.append(min(population, 2**32 - 1))
+        countries_blob += country.encode("ascii", "replace").ljust(2)[:2]
+        names_blob += name.encode("utf-8")
+        name_offsets.append(len(names_blob))
+        for key in {normalize(name), normalize(ascii_name)} - {""}:
+            keys.append((key, index))
+        points.append(_unit_vector(lat, lon))
+
+    keys.sort()
+    key_offsets, key_records, keys_blob = array("I", [0]), array("I"), bytearray()
+    for key, index in keys:
+        keys_blob += key.encode("ascii")
+        key_offsets.append(len(keys_blob))
+        key_records.append(index)
+
+    order = list(range(len(places)))
+    _build_tree(order, points, 0, len(order), 0)
+    tree_order = array("I", order)
+    tree_points = array("f", [axis for i in order for axis in points[i]])
+
+    names_bytes, keys_bytes = _pad(bytes(names_blob)), _pad(bytes(keys_blob))
+    sections = [
+        ids, latitudes, longitudes, populations, _pad(bytes(countries_blob)),
+        name_offsets, names_bytes, key_offsets, key_records, keys_bytes, tree_order, tree_points,
+    ]
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(places), len(keys), len(names_bytes), len(keys_bytes)))
+        for section in sections:
+            f.write(section.tobytes() if isinstance(section, array) else section)
+    tmp_path.replace(target)
+
+    logger.info(f"Compiled {len(places)} places ({len(keys)} name keys) into {target}")
+    return target
+
+
+class _Keys:
+    """Sorted search keys read straight from the mapped file, indexable for bisect"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode("ascii")
+
+
+class LocationCatalog:
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise CatalogException(f"Failed to open location catalog {path}: {str(e)}") from e
+
+        view = memoryview(self._mmap)
+        magic, n, n_keys, names_len, keys_len = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise CatalogException(f"{path} is not a location catalog for this platform; rebuild it")
+
+        offset = HEADER.size
+
+        def take(size: int, fmt: Optional[str] = None) -> memoryview:
+            nonlocal offset
+            section = view[offset:offset + size]
+            offset += size + (-size % 4)
+            return section.cast(fmt) if fmt else section
+
+        self._ids = take(4 * n, "I")
+        self._latitudes = take(4 * n, "f")
+        self._longitudes = take(4 * n, "f")
+        self._populations = take(4 * n, "I")
+        self._countries = take(2 * n)
+        self._name_offsets = take(4 * (n + 1), "I")
+        self._names = take(names_len)
+        key_offsets = take(4 * (n_keys + 1), "I")
+        self._key_records = take(4 * n_keys, "I")
+        self._keys = _Keys(key_offsets, take(keys_len))
+        self._tree_order = take(4 * n, "I")
+        self._tree_points = take(12 * n, "f")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self):
+        # Views must be released before the mapping can close
+        for name in ("_ids", "_latitudes", "_longitudes", "_populations", "_countries",
+                     "_name_offsets", "_names", "_key_records", "_tree_order", "_tree_points"):
+            getattr(self, name).release()
+        self._keys._offsets.release()
+        self._keys._blob.release()
+        self._mmap.close()
+
+    def entry(self, index: int, **extra) -> CatalogEntry:
+        name = bytes(self._names[self._name_offsets[index]:self._name_offsets[index + 1]])
+        return CatalogEntry(
+            location_id=str(self._ids[index]),
+            name=name.decode("utf-8"),
+            country_code=bytes(self._countries[2 * index:2 * index + 2]).decode("ascii").strip(),
+            latitude=round(self._latitudes[index], 5),
+            longitude=round(self._longitudes[index], 5),
+            population=self._populations[index],
+            **extra,
+        )
+
+    def get(self, location_id: str) -> Optional[CatalogEntry]:
+        try:
+            geoname_id = int(location_id)
+        except ValueError:
+            return None
+        index = bisect.bisect_left(self._ids, geoname_id)
+        if index < len(self._ids) and self._ids[index] == geoname_id:
+            return self.entry(index)
+        return None
+
+    def _by_population(self, records: Iterable[int], limit: int) -> List[int]:
+        return heapq.nlargest(limit, set(records), key=lambda i: (self._populations[i], -i))
+
+    def lookup(self, name: str) -> Optional[CatalogEntry]:
+        """Most populous place whose name matches exactly"""
+        key = normalize(name)
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_right(self._keys, key, lo)
+        best = self._by_population((self._key_records[i] for i in range(lo, hi)), 1)
+        return self.entry(best[0]) if best else None
+
+    def search(self, prefix: str, limit: int = 10) -> List[CatalogEntry]:
+        """Places whose name starts with prefix, most populous first"""
+        key = normalize(prefix)
+        if not key:
+            return []
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key[:-1] + chr(ord(key[-1]) + 1), lo)
+        records = self._by_population((self._key_records[i] for i in range(lo, hi)), limit)
+        return [self.entry(i) for i in records]
+
+    def fuzzy(self, query: str, max_distance: int = 2, limit: int = 10) -> List[CatalogEntry]:
+        """Places within max_distance edits of query, closest then most populous first.
+
+        The sorted keys act as a trie: the edit-distance rows for a shared prefix
+        are reused, and a prefix that already exceeds max_distance skips every
+        key below it with one bisect.
+        """
+        target = normalize(query)
+        if not target:
+            return []
+
+        keys = self._keys
+        rows = [list(range(len(target) + 1))]
+        previous = ""
+        best = {}
+        i = 0
+        while i < len(keys):
+            key = keys[i]
+            common = 0
+            for a, b in zip(key, previous):
+                if a != b:
+                    break
+                common += 1
+            del rows[common + 1:]
+
+            pruned = None
+            for depth in range(common, len(key)):
+                above = rows[-1]
+                row = [above[0] + 1]
+                for j, char in enumerate(target, 1):
+                    row.append(min(row[j - 1] + 1, above[j] + 1, above[j - 1] + (char != key[depth])))
+                rows.append(row)
+                if min(row) > max_distance:
+                    pruned = key[:depth + 1]
+                    break
+
+            if pruned is not None:
+                previous = pruned
+                i = bisect.bisect_left(keys, pruned[:-1] + chr(ord(pruned[-1]) + 1), i + 1)
+                continue
+
+            distance = rows[-1][-1]
+            if distance <= max_distance:
+                record = self._key_records[i]
+                best[record] = min(distance, best.get(record, distance))
+            previous = key
+            i += 1
+
+        ranked = heapq.nsmallest(limit, best, key=lambda r: (best[r], -self._populations[r]))
+        return [self.entry(r, edit_distance=best[r]) for r in ranked]
+
+    def nearest(self, latitude: float, longitude: float, limit: int = 5) -> List[CatalogEntry]:
+        """The limit closest places by great-circle distance"""
+        if limit <= 0 or not len(self):
+            return []
+
+        query = _unit_vector(latitude, longitude)
+        order, points = self._tree_order, self._tree_points
+        # Max-heap of (-chord², tree position) holding the best candidates so far
+        heap: List[Tuple[float, int]] = []
+
+        def visit(lo: int, hi: int, depth: int):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            base = 3 * mid
+            dx, dy, dz = points[base] - query[0], points[base + 1] - query[1], points[base + 2] - query[2]
+            dist_sq = dx * dx + dy * dy + dz * dz
+            if len(heap) < limit:
+                heapq.heappush(heap, (-dist_sq, mid))
+            elif dist_sq < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist_sq, mid))
+
+            axis = depth % 3
+            split = query[axis] - points[base + axis]
+            near, far = ((mid + 1, hi), (lo, mid)) if split > 0 else ((lo, mid), (mid + 1, hi))
+            visit(near[0], near[1], depth + 1)
+            if len(heap) < limit or split * split < -heap[0][0]:
+                visit(far[0], far[1], depth + 1)
+
+        visit(0, len(order), 0)
+        return [
+            self.entry(order[position], distance_km=round(_chord_to_km(-neg_sq), 2))
+            for neg_sq, position in sorted(heap, reverse=True)
+        ]
+
+
+_catalog: Optional[LocationCatalog] = None
+
+
+def get_catalog() -> Optional[LocationCatalog]:
+    """Shared catalog mapped on first use, None until `catalog build` has run"""
+    global _catalog
+    if _catalog is None and settings.catalog_path.exists():
+        _catalog = LocationCatalog(settings.catalog_path)
+        logger.debug("Mapped location catalog {} ({} places)", settings.catalog_path, len(_catalog))
+    return _catalog
@@ -1,5 +1,5 @@
 from typing import Optional
-from src.models.location import Location
+from src.models.location import Coordinates, Location
 
 
 COMMON_LOCATIONS = {
@@ -15,6 +15,33 @@ COMMON_LOCATIONS = {
     "sheffield": "2638077",
 }
 
+# GeoNames coordinates of the common locations, so they work without a catalog
+COMMON_COORDINATES = {
+    "2643743": (51.50853, -0.12574),
+    "2643123": (53.48095, -2.23743),
+    "2655603": (52.48142, -1.89983),
+    "2650225": (55.95206, -3.19648),
+    "2648579": (55.86515, -4.25763),
+    "2653822": (51.48, -3.18),
+    "2644210": (53.41058, -2.97794),
+    "2654675": (51.45523, -2.59665),
+    "2644688": (53.79648, -1.54785),
+    "2638077": (53.38297, -1.4659),
+}
+
+
+def get_coordinates(location_id: str) -> Optional[Coordinates]:
+    """Coordinates for a location ID from the common list or the location catalog"""
+    known = COMMON_COORDINATES.get(location_id)
+    if known:
+        return Coordinates(latitude=known[0], longitude=known[1])
+
+    from src.constants.catalog import get_catalog
+
+    catalog = get_catalog()
+    entry = catalog.get(location_id) if catalog else None
+    return Coordinates(latitude=entry.latitude, longitude=entry.longitude) if entry else None
+
 
 def get_location_id(location_name: str) -> Optional[str]:
     """Get BBC Weather location ID by location name"""
@@ -22,12 +49,38 @@ def get_location_id(location_name: str) -> Optional[str]:
 
 
 def get_location(location_name: str) -> Optional[Location]:
-    """Get Location object by location name"""
+    """Get Location object by location name, falling back to the location catalog"""
     location_id = get_location_id(location_name)
     if location_id:
         return Location(
             location_id=location_id,
             name=location_name.title(),
             country="United Kingdom",
+            coordinates=get_coordinates(location_id),
         )
-    return None
+
+    from src.constants.catalog import get_catalog
+
+    catalog = get_catalog()
+    entry = catalog.lookup(location_name) if catalog else None
+    return entry.to_location() if entry else None
+
+
+def get_location_by_id(location_id: str) -> Location:
+    """Get Location object by BBC Weather location ID, named after it if unknown"""
+    for name, known_id in COMMON_LOCATIONS.items():
+        if known_id == location_id:
+            return Location(
+                location_id=location_id,
+                name=name.title(),
+                country="United Kingdom",
+                coordinates=get_coordinates(location_id),
+            )
+
+    from src.constants.catalog import get_catalog
+
+    catalog = get_catalog()
+    entry = catalog.get(location_id) if catalog else None
+    if entry:
+        return entry.to_location()
+    return Location(location_id=location_id, name=location_id)
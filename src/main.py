@@ -1,12 +1,14 @@
 import asyncio
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import click
 
+from src.cache.forecast_cache import forecast_cache
 from src.models.location import Location
-from src.constants.locations import get_location
+from src.models.weather import WeatherData
+from src.constants.locations import get_location, get_location_by_id
 from src.models.exceptions import WeatherScraperException
 from src.scrapers.factory import create_scraper
 from src.storage.json_storage import JSONStorage
@@ -21,28 +23,64 @@ async def scrape_weather(
     output_format: str = "json",
     output_file: Optional[str] = None,
     screenshot: bool = False,
-) -> Path:
-    logger.info(f"Starting weather scrape for {location.name} using {engine} engine")
+    use_cache: Optional[bool] = None,
+) -> Optional[Path]:
+    """Scrape and save one location; returns None when a fresh cached forecast was served"""
+    from src.utils.memory_profiler import memory_profiler
 
-    scraper = create_scraper(
-        engine=engine, storage_format=output_format, output_filename=output_file
-    )
+    with memory_profiler.location(location.location_id):
+        return await _scrape_weather(location, engine, output_format, output_file, screenshot, use_cache)
 
-    async with scraper:
-        weather_data = await scraper.scrape(location)
 
-        if screenshot and engine == "bs4" and hasattr(scraper, "_page") and scraper._page:
-            screenshot_path = (
-                settings.output_dir
-                / f"screenshot_{location.name.lower().replace(' ', '_')}.png"
-            )
-            await scraper.take_screenshot(str(screenshot_path))
-            logger.info(f"Screenshot saved to: {screenshot_path}")
+async def _scrape_weather(
+    location: Location,
+    engine: str,
+    output_format: str,
+    output_file: Optional[str],
+    screenshot: bool,
+    use_cache: Optional[bool],
+) -> Optional[Path]:
+    use_cache = settings.cache_enabled if use_cache is None else use_cache
+    scraped_by_engine = False
+    pipeline_paths = []
+
+    async def fetch() -> WeatherData:
+        nonlocal scraped_by_engine, pipeline_paths
+
+        logger.info(f"Starting weather scrape for {location.name} using {engine} engine")
+
+        scraper = create_scraper(
+            engine=engine, storage_format=output_format, output_filename=output_file
+        )
+
+        async with scraper:
+            weather_data = await scraper.scrape(location)
+
+            if screenshot and engine == "bs4" and hasattr(scraper, "_page") and scraper._page:
+                screenshot_path = (
+                    settings.output_dir
+                    / f"screenshot_{location.name.lower().replace(' ', '_')}.png"
+                )
+                await scraper.take_screenshot(str(screenshot_path))
+                logger.info(f"Screenshot saved to: {screenshot_path}")
+
+        scraped_by_engine = True
+        pipeline_paths = getattr(scraper, "saved_paths", [])
+        return weather_data
 
-    if engine == "scrapy":
+    if use_cache and not screenshot:
+        weather_data = await forecast_cache.get_or_fetch(location, fetch)
+        if not scraped_by_engine:
+            # Already saved when it was scraped; saving again would duplicate the file and its side channels
+            logger.info(f"Using cached forecast for {location.name}")
+            return None
+    else:
+        weather_data = await fetch()
+
+    if engine == "scrapy" and scraped_by_engine and pipeline_paths:
         logger.info(f"Data saved by Scrapy pipeline")
         logger.info(f"Scraped {len(weather_data.hourly_forecast)} hourly forecasts")
-        return settings.output_dir / f"{output_file or 'weather'}.{output_format}"
+        return pipeline_paths[-1]
 
     if output_format == "json":
         storage = JSONStorage()
@@ -59,10 +97,76 @@ async def scrape_weather(
     return saved_path
 
 
+def setup_metrics_export(ctx: click.Context):
+    if not (settings.metrics_file or settings.metrics_json or settings.metrics_port):
+        return
+
+    from datetime import datetime, timezone
+    from src.utils.metrics import metrics
+
+    if settings.metrics_port:
+        metrics.serve(settings.metrics_port)
+        logger.info(f"Serving metrics at http://127.0.0.1:{settings.metrics_port}/metrics")
+
+    started_at = datetime.now(timezone.utc)
+
+    def export():
+        if settings.metrics_file:
+            metrics.write_prometheus(settings.metrics_file)
+            logger.info(f"Metrics written to: {settings.metrics_file}")
+        if settings.metrics_json:
+            metrics.write_json(
+                settings.metrics_json,
+                command=ctx.invoked_subcommand or "scrape",
+                started_at=started_at,
+                finished_at=datetime.now(timezone.utc),
+            )
+            logger.info(f"Metrics written to: {settings.metrics_json}")
+
+    ctx.call_on_close(export)
+
+
+def setup_memory_profiling(ctx: click.Context, report_path: Optional[Path]):
+    from src.utils.memory_profiler import format_report, memory_profiler
+
+    memory_profiler.start()
+
+    def report():
+        memory_report = memory_profiler.stop()
+        if memory_report is None:
+            return
+
+        click.echo("\n[MEMORY] Profile", err=True)
+        for line in format_report(memory_report):
+            click.echo(line, err=True)
+
+        if report_path:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(memory_report.model_dump_json(indent=2), encoding="utf-8")
+            click.echo(f"[MEMORY] Report written to: {report_path}", err=True)
+
+    ctx.call_on_close(report)
+
+
 LOCATIONS = "London, Manchester, Birmingham, Edinburgh, Glasgow, Cardiff, Liverpool, Bristol, Leeds, Sheffield"
 
 
-@click.command()
+def resolve_locations(names: Tuple[str, ...], location_ids: Tuple[str, ...]) -> List[Location]:
+    locations = [get_location_by_id(location_id) for location_id in location_ids]
+
+    for name in names:
+        loc = get_location(name)
+        if not loc:
+            logger.error(f"Location not found: {name}")
+            click.echo(f"Available: {LOCATIONS}", err=True)
+            sys.exit(1)
+        locations.append(loc)
+
+    return locations
+
+
+@click.group(invoke_without_command=True)
+@click.pass_context
 @click.option("-l", "--location", help="Location name (e.g., London, Manchester)")
 @click.option("--location-id", help="BBC Weather location ID")
 @click.option("--location-name", help="Display name (used with --location-id)")
@@ -72,10 +176,27 @@ LOCATIONS = "London, Manchester, Birmingham, Edinburgh, Glasgow, Cardiff, Liverp
 @click.option("-s", "--screenshot", is_flag=True, help="Save page screenshot (bs4 only)")
 @click.option("--log-level", default="INFO", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]), help="Logging level")
 @click.option("--headless/--no-headless", default=True, help="Run browser in headless mode")
-def main(location, location_id, location_name, engine, output_format, output, screenshot, log_level, headless):
+@click.option("--cache/--no-cache", "use_cache", default=None, help="Reuse a fresh cached forecast instead of scraping (default: CACHE_ENABLED)")
+@click.option("--metrics-file", type=click.Path(dir_okay=False, path_type=Path), help="Write Prometheus text metrics on exit")
+@click.option("--metrics-json", type=click.Path(dir_okay=False, path_type=Path), help="Write a JSON metrics dump on exit")
+@click.option("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+@click.option("--profile-memory", is_flag=True, help="Report tracemalloc and RSS per stage and per location")
+@click.option("--memory-report", type=click.Path(dir_okay=False, path_type=Path), help="Write the memory profile as JSON (implies --profile-memory)")
+def main(ctx, location, location_id, location_name, engine, output_format, output, screenshot, log_level, headless, use_cache, metrics_file, metrics_json, metrics_port, profile_memory, memory_report):
 
     settings.log_level = log_level
     settings.headless = headless
+    if use_cache is not None:
+        settings.cache_enabled = use_cache
+    settings.metrics_file = metrics_file or settings.metrics_file
+    settings.metrics_json = metrics_json or settings.metrics_json
+    settings.metrics_port = metrics_port or settings.metrics_port
+    setup_metrics_export(ctx)
+    if profile_memory or memory_report:
+        setup_memory_profiling(ctx, memory_report)
+
+    if ctx.invoked_subcommand is not None:
+        return
 
     try:
         loc = None
@@ -107,8 +228,11 @@ def main(location, location_id, location_name, engine, output_format, output, sc
         )
 
         click.echo("")
-        click.echo(f"[SUCCESS] Weather data scraped for {loc.name}")
-        click.echo(f"[OUTPUT] Saved to: {output_path}")
+        if output_path is None:
+            click.echo(f"[CACHED] Fresh forecast for {loc.name} already saved, nothing new written")
+        else:
+            click.echo(f"[SUCCESS] Weather data scraped for {loc.name}")
+            click.echo(f"[OUTPUT] Saved to: {output_path}")
 
 
     except WeatherScraperException as e:
@@ -122,5 +246,839 @@ def main(location, location_id, location_name, engine, output_format, output, sc
         sys.exit(130)
 
 
+@main.command()
+@click.option("-l", "--location", "locations", multiple=True, help="Location name, repeatable")
+@click.option("--location-id", "location_ids", multiple=True, help="BBC Weather location ID, repeatable")
+@click.option("-f", "--format", "output_format", default="json", type=click.Choice(["json", "csv"]), help="Output format")
+def schedule(locations, location_ids, output_format):
+    """Keep forecasts fresh, polling each location when BBC is likely to update it"""
+    from src.scrapers.bs4.scraper import BBCWeatherScraper
+    from src.services.refresh_scheduler import RefreshScheduler
+
+    storage = CSVStorage() if output_format == "csv" else JSONStorage()
+
+    async def run():
+        # One long-lived browser is shared by every location
+        async with BBCWeatherScraper() as scraper:
+            scheduler = RefreshScheduler(scraper=scraper, storage=storage)
+            scheduler.load_state()
+
+            for loc in resolve_locations(locations, location_ids):
+                scheduler.add_location(loc)
+
+            if not scheduler.schedules:
+                click.echo("Error: specify --location or --location-id (no saved schedule)", err=True)
+                sys.exit(1)
+
+            await scheduler.run()
+
+    try:
+        asyncio.run(run())
+
+    except WeatherScraperException as e:
+        logger.error(f"Scheduler failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.warning("Scheduler interrupted by user")
+        click.echo("\n[INTERRUPTED] Scheduler stopped", err=True)
+        sys.exit(130)
+
+
+@main.group()
+def queue():
+    """Durable job queue for resumable multi-location runs"""
+
+
+@queue.command("add")
+@click.option("-l", "--location", "locations", multiple=True, help="Location name, repeatable")
+@click.option("--location-id", "location_ids", multiple=True, help="BBC Weather location ID, repeatable")
+@click.option("-b", "--batch", default="default", help="Batch name")
+def queue_add(locations, location_ids, batch):
+    """Enqueue locations; re-adding a batch only adds missing locations"""
+    from src.services.job_queue import JobQueue
+
+    locs = resolve_locations(locations, location_ids)
+    if not locs:
+        click.echo("Error: specify --location or --location-id", err=True)
+        sys.exit(1)
+
+    added = JobQueue().enqueue(locs, batch=batch)
+    click.echo(f"[QUEUED] {added} new jobs in batch '{batch}'")
+
+
+@queue.command("work")
+@click.option("-b", "--batch", help="Only process jobs from this batch")
+@click.option("-f", "--format", "output_format", default="json", type=click.Choice(["json", "csv"]), help="Output format")
+@click.option("--wait/--no-wait", default=False, help="Keep polling for new jobs when the queue is empty")
+def queue_work(batch, output_format, wait):
+    """Process queued jobs; run several copies to spread work across processes"""
+    from src.scrapers.bs4.scraper import BBCWeatherScraper
+    from src.services.job_queue import JobQueue
+    from src.services.queue_worker import QueueWorker
+
+    storage = CSVStorage() if output_format == "csv" else JSONStorage()
+
+    async def run():
+        async with BBCWeatherScraper() as scraper:
+            worker = QueueWorker(queue=JobQueue(), scraper=scraper, storage=storage, batch=batch)
+            await worker.run(wait=wait)
+
+    try:
+        asyncio.run(run())
+
+    except WeatherScraperException as e:
+        logger.error(f"Queue worker failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.warning("Queue worker interrupted by user")
+        click.echo("\n[INTERRUPTED] Unfinished jobs stay queued; rerun to resume", err=True)
+        sys.exit(130)
+
+
+@queue.command("status")
+@click.option("-b", "--batch", help="Only count jobs from this batch")
+def queue_status(batch):
+    """Show job counts per status and dead-lettered jobs"""
+    from src.services.job_queue import JobQueue
+
+    job_queue = JobQueue()
+    for status, count in job_queue.stats(batch).items():
+        click.echo(f"{status:<10} {count}")
+
+    for job in job_queue.dead_jobs(batch):
+        click.echo(f"[DEAD] {job.batch}/{job.location_name} ({job.location_id}): {job.last_error}")
+
+
+@queue.command("retry-dead")
+@click.option("-b", "--batch", help="Only requeue jobs from this batch")
+def queue_retry_dead(batch):
+    """Move dead-lettered jobs back to pending"""
+    from src.services.job_queue import JobQueue
+
+    count = JobQueue().retry_dead(batch)
+    click.echo(f"[QUEUED] {count} dead jobs requeued")
+
+
+@main.command()
+@click.option("-l", "--location", "locations", multiple=True, help="Location name, repeatable")
+@click.option("--location-id", "location_ids", multiple=True, help="BBC Weather location ID, repeatable")
+@click.option("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+@click.option("-f", "--format", "output_format", default="json", type=click.Choice(["json", "csv"]), help="Output format")
+def shard(locations, location_ids, workers, output_format):
+    """Scrape many locations with one browser per worker process"""
+    import os
+    from src.services.supervisor import Supervisor
+
+    locs = resolve_locations(locations, location_ids)
+    if not locs:
+        click.echo("Error: specify --location or --location-id", err=True)
+        sys.exit(1)
+
+    storage = CSVStorage() if output_format == "csv" else JSONStorage()
+    supervisor = Supervisor(locs, storage=storage, workers=workers or os.cpu_count() or 1)
+
+    try:
+        summary = asyncio.run(supervisor.run())
+
+    except KeyboardInterrupt:
+        logger.warning("Sharded run interrupted by user")
+        click.echo("\n[INTERRUPTED] Cancelled by user", err=True)
+        sys.exit(130)
+
+    click.echo("")
+    for location_id, path in summary.saved.items():
+        click.echo(f"[SUCCESS] {location_id}: {path}")
+    for location_id, error in summary.failed.items():
+        click.echo(f"[ERROR] {location_id}: {error}", err=True)
+
+    if summary.failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.option("-l", "--location", "locations", multiple=True, help="Location name, repeatable")
+@click.option("--location-id", "location_ids", multiple=True, help="BBC Weather location ID, repeatable")
+@click.option("-f", "--format", "output_format", default="json", type=click.Choice(["json", "csv"]), help="Output format")
+@click.option("-c", "--concurrency", type=int, default=None, help="Pages fetched concurrently (default: PIPELINE_FETCH_CONCURRENCY)")
+@click.option("--deadline", type=float, default=None, help="Seconds allowed per location, end to end")
+def batch(locations, location_ids, output_format, concurrency, deadline):
+    """Scrape many locations through the streaming fetch/parse/save pipeline"""
+    from src.services.pipeline import scrape_many
+
+    locs = resolve_locations(locations, location_ids)
+    if not locs:
+        click.echo("Error: specify --location or --location-id", err=True)
+        sys.exit(1)
+
+    storage = CSVStorage() if output_format == "csv" else JSONStorage()
+
+    async def run() -> int:
+        failed = 0
+        async for result in scrape_many(locs, storage=storage, fetch_concurrency=concurrency, deadline=deadline):
+            if result.ok:
+                click.echo(f"[SUCCESS] {result.location.name}: {result.saved_path} ({result.elapsed:.1f}s)")
+            else:
+                failed += 1
+                click.echo(f"[ERROR] {result.location.name} ({result.stage}): {result.error}", err=True)
+        return failed
+
+    try:
+        failed = asyncio.run(run())
+
+    except WeatherScraperException as e:
+        logger.error(f"Batch scrape failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.warning("Batch scrape interrupted by user")
+        click.echo("\n[INTERRUPTED] Cancelled by user", err=True)
+        sys.exit(130)
+
+    if failed:
+        sys.exit(1)
+
+
+@main.group()
+def catalog():
+    """Searchable location catalog compiled from GeoNames data"""
+
+
+def echo_entries(entries):
+    if not entries:
+        click.echo("No matching places")
+        return
+    for entry in entries:
+        extra = f"  {entry.distance_km:.1f} km" if entry.distance_km is not None else ""
+        click.echo(
+            f"{entry.location_id:>9}  {entry.name:<28} {entry.country_code:<3} "
+            f"{entry.latitude:>9.4f} {entry.longitude:>10.4f} {entry.population:>9}{extra}"
+        )
+
+
+def open_catalog():
+    from src.constants.catalog import get_catalog
+
+    try:
+        loaded = get_catalog()
+    except WeatherScraperException as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+    if loaded is None:
+        click.echo(f"[ERROR] No catalog at {settings.catalog_path}; run 'catalog build' first", err=True)
+        sys.exit(1)
+    return loaded
+
+
+@catalog.command("build")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--min-population", type=int, default=0, help="Skip places smaller than this")
+@click.option("--country", "countries", multiple=True, help="ISO country code to keep, repeatable")
+def catalog_build(source, min_population, countries):
+    """Compile a GeoNames dump (e.g. GB.txt, cities500.txt) into the catalog"""
+    from src.constants.catalog import compile_catalog
+
+    try:
+        path = compile_catalog(source, min_population=min_population, countries=countries)
+        click.echo(f"[SUCCESS] Catalog written to {path}")
+
+    except WeatherScraperException as e:
+        logger.error(f"Catalog build failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+
+@catalog.command("search")
+@click.argument("query")
+@click.option("--fuzzy", is_flag=True, help="Match misspellings instead of prefixes")
+@click.option("--max-distance", type=int, default=2, help="Edits allowed with --fuzzy")
+@click.option("-n", "--limit", type=int, default=10, help="Results to show")
+def catalog_search(query, fuzzy, max_distance, limit):
+    """Find places by name prefix, most populous first"""
+    places = open_catalog()
+    echo_entries(places.fuzzy(query, max_distance, limit) if fuzzy else places.search(query, limit))
+
+
+@catalog.command("nearest")
+@click.option("--lat", "latitude", type=float, required=True, help="Latitude in degrees")
+@click.option("--lon", "longitude", type=float, required=True, help="Longitude in degrees")
+@click.option("-n", "--limit", type=int, default=5, help="Results to show")
+def catalog_nearest(latitude, longitude, limit):
+    """Find the places closest to a latitude/longitude"""
+    echo_entries(open_catalog().nearest(latitude, longitude, limit))
+
+
+@main.group()
+@click.option("-i", "--input", "input_path", type=click.Path(exists=True, path_type=Path), default=None, help="Snapshot directory or saved .npz frame (default: OUTPUT_DIR and ARCHIVE_DIR)")
+@click.option("--all-snapshots", is_flag=True, help="Use every stored snapshot, not just each location's latest")
+@click.option("--json", "as_json", is_flag=True, help="Print JSON instead of a table")
+@click.pass_context
+def analyze(ctx, input_path, all_snapshots, as_json):
+    """Aggregate stored forecasts across locations"""
+    from src.analytics.frame import ForecastFrame
+
+    try:
+        if input_path is None:
+            frame = ForecastFrame.from_directory(settings.output_dir, settings.archive_dir)
+            input_path = settings.output_dir
+        elif input_path.suffix == ".npz":
+            frame = ForecastFrame.load(input_path)
+        else:
+            frame = ForecastFrame.from_directory(input_path)
+
+    except WeatherScraperException as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    ctx.obj = {"frame": frame if all_snapshots else frame.latest(), "as_json": as_json}
+    logger.debug("Loaded {} snapshots ({} hourly rows) from {}", frame.snapshots, len(frame), input_path)
+
+
+def echo_records(records: List[dict], as_json: bool):
+    import json
+
+    if as_json:
+        click.echo(json.dumps(records, indent=2, default=str))
+        return
+    if not records:
+        click.echo("No results")
+        return
+    columns = list(records[0])
+    widths = [max(len(column), *(len(str(r[column])) for r in records)) for column in columns]
+    click.echo("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for record in records:
+        click.echo("  ".join(str(record[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+@analyze.command("save")
+@click.argument("path", type=click.Path(dir_okay=False, path_type=Path))
+@click.pass_obj
+def analyze_save(obj, path):
+    """Save the loaded forecasts as a .npz frame for fast reloads"""
+    obj["frame"].save(path)
+    click.echo(f"[SUCCESS] Frame saved to {path}")
+
+
+@analyze.command("daily")
+@click.option("--stat", "stats", multiple=True, default=["temperature_c_min", "temperature_c_max", "precipitation_probability_max", "gust_speed_kph_max"], help="Columns to show, repeatable")
+@click.option("--regions", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None, help="JSON mapping of location ID to region")
+@click.pass_obj
+def analyze_daily(obj, stats, regions):
+    """Daily min/max/mean per location, or per region with --regions"""
+    import json
+    from src.analytics.aggregate import daily, regional
+
+    days = daily(obj["frame"])
+    if regions:
+        days = regional(days, json.loads(regions.read_text(encoding="utf-8")))
+    keep = ("id", "name", "date", *stats)
+    echo_records([{k: r[k] for k in keep} for r in days.to_records()], obj["as_json"])
+
+
+@analyze.command("rank")
+@click.argument("stat")
+@click.option("--date", "day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Day to rank (default: tomorrow)")
+@click.option("-n", "--limit", type=int, default=20, help="Locations to show")
+@click.option("--lowest", is_flag=True, help="Smallest values first")
+@click.pass_obj
+def analyze_rank(obj, stat, day, limit, lowest):
+    """Rank locations by a daily stat, e.g. gust_speed_kph_max for the windiest"""
+    from datetime import date, timedelta
+    from src.analytics.aggregate import daily, rank
+
+    days = daily(obj["frame"])
+    if stat not in days.stats:
+        click.echo(f"[ERROR] Unknown stat {stat}; choose from: {', '.join(days.stats)}", err=True)
+        sys.exit(1)
+    day = day.date() if day else date.today() + timedelta(days=1)
+    records = rank(days, stat, day, limit, largest=not lowest)
+    echo_records([{"id": r["id"], "name": r["name"], "date": r["date"], stat: r[stat]} for r in records], obj["as_json"])
+
+
+@analyze.command("alerts")
+@click.argument("thresholds", nargs=-1, required=True)
+@click.pass_obj
+def analyze_alerts(obj, thresholds):
+    """Locations crossing thresholds, e.g. 'gust_speed_kph>=60' 'temperature_c<0'"""
+    from src.analytics.aggregate import alerts, parse_threshold
+
+    try:
+        parsed = [parse_threshold(text) for text in thresholds]
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}", err=True)
+        sys.exit(1)
+    echo_records([alert.model_dump(mode="json") for alert in alerts(obj["frame"], parsed)], obj["as_json"])
+
+
+def interpolation_options(func):
+    func = click.option("-m", "--metric", "metrics", multiple=True, default=["temperature_c", "wind_speed_kph", "precipitation_probability"], help="Metric to interpolate, repeatable")(func)
+    func = click.option("-k", "--neighbours", type=int, default=8, help="Stations used per point")(func)
+    func = click.option("--power", type=float, default=2.0, help="Inverse-distance power")(func)
+    func = click.option("--max-distance", type=float, default=None, help="Ignore stations further away (km)")(func)
+    return func
+
+
+def load_station_fields(frame, metrics):
+    from src.analytics.interpolate import StationFields
+
+    stations = StationFields.from_frame(frame)
+    unknown = [metric for metric in metrics if metric not in stations.values]
+    if unknown or not len(stations.location_ids):
+        message = f"Unknown metric {unknown[0]}" if unknown else "No stored locations have coordinates"
+        click.echo(f"[ERROR] {message}", err=True)
+        sys.exit(1)
+    return stations
+
+
+@analyze.command("point")
+@click.option("--lat", "latitude", type=float, required=True, help="Latitude in degrees")
+@click.option("--lon", "longitude", type=float, required=True, help="Longitude in degrees")
+@click.option("--hours", type=int, default=24, help="Forecast hours to show")
+@interpolation_options
+@click.pass_obj
+def analyze_point(obj, latitude, longitude, hours, metrics, neighbours, power, max_distance):
+    """Interpolated hourly forecast for any coordinate from nearby stored locations"""
+    stations = load_station_fields(obj["frame"], metrics)
+    index = stations.interpolator(neighbours=neighbours, power=power, max_distance_km=max_distance).index(
+        [latitude], [longitude]
+    )
+    series = {metric: index.apply(stations.values[metric])[0] for metric in metrics}
+    records = [
+        {"time": str(stations.times[t]), **{m: round(float(series[m][t]), 1) for m in metrics}}
+        for t in range(min(hours, len(stations.times)))
+    ]
+    echo_records(records, obj["as_json"])
+
+
+@analyze.command("grid")
+@click.option("--bbox", type=float, nargs=4, required=True, help="LAT_MIN LAT_MAX LON_MIN LON_MAX")
+@click.option("--step", type=float, default=0.1, help="Grid spacing in degrees")
+@click.option("--time", "when", default=None, help="Forecast hour, e.g. 2025-01-01T12 (default: first)")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), required=True, help=".npz or .csv file")
+@interpolation_options
+@click.pass_obj
+def analyze_grid(obj, bbox, step, when, output, metrics, neighbours, power, max_distance):
+    """Gridded fields for one forecast hour, interpolated from stored locations"""
+    import numpy as np
+    from src.analytics.interpolate import grid
+
+    stations = load_station_fields(obj["frame"], metrics)
+    try:
+        t = stations.time_index(when) if when else 0
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    latitudes, longitudes = grid(*bbox, step)
+    index = stations.interpolator(neighbours=neighbours, power=power, max_distance_km=max_distance).index(
+        latitudes, longitudes
+    )
+    fields = {metric: index.apply(stations.values[metric][:, t]) for metric in metrics}
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix == ".csv":
+        columns = np.column_stack([latitudes.ravel(), longitudes.ravel(), *(fields[m].ravel() for m in metrics)])
+        np.savetxt(output, columns, delimiter=",", fmt="%.4f", header=",".join(["lat", "lon", *metrics]), comments="")
+    else:
+        np.savez(output, latitude=latitudes, longitude=longitudes, time=stations.times[t], **fields)
+    click.echo(f"[SUCCESS] {latitudes.size} points at {stations.times[t]} from {len(stations.location_ids)} stations -> {output}")
+
+
+@main.command()
+@click.argument("old", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--json", "as_json", is_flag=True, help="Print the full diff as JSON")
+def diff(old, new, as_json):
+    """Compare two saved forecast snapshots hour by hour"""
+    from src.analytics.diff import SnapshotArrays, diff_snapshots
+
+    try:
+        result = diff_snapshots(SnapshotArrays.from_file(old), SnapshotArrays.from_file(new))
+    except (OSError, ValueError, KeyError, WeatherScraperException) as e:
+        click.echo(f"\n[ERROR] Cannot diff snapshots: {e}", err=True)
+        sys.exit(1)
+
+    if as_json:
+        click.echo(result.model_dump_json(indent=2))
+        return
+
+    click.echo(f"{result.location_id}: {result.previous_last_updated} -> {result.last_updated}")
+    click.echo(
+        f"{result.compared} hours compared, {len(result.changed)} changed, "
+        f"{len(result.added)} added, {len(result.dropped)} dropped"
+    )
+    click.echo(
+        f"Temperature: max delta {result.max_temperature_delta:+d}C, "
+        f"mean |delta| {result.mean_abs_temperature_delta:.2f}C"
+    )
+    for field, count in sorted(result.field_changes.items(), key=lambda item: -item[1]):
+        click.echo(f"  {field:<36} {count:>4} hours")
+    if result.added:
+        click.echo(f"Added: {result.added[0]} .. {result.added[-1]}")
+    if result.dropped:
+        click.echo(f"Dropped: {result.dropped[0]} .. {result.dropped[-1]}")
+
+
+@main.command()
+@click.option("--by", type=click.Choice(["location", "day"]), default="location", help="One archive per location or per day")
+@click.option("--older-than", "older_than_days", type=int, default=None, help="Only compact days at least this old (default: COMPACT_OLDER_THAN_DAYS)")
+@click.option("--keep-sources", is_flag=True, help="Leave the snapshot files in place")
+def compact(by, older_than_days, keep_sources):
+    """Merge small snapshot files into compressed archives under ARCHIVE_DIR"""
+    from src.storage.compaction import compact as compact_snapshots
+
+    try:
+        result = compact_snapshots(by=by, older_than_days=older_than_days, keep_sources=keep_sources)
+    except WeatherScraperException as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"Compacted {result.files} snapshots into {result.archives} archives: "
+        f"{result.bytes_before / 1e6:.1f} MB -> {result.bytes_after / 1e6:.1f} MB"
+    )
+    if result.skipped:
+        click.echo(f"Skipped {result.skipped} unreadable files")
+
+
+@main.command()
+@click.option("--location-id", required=True, help="BBC Weather location ID")
+@click.option("--json", "as_json", is_flag=True, help="Print the archived snapshots as JSON")
+def history(location_id, as_json):
+    """List a location's archived snapshots"""
+    import json
+    from src.storage.compaction import SnapshotArchive
+
+    archive = SnapshotArchive()
+    try:
+        if as_json:
+            snapshots = list(archive.read(archive.entries(location_id)))
+            click.echo(json.dumps(snapshots, indent=2, ensure_ascii=False))
+            return
+        echo_records(
+            [
+                {"saved_at": entry.saved_at, "last_updated": entry.last_updated, "archive": entry.archive}
+                for entry in archive.entries(location_id)
+            ],
+            as_json=False,
+        )
+    except (OSError, ValueError) as e:
+        click.echo(f"\n[ERROR] Cannot read archive: {e}", err=True)
+        sys.exit(1)
+    finally:
+        archive.close()
+
+
+@main.group()
+def deltas():
+    """Long-term history as compressed keyframes plus deltas (DELTA_DIR)"""
+
+
+@deltas.command("pack")
+def deltas_pack():
+    """Append stored snapshots (OUTPUT_DIR and compacted archives) to the delta archives"""
+    from src.storage.delta_archive import pack
+
+    try:
+        result = pack()
+    except WeatherScraperException as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"Packed {result.snapshots} snapshots of {result.locations} locations: "
+        f"{result.bytes_before / 1e6:.1f} MB as JSON -> {result.bytes_after / 1e6:.2f} MB of delta archives"
+    )
+
+
+@deltas.command("show")
+@click.option("--location-id", required=True, help="BBC Weather location ID")
+@click.option("--index", type=int, default=-1, help="Snapshot number, negative from the newest")
+@click.option("--at", "when", default=None, help="Newest snapshot updated at or before this ISO time")
+def deltas_show(location_id, index, when):
+    """Print one reconstructed snapshot as JSON"""
+    import json
+    from src.storage.delta_archive import DeltaArchive
+
+    archive = DeltaArchive()
+    try:
+        snapshot = archive.at(location_id, when) if when else archive.get(location_id, index)
+    except (IndexError, ValueError, WeatherScraperException) as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+    click.echo(json.dumps(snapshot, indent=2, ensure_ascii=False))
+
+
+@deltas.command("stats")
+def deltas_stats():
+    """Snapshots, keyframes and bytes per location"""
+    from src.storage.delta_archive import KEYFRAME, DeltaArchive
+
+    archive = DeltaArchive()
+    records = []
+    for location_id in archive.locations():
+        location_records = archive.records(location_id)
+        records.append(
+            {
+                "location_id": location_id,
+                "snapshots": len(location_records),
+                "keyframes": sum(record.kind == KEYFRAME for record in location_records),
+                "kb": round(archive.path(location_id).stat().st_size / 1024, 1),
+                "raw_kb": round(sum(record.raw_length for record in location_records) / 1024, 1),
+            }
+        )
+    echo_records(records, as_json=False)
+
+
+@main.group()
+def binary():
+    """Memory-mapped fixed-width hourly records for fast lookups and scans (BINARY_DIR)"""
+
+
+@binary.command("pack")
+def binary_pack():
+    """Append stored snapshots (OUTPUT_DIR and compacted archives) to the binary store"""
+    from src.storage.binary_store import pack
+
+    try:
+        snapshots, records = pack()
+    except WeatherScraperException as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+    click.echo(f"Packed {snapshots} snapshots ({records} hourly records)")
+
+
+@binary.command("get")
+@click.option("--location-id", required=True, help="BBC Weather location ID")
+@click.option("--time", "start", required=True, help="Local forecast time, e.g. 2025-01-01T12:00")
+@click.option("--until", "end", default=None, help="End of a time range (exclusive)")
+@click.option("--all-snapshots", is_flag=True, help="Every stored forecast for each hour, not just the newest")
+@click.option("--json", "as_json", is_flag=True, help="Print JSON instead of a table")
+def binary_get(location_id, start, end, all_snapshots, as_json):
+    """Hourly records of one location at a time or over a range"""
+    from src.storage.binary_store import BinaryStore
+
+    store = BinaryStore()
+    try:
+        records = store.decode(store.lookup(location_id, start, end, latest=not all_snapshots))
+    except (ValueError, WeatherScraperException) as e:
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    if not as_json:
+        columns = ("last_updated", "local_date", "timeslot", "temperature_c", "precipitation_probability_percent", "wind_speed_kph", "weather_type_text")
+        records = [{column: record[column] for column in columns} for record in records]
+    echo_records(records, as_json)
+
+
+@binary.command("stats")
+def binary_stats():
+    """Segments, records and size of the binary store"""
+    from src.storage.binary_store import BinaryStore
+
+    stats = BinaryStore().stats()
+    click.echo(
+        f"{stats.records} records of {stats.locations} locations in {stats.segments} segments, "
+        f"{stats.strings} dictionary strings, {stats.bytes / 1e6:.1f} MB"
+    )
+
+
+@main.group()
+def browser():
+    """Persistent browser daemon that scrapes attach to"""
+
+
+@browser.command("daemon")
+@click.option("--port", type=int, default=None, help="CDP port (default: BROWSER_DAEMON_PORT)")
+@click.option("--idle-timeout", type=float, default=None, help="Stop after this many idle seconds, 0 = never")
+def browser_daemon(port, idle_timeout):
+    """Keep a warmed Chromium running until idle or stopped"""
+    from src.services.browser_daemon import BrowserDaemon
+
+    try:
+        asyncio.run(BrowserDaemon(port=port, idle_timeout=idle_timeout).run())
+
+    except WeatherScraperException as e:
+        logger.error(f"Browser daemon failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+
+@browser.command("status")
+def browser_status():
+    """Report whether a healthy browser daemon is available"""
+    from src.services.browser_daemon import find_daemon_endpoint
+
+    endpoint = asyncio.run(find_daemon_endpoint())
+    if endpoint:
+        click.echo(f"[RUNNING] Browser daemon at {endpoint}")
+    else:
+        click.echo("[STOPPED] No healthy browser daemon; scrapes launch Chromium locally")
+        sys.exit(1)
+
+
+@browser.command("stop")
+def browser_stop():
+    """Ask the running browser daemon to shut down"""
+    from src.services.browser_daemon import stop_daemon
+
+    if stop_daemon():
+        click.echo("[STOPPED] Browser daemon signalled to stop")
+    else:
+        click.echo("[STOPPED] No browser daemon running")
+
+
+@main.command()
+@click.option("--host", default=None, help="Interface to bind (default: API_HOST)")
+@click.option("--port", type=int, default=None, help="Port to listen on (default: API_PORT)")
+@click.option("-l", "--location", "locations", multiple=True, help="Location to keep refreshed, repeatable")
+@click.option("--location-id", "location_ids", multiple=True, help="BBC Weather location ID to keep refreshed, repeatable")
+def serve(host, port, locations, location_ids):
+    """Serve /forecast/{location_id} and the /stream change feed from cache"""
+    from src.scrapers.bs4.scraper import BBCWeatherScraper
+    from src.services.api_server import APIServer, ForecastService
+    from src.services.refresh_scheduler import RefreshScheduler
+
+    # One pooled bs4 scraper for the process; Scrapy's reactor cannot be reused
+    scraper = BBCWeatherScraper()
+
+    scheduler = None
+    watched = resolve_locations(locations, location_ids)
+    if watched:
+        scheduler = RefreshScheduler(scraper, storage=JSONStorage())
+        scheduler.load_state()
+        for loc in watched:
+            scheduler.add_location(loc)
+
+    server = APIServer(ForecastService(scraper, scheduler=scheduler), host=host, port=port)
+
+    try:
+        asyncio.run(server.serve_forever())
+
+    except WeatherScraperException as e:
+        logger.error(f"Forecast API failed: {e}")
+        click.echo(f"\n[ERROR] {e}", err=True)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        logger.warning("Forecast API stopped by user")
+        click.echo("\n[STOPPED] Forecast API stopped", err=True)
+
+
+def standin_options(func):
+    options = [
+        click.option("--latency", default="none", type=click.Choice(["none", "fixed", "uniform", "exponential", "lognormal"]), help="Latency distribution"),
+        click.option("--latency-ms", type=float, default=0.0, help="Fixed, mean or median latency in ms"),
+        click.option("--latency-spread-ms", type=float, default=0.0, help="Half-width for uniform latency in ms"),
+        click.option("--latency-sigma", type=float, default=0.5, help="Shape of the lognormal tail"),
+        click.option("--error-rate", type=float, default=0.0, help="Share of injected 5xx responses"),
+        click.option("--throttle-rate", type=float, default=0.0, help="Share of injected 429 responses"),
+        click.option("--throttle-rps", type=float, default=None, help="Answer 429 above this request rate"),
+        click.option("--bandwidth-kbps", type=float, default=None, help="Per-response bandwidth limit in KB/s"),
+        click.option("--filler-kb", type=int, default=None, help="Filler markup in synthetic pages (default: 600)"),
+        click.option("--seed", type=int, default=None, help="Seed for injected latency and faults"),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def build_standin_profile(**options):
+    from src.standin.server import StandInProfile
+
+    return StandInProfile(**{key: value for key, value in options.items() if value is not None})
+
+
+@main.group()
+def standin():
+    """Local stand-in for BBC Weather serving recorded pages"""
+
+
+@standin.command("serve")
+@click.option("--host", default="127.0.0.1", help="Interface to bind")
+@click.option("--port", type=int, default=8765, help="Port to listen on")
+@standin_options
+def standin_serve(host, port, **options):
+    """Serve forecast pages for any location ID with injected faults"""
+    from src.standin.server import StandInServer
+
+    server = StandInServer(host, port, profile=build_standin_profile(**options))
+    click.echo(f"[RUNNING] Stand-in at {server.base_url}; set BBC_WEATHER_BASE_URL={server.base_url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\n[STOPPED] Stand-in server stopped")
+
+
+@standin.command("record")
+@click.argument("location_ids", nargs=-1, required=True)
+def standin_record(location_ids):
+    """Record live BBC Weather pages for the stand-in to serve"""
+    import httpx
+    from src.standin.pages import record
+
+    try:
+        for path in record(list(location_ids)):
+            click.echo(f"[SUCCESS] Recorded {path}")
+
+    except httpx.HTTPError as e:
+        click.echo(f"\n[ERROR] Recording failed: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.option("-e", "--engine", "engines", multiple=True, type=click.Choice(["http", "bs4", "scrapy"]), help="Engine to test, repeatable (default: all)")
+@click.option("-c", "--concurrency", "concurrency_levels", multiple=True, type=int, help="Concurrency level, repeatable (default: 1 2 4 8)")
+@click.option("-n", "--requests", "requests_per_level", type=int, default=20, help="Scrapes per concurrency level")
+@click.option("--rpm", type=int, default=None, help="Requests-per-minute budget (default: unlimited)")
+@click.option("--page-load-wait", type=int, default=0, help="PAGE_LOAD_WAIT in ms for browser engines")
+@click.option("--json", "json_path", type=click.Path(dir_okay=False), help="Write results to this JSON file")
+@standin_options
+def loadtest(engines, concurrency_levels, requests_per_level, rpm, page_load_wait, json_path, **options):
+    """Measure throughput and tail latency per engine against the local stand-in"""
+    import json
+    from src.services.load_test import ENGINES, LoadTest
+    from src.standin.server import StandInServer
+
+    with StandInServer(profile=build_standin_profile(**options)) as server:
+        load_test = LoadTest(
+            server.base_url,
+            engines=list(engines) or ENGINES,
+            concurrency_levels=sorted(concurrency_levels) or [1, 2, 4, 8],
+            requests_per_level=requests_per_level,
+            requests_per_minute=rpm,
+            page_load_wait=page_load_wait,
+        )
+
+        try:
+            cells = load_test.run()
+        except KeyboardInterrupt:
+            click.echo("\n[INTERRUPTED] Cancelled by user", err=True)
+            sys.exit(130)
+
+        server_stats = dict(server.stats)
+
+    click.echo(f"\n{'Engine':<8} {'Conc':>5} {'OK':>5} {'Fail':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    click.echo("-" * 64)
+    for cell in cells:
+        click.echo(
+            f"{cell.engine:<8} {cell.concurrency:>5} {cell.succeeded:>5} {cell.failed:>5} "
+            f"{cell.throughput_per_s:>8.2f} {cell.p50_ms or 0:>9.1f} {cell.p95_ms or 0:>9.1f} {cell.p99_ms or 0:>9.1f}"
+        )
+    for cell in cells:
+        if cell.errors:
+            click.echo(f"[ERRORS] {cell.engine} x{cell.concurrency}: {cell.errors}", err=True)
+    click.echo(f"\nStand-in: {server_stats}")
+
+    if json_path:
+        results = {"cells": [cell.model_dump() for cell in cells], "server": server_stats}
+        Path(json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
 if __name__ == "__main__":
     main()
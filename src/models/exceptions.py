@@ -22,6 +22,12 @@ class BrowserException(WeatherScraperException):
     pass
 
 
+class TransientBrowserException(BrowserException):
+    """Exception raised when a browser operation failed in a way a retry may fix"""
+
+    pass
+
+
 class StorageException(WeatherScraperException):
     """Exception raised during storage operations"""
 
@@ -44,3 +50,15 @@ class ValidationException(WeatherScraperException):
     """Exception raised when data validation fails"""
 
     pass
+
+
+class QueueException(WeatherScraperException):
+    """Exception raised when a job queue operation is not allowed"""
+
+    pass
+
+
+class CatalogException(WeatherScraperException):
+    """Exception raised when the location catalog cannot be built or read"""
+
+    pass
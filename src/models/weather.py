@@ -48,6 +48,16 @@ class HourlyReport(BaseModel):
     pressure: int = Field(..., description="Atmospheric pressure in millibars")
     visibility: str = Field(..., description="Visibility description")
 
+    # Derived at ingest (src/analytics/derived.py); None when disabled or undefined
+    dew_point_c: Optional[float] = Field(None, description="Dew point in Celsius")
+    heat_index_c: Optional[float] = Field(None, description="NWS heat index in Celsius")
+    wind_chill_c: Optional[float] = Field(
+        None, description="Wind chill in Celsius, only at or below 10C with wind"
+    )
+    pressure_tendency_mb: Optional[float] = Field(
+        None, description="Pressure change over the previous 3 hours in millibars"
+    )
+
     @field_validator("local_date", mode="before")
     @classmethod
     def parse_date(cls, v):
@@ -59,6 +69,11 @@ class HourlyReport(BaseModel):
         populate_by_name = True
 
 
+# HourlyReport fields filled in by src/analytics/derived.py; kept here so
+# storage can name them without importing NumPy
+DERIVED_FIELDS = ("dew_point_c", "heat_index_c", "wind_chill_c", "pressure_tendency_mb")
+
+
 class DetailedForecast(BaseModel):
 
     issue_date: datetime = Field(..., alias="issueDate")
@@ -153,6 +168,7 @@ class WeatherData(BaseModel):
     location_id: str
     location_name: Optional[str] = None
     last_updated: datetime
+    issue_date: Optional[datetime] = None
     current_conditions: Optional[HourlyReport] = None
     hourly_forecast: List[HourlyReport] = Field(default_factory=list)
     daily_summaries: List[SummaryReport] = Field(default_factory=list)
@@ -166,6 +182,7 @@ class WeatherData(BaseModel):
     ) -> "WeatherData":
         all_hourly_reports = []
         last_updated = None
+        issue_date = None
 
         for forecast in response.data.forecasts:
             if forecast.detailed and forecast.detailed.reports:
@@ -175,6 +192,8 @@ class WeatherData(BaseModel):
                     or forecast.detailed.last_updated > last_updated
                 ):
                     last_updated = forecast.detailed.last_updated
+                if issue_date is None or forecast.detailed.issue_date > issue_date:
+                    issue_date = forecast.detailed.issue_date
 
         if last_updated is None:
             last_updated = datetime.now(timezone.utc)
@@ -190,6 +209,7 @@ class WeatherData(BaseModel):
             location_id=response.options.location_id,
             location_name=location_name,
             last_updated=last_updated,
+            issue_date=issue_date,
             current_conditions=current_conditions,
             hourly_forecast=all_hourly_reports,
             daily_summaries=daily_summaries,
@@ -1,16 +1,57 @@
+import hashlib
 import json
+import marshal
 import re
-from typing import Optional
+import threading
+from typing import Dict, Optional
 from bs4 import BeautifulSoup
 
-from src.models.weather import WeatherData, BBCWeatherResponse
+from src.cache.lru import LRUCache
+from src.models.weather import (
+    BBCWeatherResponse,
+    DailyForecast,
+    DetailedForecast,
+    ForecastData,
+    WeatherData,
+    WeatherOptions,
+)
 from src.models.exceptions import (
     DataExtractionException,
     ParserException,
     ValidationException,
 )
+from src.utils.config import settings
+from src.utils.metrics import metrics, span, timed
 from .base import BaseParser
 
+parse_days = metrics.counter("parse_days_total", "Forecast days parsed, by whether the model was reused")
+
+# location_id -> {digest of a raw day's reports and summary: validated model}, for the latest page only
+_day_cache = LRUCache(max_entries=settings.parse_cache_locations)
+# Batch pipelines parse in worker threads; the LRU reorders itself on every read
+_day_cache_lock = threading.Lock()
+# marshal is lossless and over twice as cheap as json.dumps. Versions 3+ flag objects by
+# refcount, so equal data can serialize differently; version 2 gives equal bytes for
+# equal JSON values, and a spurious mismatch would only cost a rebuild
+MARSHAL_VERSION = 2
+
+
+def _copy_day(day: DailyForecast, stamps: Optional[DetailedForecast]) -> DailyForecast:
+    """Fresh report objects around cached values, so derived fields set later never leak between scrapes.
+
+    stamps carries this page's issueDate/lastUpdated, which are left out of the
+    digest and so may differ from the cached day's; None means no detailed block.
+    """
+    detailed = None
+    if stamps is not None:
+        reports = day.detailed.reports if day.detailed is not None else []
+        detailed = DetailedForecast.model_construct(
+            issue_date=stamps.issue_date,
+            last_updated=stamps.last_updated,
+            reports=[report.model_copy() for report in reports],
+        )
+    return DailyForecast.model_construct(detailed=detailed, summary=day.summary)
+
 
 class BBCWeatherParser(BaseParser):
 
@@ -25,7 +66,14 @@ class BBCWeatherParser(BaseParser):
                     "BBC Weather response validation failed: no forecast data"
                 )
 
-            weather_data = WeatherData.from_bbc_response(bbc_response, location_name)
+            with span("model_build"):
+                weather_data = WeatherData.from_bbc_response(bbc_response, location_name)
+
+            if settings.derived_metrics:
+                from src.analytics.derived import add_derived_metrics
+
+                with span("derived_metrics"):
+                    add_derived_metrics(weather_data)
 
             return weather_data
 
@@ -34,7 +82,72 @@ class BBCWeatherParser(BaseParser):
         except Exception as e:
             raise ParserException(f"Failed to parse BBC Weather HTML: {str(e)}") from e
 
+    @timed("parse_extract_json")
     def extract_json(self, html_content: str) -> BBCWeatherResponse:
+        weather_json = self.extract_raw_json(html_content)
+
+        try:
+            return self.build_response(weather_json)
+        except Exception as e:
+            raise DataExtractionException(
+                f"Failed to extract JSON from HTML: {str(e)}"
+            ) from e
+
+    def build_response(self, weather_json: dict) -> BBCWeatherResponse:
+        """Validate the page JSON, reusing models of days whose reports are unchanged since the last scrape"""
+        if not settings.incremental_parse:
+            return BBCWeatherResponse(**weather_json)
+
+        options = WeatherOptions(**weather_json["options"])
+        with _day_cache_lock:
+            previous: Dict[bytes, DailyForecast] = _day_cache.get(options.location_id) or {}
+        current: Dict[bytes, DailyForecast] = {}
+        days = []
+
+        for block in weather_json["data"]["forecasts"]:
+            detailed = block.get("detailed")
+            # issueDate/lastUpdated change on every day each time the page is re-issued, so
+            # only the content is hashed and the timestamps are validated on their own
+            content = (detailed.get("reports") if detailed else None, block.get("summary"))
+            digest = hashlib.blake2b(marshal.dumps(content, MARSHAL_VERSION), digest_size=16).digest()
+            day = current.get(digest) or previous.get(digest)
+            if day is None:
+                day = DailyForecast.model_validate(block)
+                stamps = day.detailed
+                parse_days.inc(result="built")
+            else:
+                stamps = DetailedForecast.model_validate({**detailed, "reports": []}) if detailed else None
+                parse_days.inc(result="reused")
+            current[digest] = day
+            days.append(_copy_day(day, stamps))
+
+        with _day_cache_lock:
+            _day_cache.set(options.location_id, current)
+        return BBCWeatherResponse.model_construct(
+            options=options, data=ForecastData.model_construct(forecasts=days)
+        )
+
+    def _find_raw_json(self, html_content: str) -> Optional[dict]:
+        # The forecast JSON sits verbatim in a script; decoding it straight from the
+        # page text skips building an html5lib tree, which dominates parse time
+        decoder = json.JSONDecoder()
+        for pattern in ('{"options":', '{"data":'):
+            start = html_content.find(pattern)
+            while start >= 0:
+                try:
+                    data, _ = decoder.raw_decode(html_content, start)
+                except json.JSONDecodeError:
+                    data = None
+                if isinstance(data, dict) and "forecasts" in (data.get("data") or {}):
+                    return data
+                start = html_content.find(pattern, start + 1)
+        return None
+
+    def extract_raw_json(self, html_content: str) -> dict:
+        weather_json = self._find_raw_json(html_content)
+        if weather_json is not None:
+            return weather_json
+
         try:
             soup = BeautifulSoup(html_content, "html5lib")
             all_scripts = soup.find_all("script")
@@ -67,9 +180,10 @@ class BBCWeatherParser(BaseParser):
                     "Could not find weather JSON data in HTML"
                 )
 
-            bbc_response = BBCWeatherResponse(**weather_json)
-            return bbc_response
+            return weather_json
 
+        except DataExtractionException:
+            raise
         except json.JSONDecodeError as e:
             raise DataExtractionException(f"Invalid JSON structure: {str(e)}") from e
         except Exception as e:
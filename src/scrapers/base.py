@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 
 from src.models.weather import WeatherData
 from src.models.location import Location
 
 
 class BaseScraper(ABC):
+    engine: str = ""
 
     @abstractmethod
     async def initialize(self):
@@ -25,3 +26,13 @@ class BaseScraper(ABC):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.cleanup()
+
+
+def scrape_key(scraper: BaseScraper, location: Location) -> Tuple[str, str]:
+    """Single-flight key: concurrent scrapes of one location on one scraper share a result"""
+    return (scraper.engine, location.location_id)
+
+
+def fetch_key(scraper: BaseScraper, location: Location) -> Tuple[str, str, str]:
+    """Single-flight key for page fetches, kept apart from scrape_key on the same scraper"""
+    return (scraper.engine, "html", location.location_id)
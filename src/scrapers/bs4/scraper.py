@@ -7,13 +7,17 @@ from src.models.exceptions import ScraperException
 from src.services.browser_service import BrowserService
 from src.parsers.bbc_parser import BBCWeatherParser
 from src.utils.config import settings
-from src.utils.logger import logger
+from src.utils.logger import debug_enabled, logger
+from src.utils.metrics import scrape_failures
 from src.utils.rate_limiter import rate_limiter
 from src.utils.retry import retry_on_browser_error
-from ..base import BaseScraper
+from src.utils.single_flight import single_flight
+from ..base import BaseScraper, fetch_key, scrape_key
 
 
 class BBCWeatherScraper(BaseScraper):
+    engine = "bs4"
+
     def __init__(self):
         self.browser_service = BrowserService()
         self.parser = BBCWeatherParser()
@@ -29,53 +33,66 @@ class BBCWeatherScraper(BaseScraper):
             logger.error(f"Failed to initialize scraper: {e}")
             raise ScraperException(f"Scraper initialization failed: {str(e)}") from e
 
-    @retry_on_browser_error(max_attempts=3)
+    @single_flight(scrape_key)
     async def scrape(self, location: Location) -> WeatherData:
         if not self.browser_service.is_initialized:
             raise ScraperException("Scraper not initialized. Call initialize() first.")
 
         try:
-            await rate_limiter.acquire()
+            html_content = await self.fetch_html(location)
+
+            logger.info("Parsing weather data...")
+            weather_data = self.parser.parse_html(html_content, location.name)
 
-            url = settings.get_weather_url(location.location_id)
-            logger.info(
-                f"Scraping weather for {location.name} (ID: {location.location_id})"
+            weather_data.location_id = location.location_id
+            weather_data.location_name = location.name
+
+            logger.info(f"Successfully scraped weather for {location.name}")
+            logger.debug(
+                "Found {} hourly reports", len(weather_data.hourly_forecast)
             )
 
-            page = await self.browser_service.new_page()
-            self._page = page
+            return weather_data
 
-            try:
-                await self.browser_service.goto(page, url)
+        except Exception as e:
+            logger.error(f"Failed to scrape weather for {location.name}: {e}")
+            scrape_failures.inc(engine=self.engine)
+            raise ScraperException(
+                f"Scraping failed for {location.name}: {str(e)}"
+            ) from e
 
-                title = await page.title()
-                logger.debug(f"Page title: {title}")
+    # Retries live here rather than on scrape(), whose errors are already wrapped
+    # in ScraperException, so batch pipelines calling fetch_html get them too
+    @single_flight(fetch_key)
+    @retry_on_browser_error(max_attempts=3)
+    async def fetch_html(self, location: Location) -> str:
+        if not self.browser_service.is_initialized:
+            raise ScraperException("Scraper not initialized. Call initialize() first.")
 
-                html_content = await self.browser_service.get_content(page)
-                logger.debug(f"Retrieved HTML content ({len(html_content)} characters)")
+        await rate_limiter.acquire()
 
-                logger.info("Parsing weather data...")
-                weather_data = self.parser.parse_html(html_content, location.name)
+        url = settings.get_weather_url(location.location_id)
+        logger.info(
+            f"Scraping weather for {location.name} (ID: {location.location_id})"
+        )
 
-                weather_data.location_id = location.location_id
-                weather_data.location_name = location.name
+        page = await self.browser_service.new_page()
+        self._page = page
 
-                logger.info(f"Successfully scraped weather for {location.name}")
-                logger.debug(
-                    f"Found {len(weather_data.hourly_forecast)} hourly reports"
-                )
+        try:
+            await self.browser_service.goto(page, url)
 
-                return weather_data
+            # Fetching the title costs a browser round trip, so only do it for DEBUG
+            if debug_enabled():
+                logger.debug("Page title: {}", await page.title())
 
-            finally:
-                await self.browser_service.close_page(page)
-                self._page = None
+            html_content = await self.browser_service.get_content(page)
+            logger.debug("Retrieved HTML content ({} characters)", len(html_content))
+            return html_content
 
-        except Exception as e:
-            logger.error(f"Failed to scrape weather for {location.name}: {e}")
-            raise ScraperException(
-                f"Scraping failed for {location.name}: {str(e)}"
-            ) from e
+        finally:
+            await self.browser_service.close_page(page)
+            self._page = None
 
     async def take_screenshot(self, path: str):
         if self._page:
@@ -1,8 +1,6 @@
 from typing import Literal, Optional
 
 from .base import BaseScraper
-from .bs4.scraper import BBCWeatherScraper
-from .scrapy_impl.scraper import ScrapyWeatherScraper
 
 
 def create_scraper(
@@ -11,9 +9,14 @@ def create_scraper(
     output_filename: Optional[str] = None,
 ) -> BaseScraper:
 
+    # Engines are imported on demand: Scrapy/Twisted and Playwright are slow to load
     if engine == "bs4":
+        from .bs4.scraper import BBCWeatherScraper
+
         return BBCWeatherScraper()
     elif engine == "scrapy":
+        from .scrapy_impl.scraper import ScrapyWeatherScraper
+
         return ScrapyWeatherScraper(
             storage_format=storage_format, output_filename=output_filename
         )
@@ -1,46 +1,193 @@
+import asyncio
+import time
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
+from src.models.exceptions import StorageException
 from src.models.weather import WeatherData
 from src.storage.json_storage import JSONStorage
 from src.storage.csv_storage import CSVStorage
+from src.utils.config import settings
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+storage_queue_depth = metrics.gauge("scrapy_storage_queue_depth", "Scraped items buffered for the next storage flush")
+storage_flush_seconds = metrics.histogram("scrapy_storage_flush_seconds", "Time to write one batch of scraped items")
+storage_items_written = metrics.counter("scrapy_storage_items_total", "Scraped items written by the storage pipeline")
+storage_flush_failures = metrics.counter("scrapy_storage_flush_failures_total", "Storage flushes that failed")
 
 
 class StoragePipeline:
-    def __init__(self):
+    """Buffers scraped items and writes them in batches on a worker thread.
+
+    A batch is flushed when it reaches SCRAPY_BATCH_SIZE items, when its oldest
+    item has waited SCRAPY_FLUSH_INTERVAL seconds, and when the spider closes.
+    Files are written one per location, or in consolidated mode appended to a
+    single JSON Lines file per crawl.
+    """
+
+    def __init__(
+        self,
+        crawler=None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        output_mode: Optional[str] = None,
+    ):
+        self.crawler = crawler
+        self.batch_size = batch_size or settings.scrapy_batch_size
+        self.flush_interval = settings.scrapy_flush_interval if flush_interval is None else flush_interval
+        self.output_mode = output_mode or settings.scrapy_output_mode
         self.json_storage = JSONStorage()
         self.csv_storage = CSVStorage()
         self.storage_format: Optional[str] = None
         self.output_filename: Optional[str] = None
+        self.single_location = True
+        self.consolidated_path: Optional[Path] = None
+        self.saved_paths: List[Path] = []
+
+        self._buffer: List[WeatherData] = []
+        self._oldest: Optional[float] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    @property
+    def spider(self):
+        return self.crawler.spider if self.crawler else None
 
-    def open_spider(self, spider):
+    def open_spider(self):
+        spider = self.spider
         self.storage_format = getattr(spider, "storage_format", "json")
         self.output_filename = getattr(spider, "output_filename", None)
+        self.single_location = len(getattr(spider, "locations", None) or []) <= 1
+
+        if self.output_mode == "consolidated":
+            if self.storage_format == "json":
+                self.consolidated_path = self._consolidated_path()
+            else:
+                logger.warning("Consolidated output is JSON Lines only; CSV items are written per location")
+
+        self._write_lock = asyncio.Lock()
+        if self.flush_interval > 0:
+            self._timer = asyncio.ensure_future(self._flush_periodically())
 
         logger.info(
-            f"Storage pipeline initialized with format: {self.storage_format}"
+            f"Storage pipeline initialized with format: {self.storage_format}, "
+            f"batches of {self.batch_size}, flush every {self.flush_interval}s"
         )
 
-    async def process_item(self, item: WeatherData, spider):
-        try:
-            if not self.output_filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                location_slug = item.location_name.lower().replace(" ", "_")
-                self.output_filename = f"weather_{location_slug}_{timestamp}"
+    def _consolidated_path(self) -> Path:
+        now = datetime.now()
+        directory = settings.output_dir
+        if settings.storage_layout == "partitioned":
+            directory = directory / f"date={now.date().isoformat()}"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"{self.output_filename or 'crawl'}_{now:%Y%m%d_%H%M%S}.jsonl"
 
-            if self.storage_format == "csv":
-                filepath = await self.csv_storage.save(item, self.output_filename)
-            else:
-                filepath = await self.json_storage.save(item, self.output_filename)
+    def _filename(self, item: WeatherData) -> Optional[str]:
+        # A custom name is used as-is for one location; with several it gets a per-location suffix
+        if not self.output_filename or self.single_location:
+            return self.output_filename
+        location_slug = (item.location_name or item.location_id).lower().replace(" ", "_")
+        return f"{self.output_filename}_{location_slug}"
+
+    async def process_item(self, item: WeatherData):
+        if not self._buffer:
+            self._oldest = time.monotonic()
+        self._buffer.append(item)
+        self._set_depth()
+
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        return item
+
+    def _set_depth(self):
+        storage_queue_depth.set(len(self._buffer))
+        if self.crawler is not None:
+            self.crawler.stats.set_value("storage/queue_depth", len(self._buffer))
+            self.crawler.stats.max_value("storage/queue_depth_max", len(self._buffer))
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(min(1.0, self.flush_interval))
+            if self._buffer and time.monotonic() - self._oldest >= self.flush_interval:
+                await self.flush()
+
+    async def flush(self):
+        """Write everything buffered so far; batches are written one at a time, in order"""
+        batch, self._buffer = self._buffer, []
+        oldest = self._oldest
+        self._set_depth()
+        if not batch:
+            return
+
+        async with self._write_lock:
+            written: List[Path] = []
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write_batch, batch, written)
+            except Exception as e:
+                storage_flush_failures.inc()
+                # Unwritten items go back in front of anything buffered since, so a later flush retries them in order
+                unwritten = batch[len(written):]
+                self._buffer[:0] = unwritten
+                self._oldest = oldest
+                self._set_depth()
+                logger.error(f"Failed to save {len(unwritten)} of {len(batch)} weather items, will retry: {e}")
+                batch = batch[:len(written)]
+                if not batch:
+                    return
+            elapsed = time.perf_counter() - start
+        elapsed_ms = round(elapsed * 1000, 3)
+
+        self.saved_paths.extend(path for path in dict.fromkeys(written) if path not in self.saved_paths)
+        storage_flush_seconds.observe(elapsed)
+        storage_items_written.inc(len(batch))
+        if self.crawler is not None:
+            stats = self.crawler.stats
+            stats.inc_value("storage/flushes")
+            stats.inc_value("storage/items_written", len(batch))
+            stats.set_value("storage/flush_time_ms", round(stats.get_value("storage/flush_time_ms", 0) + elapsed_ms, 3))
+            stats.max_value("storage/flush_time_max_ms", elapsed_ms)
+        logger.info(f"Saved {len(batch)} weather items in {elapsed_ms:.1f} ms")
+
+    def _write_batch(self, batch: List[WeatherData], written: List[Path]):
+        """Write a batch, appending one path per saved item to written as it goes"""
+        if self.consolidated_path is not None:
+            with open(self.consolidated_path, "a", encoding="utf-8") as f:
+                f.writelines(item.model_dump_json() + "\n" for item in batch)
+            written.extend([self.consolidated_path] * len(batch))
+
+            async def track_all():
+                for item in batch:
+                    await self.json_storage.track_changes(item)
+
+            asyncio.run(track_all())
+            return
+
+        storage = self.csv_storage if self.storage_format == "csv" else self.json_storage
+
+        async def save_all():
+            for item in batch:
+                written.append(await storage.save(item, self._filename(item)))
 
-            logger.info(f"Saved weather data to: {filepath}")
+        # The storages are coroutine-based; this thread gets its own short-lived loop
+        asyncio.run(save_all())
 
-            return item
+    async def close_spider(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        await self.flush()
 
-        except Exception as e:
-            logger.error(f"Failed to save weather data: {e}")
-            raise
+        spider = self.spider
+        if spider is not None:
+            spider.saved_paths = list(self.saved_paths)
 
-    def close_spider(self, spider):
-        logger.info("Storage pipeline closed")
+        if self._buffer:
+            # Last chance: fail the crawl loudly rather than drop scraped items
+            raise StorageException(f"{len(self._buffer)} scraped weather items could not be saved")
+        logger.info(f"Storage pipeline closed ({len(self.saved_paths)} files written)")
@@ -9,16 +9,21 @@ from src.models.weather import WeatherData
 from src.models.location import Location
 from src.models.exceptions import ScraperException
 from src.utils.logger import logger
-from ..base import BaseScraper
+from src.utils.metrics import scrape_failures
+from src.utils.single_flight import single_flight
+from ..base import BaseScraper, scrape_key
 from .spiders.bbc_spider import BBCWeatherSpider
 
 
 class ScrapyWeatherScraper(BaseScraper):
+    engine = "scrapy"
+
     def __init__(self, storage_format: str = "json", output_filename: Optional[str] = None):
         self.storage_format = storage_format
         self.output_filename = output_filename
         self.executor = ThreadPoolExecutor(max_workers=1)
         self.collected_items = []
+        self.saved_paths = []
 
     async def initialize(self):
         try:
@@ -29,6 +34,7 @@ class ScrapyWeatherScraper(BaseScraper):
             logger.error(f"Failed to initialize Scrapy scraper: {e}")
             raise ScraperException(f"Scraper initialization failed: {str(e)}") from e
 
+    @single_flight(scrape_key)
     async def scrape(self, location: Location) -> WeatherData:
         try:
             logger.info(f"Starting Scrapy scrape for {location.name}")
@@ -48,6 +54,7 @@ class ScrapyWeatherScraper(BaseScraper):
 
         except Exception as e:
             logger.error(f"Failed to scrape weather for {location.name}: {e}")
+            scrape_failures.inc(engine=self.engine)
             raise ScraperException(
                 f"Scraping failed for {location.name}: {str(e)}"
             ) from e
@@ -71,7 +78,11 @@ class ScrapyWeatherScraper(BaseScraper):
         process.crawl(crawler, location=location)
         process.start()
 
-        return self.collected_items[0] if self.collected_items else None
+        self.saved_paths = getattr(crawler.spider, "saved_paths", [])
+
+        # Hand the item over without keeping it alive on the scraper between runs
+        items, self.collected_items = self.collected_items, []
+        return items[0] if items else None
 
     async def cleanup(self):
         logger.info("Cleaning up Scrapy scraper...")
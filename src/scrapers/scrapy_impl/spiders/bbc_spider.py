@@ -1,5 +1,5 @@
 import scrapy
-from typing import Optional
+from typing import List, Optional
 from scrapy_playwright.page import PageMethod
 
 from src.models.location import Location
@@ -16,26 +16,38 @@ class BBCWeatherSpider(scrapy.Spider):
         "PLAYWRIGHT_PROCESS_REQUEST_HEADERS": None,
     }
 
-    def __init__(self, location: Optional[Location] = None, *args, **kwargs):
+    def __init__(
+        self,
+        location: Optional[Location] = None,
+        locations: Optional[List[Location]] = None,
+        *args,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.location = location
+        self.locations = locations or ([location] if location else [])
         self.parser = BBCWeatherParser()
 
     def start_requests(self):
-        if not self.location:
+        if not self.locations:
             logger.error("No location provided to spider")
             return
 
-        url = settings.get_weather_url(self.location.location_id)
+        for location in self.locations:
+            yield self._request(location)
+
+    def _request(self, location: Location) -> scrapy.Request:
+        url = settings.get_weather_url(location.location_id)
 
         logger.info(
-            f"Starting scrape for {self.location.name} (ID: {self.location.location_id})"
+            f"Starting scrape for {location.name} (ID: {location.location_id})"
         )
 
-        yield scrapy.Request(
+        return scrapy.Request(
             url=url,
             callback=self.parse,
             meta={
+                "location": location,
                 "playwright": True,
                 "playwright_include_page": False,
                 "playwright_page_methods": [
@@ -46,18 +58,20 @@ class BBCWeatherSpider(scrapy.Spider):
         )
 
     def parse(self, response):
+        location = response.meta.get("location", self.location)
+
         try:
             html_content = response.text
-            logger.debug(f"Retrieved HTML content ({len(html_content)} characters)")
+            logger.debug("Retrieved HTML content ({} characters)", len(html_content))
 
-            logger.info(f"Parsing weather data for {self.location.name}...")
-            weather_data = self.parser.parse_html(html_content, self.location.name)
+            logger.info(f"Parsing weather data for {location.name}...")
+            weather_data = self.parser.parse_html(html_content, location.name)
 
-            weather_data.location_id = self.location.location_id
-            weather_data.location_name = self.location.name
+            weather_data.location_id = location.location_id
+            weather_data.location_name = location.name
 
-            logger.info(f"Successfully scraped weather for {self.location.name}")
-            logger.debug(f"Found {len(weather_data.hourly_forecast)} hourly reports")
+            logger.info(f"Successfully scraped weather for {location.name}")
+            logger.debug("Found {} hourly reports", len(weather_data.hourly_forecast))
 
             yield weather_data
 
@@ -0,0 +1,437 @@
+"""
+Long-running HTTP API serving forecasts from cache with read-through scraping
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from datetime import date
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import BaseModel
+
+from src.cache.forecast_cache import ForecastCache, forecast_cache
+from src.cache.lru import LRUCache
+from src.constants.locations import get_location_by_id
+from src.models.location import Location
+from src.models.weather import HourlyReport, WeatherData
+from src.scrapers.base import BaseScraper
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics, span
+from .change_stream import ChangeBroadcaster, heartbeat, parse_locations
+from .refresh_scheduler import RefreshScheduler
+
+HOURLY_FIELDS = set(HourlyReport.model_fields)
+# Always included so filtered rows can still be placed in time
+KEY_FIELDS = ("local_date", "timeslot")
+
+MAX_HEADER_BYTES = 64 * 1024
+
+api_requests = metrics.counter("api_requests_total", "HTTP API requests by route and status")
+response_cache_hits = metrics.counter("api_response_cache_hits_total", "Forecast responses served pre-serialized")
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    502: "Bad Gateway",
+}
+
+
+class ForecastQuery(BaseModel):
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    fields: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_params(cls, params: Dict[str, List[str]]) -> "ForecastQuery":
+        fields = None
+        if params.get("fields"):
+            fields = tuple(
+                sorted({f.strip() for value in params["fields"] for f in value.split(",") if f.strip()})
+            )
+            unknown = set(fields) - HOURLY_FIELDS
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        return cls(
+            date_from=params.get("from", [None])[0],
+            date_to=params.get("to", [None])[0],
+            fields=fields,
+        )
+
+    def key(self) -> tuple:
+        return (self.date_from, self.date_to, self.fields)
+
+    def includes(self, day: date) -> bool:
+        if self.date_from and day < self.date_from:
+            return False
+        if self.date_to and day > self.date_to:
+            return False
+        return True
+
+
+def render_forecast(data: WeatherData, query: ForecastQuery) -> dict:
+    include = set(query.fields) | set(KEY_FIELDS) if query.fields else None
+
+    hourly = [
+        report.model_dump(mode="json", include=include)
+        for report in data.hourly_forecast
+        if query.includes(report.local_date)
+    ]
+    daily = [
+        summary.model_dump(mode="json")
+        for summary in data.daily_summaries
+        if query.includes(summary.local_date)
+    ]
+
+    return {
+        "location_id": data.location_id,
+        "location_name": data.location_name,
+        "last_updated": data.last_updated.isoformat(),
+        "issue_date": data.issue_date.isoformat() if data.issue_date else None,
+        "hourly_forecast": hourly,
+        "daily_summaries": daily,
+    }
+
+
+class HTTPRequest(BaseModel):
+    method: str
+    path: str
+    params: Dict[str, List[str]]
+    headers: Dict[str, str]
+    version: str
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("Request headers too large")
+
+    lines = raw.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise ValueError(f"Malformed request line: {lines[0]!r}")
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+    return HTTPRequest(
+        method=method.upper(),
+        path=url.path,
+        params=parse_qs(url.query),
+        headers=headers,
+        version=version,
+    )
+
+
+def encode_response(
+    status: int,
+    body: bytes = b"",
+    content_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+    keep_alive: bool = True,
+    include_body: bool = True,
+) -> bytes:
+    lines = [
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + body if include_body else head
+
+
+def json_body(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ForecastService:
+    def __init__(
+        self,
+        scraper: BaseScraper,
+        cache: ForecastCache = forecast_cache,
+        response_cache_entries: Optional[int] = None,
+        hot_window: Optional[float] = None,
+        hot_min_hits: Optional[int] = None,
+        refresh_ahead: Optional[float] = None,
+        broadcaster: Optional[ChangeBroadcaster] = None,
+        scheduler: Optional[RefreshScheduler] = None,
+    ):
+        self.scraper = scraper
+        self.cache = cache
+        self.broadcaster = broadcaster or ChangeBroadcaster()
+        self.scheduler = scheduler
+        self.responses = LRUCache(max_entries=response_cache_entries or settings.api_response_cache_entries)
+        self.hot_window = hot_window or settings.api_hot_window
+        self.hot_min_hits = hot_min_hits or settings.api_hot_min_hits
+        self.refresh_ahead = refresh_ahead or settings.api_refresh_ahead
+        self._hits: Dict[str, Deque[float]] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self._scheduling: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await self.scraper.initialize()
+        # Every refresh, whatever triggered it, lands in the cache and is diffed there
+        self.cache.add_listener(self.broadcaster.on_cache_put)
+        self._refresher = asyncio.ensure_future(self._refresh_hot_keys())
+        if self.scheduler:
+            self._scheduling = asyncio.ensure_future(self.scheduler.run())
+
+    async def stop(self):
+        if self.scheduler:
+            self.scheduler.stop()
+
+        for task in (self._refresher, self._scheduling):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        self.cache.remove_listener(self.broadcaster.on_cache_put)
+        await self.scraper.cleanup()
+
+    def _fetcher(self, location: Location) -> Callable[[], Awaitable[WeatherData]]:
+        # The scraper is shared and rate limited, and scrape() is single-flight per location
+        return lambda: self.scraper.scrape(location)
+
+    def _record_hit(self, location_id: str):
+        now = time.monotonic()
+        hits = self._hits.setdefault(location_id, deque())
+        hits.append(now)
+        while hits and hits[0] < now - self.hot_window:
+            hits.popleft()
+
+    def hot_keys(self) -> List[str]:
+        cutoff = time.monotonic() - self.hot_window
+        hot = []
+        for location_id, hits in list(self._hits.items()):
+            while hits and hits[0] < cutoff:
+                hits.popleft()
+            if not hits:
+                del self._hits[location_id]
+            elif len(hits) >= self.hot_min_hits:
+                hot.append(location_id)
+        return hot
+
+    async def get_forecast(self, location_id: str, query: ForecastQuery) -> Tuple[bytes, str]:
+        self._record_hit(location_id)
+        location = get_location_by_id(location_id)
+
+        data = await self.cache.get_or_fetch(location, self._fetcher(location))
+
+        key = (location_id, data.last_updated, data.issue_date, query.key())
+        cached = self.responses.get(key)
+        if cached is not None:
+            response_cache_hits.inc()
+            return cached
+
+        with span("api_serialize"):
+            body = json_body(render_forecast(data, query))
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+        self.responses.set(key, (body, etag))
+        return body, etag
+
+    async def _refresh_hot_keys(self):
+        interval = max(1.0, self.refresh_ahead / 2)
+
+        while True:
+            await asyncio.sleep(interval)
+
+            for location_id in self.hot_keys():
+                entry = self.cache.get_entry(location_id)
+                if entry is not None and entry.seconds_until_expiry() > self.refresh_ahead:
+                    continue
+
+                location = get_location_by_id(location_id)
+                try:
+                    await self.cache.refresh(location, self._fetcher(location))
+                    logger.info(f"Refreshed hot forecast for {location.name}")
+                except Exception as e:
+                    logger.warning(f"Hot refresh failed for {location.name}: {e}")
+
+
+class APIServer:
+    def __init__(self, service: ForecastService, host: Optional[str] = None, port: Optional[int] = None):
+        self.service = service
+        self.host = host or settings.api_host
+        self.port = port if port is not None else settings.api_port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._streams: Set[asyncio.Task] = set()
+
+    @property
+    def sockets(self):
+        return self._server.sockets if self._server else []
+
+    async def start(self):
+        await self.service.start()
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        host, port = self._server.sockets[0].getsockname()[:2]
+        logger.info(f"Forecast API listening on http://{host}:{port}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            # Streams never finish on their own, so end them before waiting for close
+            for task in list(self._streams):
+                task.cancel()
+            await self._server.wait_closed()
+        await self.service.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError as e:
+                    writer.write(encode_response(400, json_body({"error": str(e)}), keep_alive=False))
+                    break
+
+                if request is None:
+                    break
+
+                if request.method == "GET" and request.path.rstrip("/") == "/stream":
+                    await self._stream(request, writer)
+                    break
+
+                response = await self._dispatch(request)
+                writer.write(response)
+                await writer.drain()
+
+                if not request.keep_alive:
+                    break
+
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: HTTPRequest) -> bytes:
+        keep_alive = request.keep_alive
+        include_body = request.method != "HEAD"
+
+        def respond(status: int, body: bytes = b"", route: str = "other", **kwargs) -> bytes:
+            api_requests.inc(route=route, status=status)
+            return encode_response(status, body, keep_alive=keep_alive, include_body=include_body, **kwargs)
+
+        if request.method not in ("GET", "HEAD"):
+            return respond(405, json_body({"error": "Only GET is supported"}), headers={"Allow": "GET, HEAD"})
+
+        parts = [part for part in request.path.split("/") if part]
+
+        if parts == ["health"]:
+            return respond(200, json_body({"status": "ok"}), route="health")
+
+        if parts == ["metrics"]:
+            return respond(
+                200,
+                metrics.render_prometheus().encode("utf-8"),
+                route="metrics",
+                content_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+
+        if len(parts) == 2 and parts[0] == "forecast":
+            return await self._forecast(request, parts[1], respond)
+
+        return respond(404, json_body({"error": f"No route for {request.path}"}))
+
+    async def _forecast(self, request: HTTPRequest, location_id: str, respond) -> bytes:
+        if not location_id.isdigit():
+            return respond(404, json_body({"error": f"Invalid location ID: {location_id}"}), route="forecast")
+
+        try:
+            query = ForecastQuery.from_params(request.params)
+        except ValueError as e:
+            return respond(400, json_body({"error": str(e)}), route="forecast")
+
+        try:
+            body, etag = await self.service.get_forecast(location_id, query)
+        except Exception as e:
+            logger.error(f"Forecast request for {location_id} failed: {e}")
+            return respond(502, json_body({"error": str(e)}), route="forecast")
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return respond(304, route="forecast", headers=headers)
+        return respond(200, body, route="forecast", headers=headers)
+
+    async def _stream(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        wire_format = request.params.get("format", ["sse"])[0]
+        if wire_format not in ("sse", "ndjson"):
+            writer.write(encode_response(400, json_body({"error": "format must be sse or ndjson"}), keep_alive=False))
+            return
+
+        content_type = "text/event-stream" if wire_format == "sse" else "application/x-ndjson"
+        broadcaster = self.service.broadcaster
+        subscriber = broadcaster.subscribe(parse_locations(request.params.get("locations", [])))
+        task = asyncio.current_task()
+        self._streams.add(task)
+        api_requests.inc(route="stream", status=200)
+
+        try:
+            writer.write(
+                (
+                    "HTTP/1.1 200 OK\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    "Cache-Control: no-cache\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await writer.drain()
+
+            while True:
+                event = await subscriber.next_event(settings.stream_heartbeat)
+                if event is None:
+                    writer.write(heartbeat(wire_format))
+                else:
+                    lag = subscriber.take_lag()
+                    if lag:
+                        # Tell the client it missed deltas so it can resync via /forecast
+                        writer.write(broadcaster.lag_event(lag).encode(wire_format))
+                    writer.write(event.encode(wire_format))
+
+                # Only this connection waits on a slow client; publishing never does
+                await writer.drain()
+
+        except (ConnectionResetError, BrokenPipeError, asyncio.CancelledError):
+            pass
+
+        finally:
+            broadcaster.unsubscribe(subscriber)
+            self._streams.discard(task)
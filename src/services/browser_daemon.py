@@ -0,0 +1,226 @@
+"""
+Long-lived Chromium daemon that CLI runs attach to over CDP
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from playwright.async_api import Browser, Playwright, async_playwright
+
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.models.exceptions import BrowserException
+
+
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+]
+
+
+def read_daemon_state(state_file: Optional[Path] = None) -> Optional[dict]:
+    state_file = state_file or settings.browser_daemon_state_file
+    try:
+        return json.loads(state_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+async def check_endpoint(endpoint: str, timeout: float = 1.0) -> bool:
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.get(f"{endpoint}/json/version")
+            return response.status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+async def find_daemon_endpoint() -> Optional[str]:
+    """Return the CDP endpoint of a healthy daemon, or None to launch locally"""
+    endpoint = settings.browser_daemon_url
+    if not endpoint:
+        state = read_daemon_state()
+        if not state:
+            return None
+        endpoint = state.get("endpoint")
+
+    if endpoint and await check_endpoint(endpoint):
+        return endpoint
+
+    logger.debug("Browser daemon at {} is not reachable", endpoint)
+    return None
+
+
+class BrowserDaemon:
+    def __init__(
+        self,
+        port: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        health_interval: float = 10.0,
+        state_file: Optional[Path] = None,
+    ):
+        self.port = port or settings.browser_daemon_port
+        self.idle_timeout = (
+            settings.browser_daemon_idle_timeout if idle_timeout is None else idle_timeout
+        )
+        self.health_interval = health_interval
+        self.state_file = state_file or settings.browser_daemon_state_file
+        self.endpoint = f"http://127.0.0.1:{self.port}"
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._stop = asyncio.Event()
+        self._last_active = time.monotonic()
+
+    async def _launch(self):
+        self._browser = await self._playwright.chromium.launch(
+            headless=settings.headless,
+            args=[
+                *BROWSER_ARGS,
+                f"--remote-debugging-port={self.port}",
+                "--remote-debugging-address=127.0.0.1",
+            ],
+        )
+
+        if not await self._wait_healthy():
+            raise BrowserException(f"Browser daemon did not expose CDP on port {self.port}")
+
+        logger.info(f"Browser daemon listening on {self.endpoint}")
+
+    async def _wait_healthy(self, attempts: int = 20) -> bool:
+        for _ in range(attempts):
+            if await check_endpoint(self.endpoint):
+                return True
+            await asyncio.sleep(0.25)
+        return False
+
+    def _write_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.state_file.write_text(
+            json.dumps(
+                {"pid": os.getpid(), "port": self.port, "endpoint": self.endpoint, "started_at": time.time()}
+            ),
+            encoding="utf-8",
+        )
+
+    def _remove_state(self):
+        state = read_daemon_state(self.state_file)
+        if state and state.get("pid") == os.getpid():
+            self.state_file.unlink(missing_ok=True)
+
+    async def _active_pages(self) -> int:
+        try:
+            async with httpx.AsyncClient(timeout=2.0) as client:
+                response = await client.get(f"{self.endpoint}/json/list")
+                targets = response.json()
+        except (httpx.HTTPError, ValueError):
+            return 0
+
+        return sum(1 for target in targets if target.get("type") == "page")
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self):
+        self._playwright = await async_playwright().start()
+
+        try:
+            await self._launch()
+            self._write_state()
+
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self.stop)
+                except (NotImplementedError, RuntimeError):
+                    pass
+
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.health_interval)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+                await self._health_check()
+
+                if self.idle_timeout and time.monotonic() - self._last_active > self.idle_timeout:
+                    logger.info(f"Browser daemon idle for {self.idle_timeout:.0f}s, shutting down")
+                    break
+
+        finally:
+            self._remove_state()
+            await self._shutdown()
+
+    async def _health_check(self):
+        if not self._browser.is_connected() or not await check_endpoint(self.endpoint):
+            logger.warning("Browser daemon failed health check, relaunching Chromium")
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            await self._launch()
+            self._last_active = time.monotonic()
+            return
+
+        if await self._active_pages() > 0:
+            self._last_active = time.monotonic()
+
+    async def _shutdown(self):
+        try:
+            if self._browser:
+                await self._browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error during browser daemon shutdown: {e}")
+        finally:
+            self._browser = None
+            self._playwright = None
+            logger.info("Browser daemon stopped")
+
+
+def _is_daemon_process(pid: int, endpoint: Optional[str]) -> bool:
+    """Whether pid is still the daemon that wrote the state file, not a process that reused its pid"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Alive but owned by someone else, so it cannot be our daemon
+        return False
+
+    try:
+        argv = Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace").split("\0")
+    except OSError:
+        # No procfs (macOS): trust the pid only while its CDP endpoint still answers
+        return bool(endpoint) and asyncio.run(check_endpoint(endpoint))
+
+    return any(arg == "browser" and nxt == "daemon" for arg, nxt in zip(argv, argv[1:]))
+
+
+def stop_daemon() -> bool:
+    state = read_daemon_state()
+    if not state:
+        return False
+
+    pid = state.get("pid")
+    if not isinstance(pid, int) or not _is_daemon_process(pid, state.get("endpoint")):
+        logger.warning(f"Browser daemon state names pid {pid}, which is not a running daemon; removing stale state")
+        settings.browser_daemon_state_file.unlink(missing_ok=True)
+        return False
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+        return True
+    except OSError:
+        settings.browser_daemon_state_file.unlink(missing_ok=True)
+        return False
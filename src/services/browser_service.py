@@ -5,11 +5,31 @@ from playwright.async_api import (
     BrowserContext,
     Page,
     Playwright,
+    TimeoutError as PlaywrightTimeoutError,
 )
 
 from src.utils.config import settings
 from src.utils.logger import logger
-from src.models.exceptions import BrowserException
+from src.utils.metrics import pages_in_flight, timed
+from src.models.exceptions import BrowserException, TransientBrowserException
+from .browser_daemon import BROWSER_ARGS, find_daemon_endpoint
+
+# Chromium network errors that usually clear up on their own; DNS, TLS and bad URLs do not
+TRANSIENT_NET_ERRORS = (
+    "net::ERR_CONNECTION_",
+    "net::ERR_TIMED_OUT",
+    "net::ERR_NETWORK_CHANGED",
+    "net::ERR_INTERNET_DISCONNECTED",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_ADDRESS_UNREACHABLE",
+)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, (PlaywrightTimeoutError, TimeoutError, ConnectionError)):
+        return True
+    message = str(error)
+    return any(code in message for code in TRANSIENT_NET_ERRORS)
 
 
 class BrowserService:
@@ -18,7 +38,9 @@ class BrowserService:
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._initialized = False
+        self._attached = False
 
+    @timed("browser_initialize")
     async def initialize(self):
         if self._initialized:
             logger.debug("Browser service already initialized")
@@ -29,17 +51,17 @@ class BrowserService:
 
             self._playwright = await async_playwright().start()
 
-            self._browser = await self._playwright.chromium.launch(
-                headless=settings.headless,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                ],
-            )
+            endpoint = await find_daemon_endpoint() if settings.browser_daemon_enabled else None
+            if endpoint:
+                await self._attach(endpoint)
 
-            logger.info(f"Browser launched (headless={settings.headless})")
+            if not self._browser:
+                self._browser = await self._playwright.chromium.launch(
+                    headless=settings.headless,
+                    args=BROWSER_ARGS,
+                )
+
+                logger.info(f"Browser launched (headless={settings.headless})")
 
             self._context = await self._browser.new_context(
                 viewport={
@@ -56,7 +78,9 @@ class BrowserService:
             )
 
             logger.debug(
-                f"Browser context created (locale={settings.locale}, timezone={settings.timezone})"
+                "Browser context created (locale={}, timezone={})",
+                settings.locale,
+                settings.timezone,
             )
 
             self._initialized = True
@@ -67,6 +91,19 @@ class BrowserService:
             await self.cleanup()
             raise BrowserException(f"Browser initialization failed: {str(e)}") from e
 
+    async def _attach(self, endpoint: str):
+        try:
+            self._browser = await self._playwright.chromium.connect_over_cdp(
+                endpoint, timeout=settings.browser_timeout
+            )
+            self._attached = True
+            logger.info(f"Attached to browser daemon at {endpoint}")
+
+        except Exception as e:
+            logger.warning(f"Could not attach to browser daemon, launching locally: {e}")
+            self._browser = None
+            self._attached = False
+
     async def new_page(self) -> Page:
         if not self._initialized or not self._context:
             raise BrowserException(
@@ -75,6 +112,7 @@ class BrowserService:
 
         try:
             page = await self._context.new_page()
+            pages_in_flight.inc()
             logger.debug("New page created")
             return page
 
@@ -82,12 +120,25 @@ class BrowserService:
             logger.error(f"Failed to create new page: {e}")
             raise BrowserException(f"Page creation failed: {str(e)}") from e
 
+    @timed("browser_goto")
     async def goto(
         self,
         page: Page,
         url: str,
         wait_until: str = "domcontentloaded",
         timeout: Optional[int] = None,
+    ) -> None:
+        await self.navigate(page, url, wait_until=wait_until, timeout=timeout)
+        await self.wait_until_ready(page, url)
+
+        logger.info("Navigation completed successfully")
+
+    async def navigate(
+        self,
+        page: Page,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        timeout: Optional[int] = None,
     ) -> None:
         timeout = timeout or settings.browser_timeout
 
@@ -96,37 +147,46 @@ class BrowserService:
             response = await page.goto(url, wait_until=wait_until, timeout=timeout)
 
             if response:
-                logger.debug(f"Response status: {response.status}")
+                logger.debug("Response status: {}", response.status)
 
-            # Additional wait for dynamic content
-            if settings.page_load_wait > 0:
-                logger.debug(
-                    f"Waiting {settings.page_load_wait}ms for dynamic content..."
-                )
-                await page.wait_for_timeout(settings.page_load_wait)
+        except Exception as e:
+            logger.error(f"Navigation failed: {e}")
+            error_type = TransientBrowserException if _is_transient(e) else BrowserException
+            raise error_type(f"Failed to navigate to {url}: {str(e)}") from e
 
-            logger.info("Navigation completed successfully")
+    async def wait_until_ready(self, page: Page, url: str) -> None:
+        # Additional wait for dynamic content
+        if settings.page_load_wait <= 0:
+            return
+
+        try:
+            logger.debug("Waiting {}ms for dynamic content...", settings.page_load_wait)
+            await page.wait_for_timeout(settings.page_load_wait)
 
         except Exception as e:
-            logger.error(f"Navigation failed: {e}")
-            raise BrowserException(f"Failed to navigate to {url}: {str(e)}") from e
+            logger.error(f"Readiness wait failed: {e}")
+            raise BrowserException(f"Page did not become ready at {url}: {str(e)}") from e
 
+    @timed("browser_get_content")
     async def get_content(self, page: Page) -> str:
         try:
             content = await page.content()
-            logger.debug(f"Retrieved HTML content ({len(content)} characters)")
+            logger.debug("Retrieved HTML content ({} characters)", len(content))
             return content
 
         except Exception as e:
             logger.error(f"Failed to get page content: {e}")
-            raise BrowserException(f"Content extraction failed: {str(e)}") from e
+            # Reading content while the page is still navigating fails, but a fresh attempt can succeed
+            transient = _is_transient(e) or "is navigating" in str(e)
+            error_type = TransientBrowserException if transient else BrowserException
+            raise error_type(f"Content extraction failed: {str(e)}") from e
 
     async def take_screenshot(
         self, page: Page, path: str, full_page: bool = False
     ) -> None:
         try:
             await page.screenshot(path=path, full_page=full_page)
-            logger.debug(f"Screenshot saved to: {path}")
+            logger.debug("Screenshot saved to: {}", path)
 
         except Exception as e:
             logger.warning(f"Failed to take screenshot: {e}")
@@ -139,6 +199,10 @@ class BrowserService:
         except Exception as e:
             logger.warning(f"Failed to close page: {e}")
 
+        finally:
+            pages_in_flight.dec()
+
+    @timed("browser_cleanup")
     async def cleanup(self):
         logger.info("Cleaning up browser service...")
 
@@ -147,7 +211,8 @@ class BrowserService:
                 await self._context.close()
                 logger.debug("Browser context closed")
 
-            if self._browser:
+            # An attached daemon browser is shared; stopping Playwright just disconnects
+            if self._browser and not self._attached:
                 await self._browser.close()
                 logger.debug("Browser closed")
 
@@ -163,12 +228,17 @@ class BrowserService:
             self._browser = None
             self._playwright = None
             self._initialized = False
+            self._attached = False
             logger.info("Browser service cleanup complete")
 
     @property
     def is_initialized(self) -> bool:
         return self._initialized
 
+    @property
+    def is_attached(self) -> bool:
+        return self._attached
+
     async def __aenter__(self):
         await self.initialize()
         return self
@@ -0,0 +1,157 @@
+"""
+Fan-out of per-location forecast deltas to streaming subscribers
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.analytics.diff import SnapshotArrays, diff_snapshots, slot_label
+from src.cache.forecast_cache import CacheEntry
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+stream_events = metrics.counter("stream_events_total", "Forecast change events published")
+stream_dropped = metrics.counter("stream_dropped_total", "Events dropped for slow subscribers")
+stream_subscribers = metrics.gauge("stream_subscribers", "Connected change stream subscribers")
+
+
+class ChangeEvent:
+    """One published delta, serialized at most once per wire format"""
+
+    def __init__(self, event_id: int, payload: dict):
+        self.id = event_id
+        self.payload = payload
+        self.location_id = payload.get("location_id")
+        self._encoded: Dict[str, bytes] = {}
+
+    def encode(self, wire_format: str) -> bytes:
+        encoded = self._encoded.get(wire_format)
+        if encoded is None:
+            data = json.dumps(self.payload, separators=(",", ":"), ensure_ascii=False)
+            if wire_format == "sse":
+                encoded = f"id: {self.id}\nevent: {self.payload['event']}\ndata: {data}\n\n".encode("utf-8")
+            else:
+                encoded = (data + "\n").encode("utf-8")
+            self._encoded[wire_format] = encoded
+        return encoded
+
+
+class Subscriber:
+    def __init__(self, locations: Optional[Set[str]], max_queue: int):
+        self.locations = locations
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return self.locations is None or event.location_id in self.locations
+
+    def offer(self, event: ChangeEvent):
+        # Never block the publisher: a full queue loses its oldest event instead
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            stream_dropped.inc()
+        self.queue.put_nowait(event)
+
+    async def next_event(self, timeout: float) -> Optional[ChangeEvent]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def take_lag(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class ChangeBroadcaster:
+    def __init__(self, max_queue: Optional[int] = None):
+        self.max_queue = max_queue or settings.stream_max_queue
+        self._subscribers: Set[Subscriber] = set()
+        # Previous snapshot per location, compared the same way DiffTracker does
+        self._last: Dict[str, SnapshotArrays] = {}
+        self._ids = itertools.count(1)
+
+    def subscribe(self, locations: Optional[Iterable[str]] = None) -> Subscriber:
+        subscriber = Subscriber(set(locations) if locations else None, self.max_queue)
+        self._subscribers.add(subscriber)
+        stream_subscribers.set(len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        stream_subscribers.set(len(self._subscribers))
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def on_cache_put(self, previous: Optional[CacheEntry], entry: CacheEntry):
+        event = self.diff(entry.data)
+        if event is not None:
+            self.publish(event)
+
+    def diff(self, data: WeatherData) -> Optional[ChangeEvent]:
+        location_id = data.location_id
+        current = SnapshotArrays.from_weather(data)
+        previous = self._last.get(location_id)
+        self._last[location_id] = current
+
+        if previous is None:
+            changed = [report.model_dump(mode="json") for report in data.hourly_forecast]
+            removed = []
+        else:
+            delta = diff_snapshots(previous, current)
+            if not delta.has_changes and delta.previous_last_updated == delta.last_updated:
+                return None
+
+            slots = set(delta.added).union(row.slot for row in delta.changed)
+            changed = [
+                report.model_dump(mode="json")
+                for report in data.hourly_forecast
+                if slot_label(report.local_date.isoformat(), report.timeslot) in slots
+            ]
+            removed = [slot.split(" ") for slot in delta.dropped]
+
+        return ChangeEvent(
+            next(self._ids),
+            {
+                "event": "snapshot" if previous is None else "delta",
+                "location_id": location_id,
+                "location_name": data.location_name,
+                "last_updated": current.last_updated,
+                "previous_last_updated": previous.last_updated if previous else None,
+                "changed": changed,
+                "removed": removed,
+            },
+        )
+
+    def publish(self, event: ChangeEvent):
+        stream_events.inc()
+        delivered = 0
+        for subscriber in list(self._subscribers):
+            if subscriber.wants(event):
+                subscriber.offer(event)
+                delivered += 1
+
+        logger.debug(
+            "Published {} for {} to {} subscribers",
+            event.payload["event"],
+            event.location_id,
+            delivered,
+        )
+
+    def lag_event(self, dropped: int) -> ChangeEvent:
+        return ChangeEvent(next(self._ids), {"event": "lagged", "dropped": dropped})
+
+
+def heartbeat(wire_format: str) -> bytes:
+    return b": keep-alive\n\n" if wire_format == "sse" else b"\n"
+
+
+def parse_locations(values: List[str]) -> Optional[List[str]]:
+    locations = [part.strip() for value in values for part in value.split(",") if part.strip()]
+    return locations or None
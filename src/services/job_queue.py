@@ -0,0 +1,278 @@
+"""
+Durable SQLite-backed job queue with leases, retries and dead-lettering
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from pydantic import BaseModel
+
+from src.models.exceptions import QueueException
+from src.models.location import Location
+from src.utils.config import settings
+from src.utils.logger import logger
+
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    location_name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    result_path TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (batch, location_id)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, available_at, id);
+"""
+
+
+class Job(BaseModel):
+    id: int
+    batch: str
+    location_id: str
+    location_name: str
+    status: str
+    attempts: int
+    max_attempts: int
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+    last_error: Optional[str] = None
+    result_path: Optional[str] = None
+
+    @property
+    def location(self) -> Location:
+        return Location(location_id=self.location_id, name=self.location_name)
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.db_path = db_path or settings.queue_db_path
+        self.lease_seconds = lease_seconds or settings.queue_lease_seconds
+        self.max_attempts = max_attempts or settings.queue_max_attempts
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front so two workers never claim one job
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, locations: Iterable[Location], batch: str = "default") -> int:
+        now = time.time()
+        rows = [
+            (batch, loc.location_id, loc.name, self.max_attempts, now, now, now)
+            for loc in locations
+        ]
+
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO jobs
+                    (batch, location_id, location_name, max_attempts, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            added = conn.total_changes - before
+
+        logger.info(f"Enqueued {added} new jobs in batch '{batch}' ({len(rows) - added} already queued)")
+        return added
+
+    def lease(self, worker_id: str, batch: Optional[str] = None) -> Optional[Job]:
+        now = time.time()
+
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+
+            query = "SELECT * FROM jobs WHERE status = ? AND available_at <= ?"
+            params = [PENDING, now]
+            if batch:
+                query += " AND batch = ?"
+                params.append(batch)
+            query += " ORDER BY id LIMIT 1"
+
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (LEASED, worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            job = self._get(conn, row["id"])
+
+        logger.debug("{} leased job {} ({}, attempt {})", worker_id, job.id, job.location_name, job.attempts)
+        return job
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float):
+        # A worker that crashed mid-job never acks; its lease runs out and the job is retried
+        conn.execute(
+            f"""
+            UPDATE jobs
+            SET status = CASE WHEN attempts >= max_attempts THEN '{DEAD}' ELSE '{PENDING}' END,
+                last_error = COALESCE(last_error, 'lease expired'),
+                lease_owner = NULL, lease_expires = NULL, updated_at = ?
+            WHERE status = ? AND lease_expires < ?
+            """,
+            (now, LEASED, now),
+        )
+
+    def extend_lease(self, job: Job, worker_id: str):
+        now = time.time()
+        with self._transaction() as conn:
+            self._check_owner(conn, job.id, worker_id)
+            conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ?",
+                (now + self.lease_seconds, now, job.id),
+            )
+
+    def ack(self, job: Job, worker_id: str, result_path: Optional[str] = None):
+        with self._transaction() as conn:
+            self._check_owner(conn, job.id, worker_id)
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, result_path = ?, last_error = NULL,
+                    lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (DONE, result_path, time.time(), job.id),
+            )
+
+    def nack(self, job: Job, worker_id: str, error: str) -> str:
+        now = time.time()
+
+        with self._transaction() as conn:
+            self._check_owner(conn, job.id, worker_id)
+            current = self._get(conn, job.id)
+
+            if current.attempts >= current.max_attempts:
+                status, available_at = DEAD, now
+            else:
+                status = PENDING
+                available_at = now + settings.retry_initial_wait * (
+                    settings.retry_backoff ** current.attempts
+                )
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, available_at = ?, last_error = ?,
+                    lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (status, available_at, error, now, job.id),
+            )
+
+        if status == DEAD:
+            logger.error(f"Job {job.id} ({job.location_name}) dead-lettered after {current.attempts} attempts: {error}")
+        else:
+            logger.warning(f"Job {job.id} ({job.location_name}) failed, will retry: {error}")
+
+        return status
+
+    def release(self, job: Job, worker_id: str):
+        """Return a leased job untouched, e.g. on shutdown, without spending an attempt"""
+        with self._transaction() as conn:
+            self._check_owner(conn, job.id, worker_id)
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, attempts = MAX(attempts - 1, 0),
+                    lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ?
+                """,
+                (PENDING, time.time(), job.id),
+            )
+
+    def retry_dead(self, batch: Optional[str] = None) -> int:
+        query = "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = ? WHERE status = ?"
+        now = time.time()
+        params = [PENDING, now, now, DEAD]
+        if batch:
+            query += " AND batch = ?"
+            params.append(batch)
+
+        with self._transaction() as conn:
+            return conn.execute(query, params).rowcount
+
+    def stats(self, batch: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT status, COUNT(*) AS n FROM jobs"
+        params = []
+        if batch:
+            query += " WHERE batch = ?"
+            params.append(batch)
+        query += " GROUP BY status"
+
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        for row in self._conn.execute(query, params):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def dead_jobs(self, batch: Optional[str] = None):
+        query = "SELECT * FROM jobs WHERE status = ?"
+        params = [DEAD]
+        if batch:
+            query += " AND batch = ?"
+            params.append(batch)
+        return [Job(**dict(row)) for row in self._conn.execute(query, params)]
+
+    def has_unfinished(self, batch: Optional[str] = None) -> bool:
+        counts = self.stats(batch)
+        return counts[PENDING] + counts[LEASED] > 0
+
+    def _check_owner(self, conn: sqlite3.Connection, job_id: int, worker_id: str):
+        row = conn.execute(
+            "SELECT status, lease_owner FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+        if row is None or row["status"] != LEASED or row["lease_owner"] != worker_id:
+            raise QueueException(f"Job {job_id} is not leased by {worker_id}")
+
+    def _get(self, conn: sqlite3.Connection, job_id: int) -> Job:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(**dict(row))
+
+    def close(self):
+        self._conn.close()
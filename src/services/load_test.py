@@ -0,0 +1,280 @@
+"""
+Offline load test: throughput and tail latency per engine as concurrency grows
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_module
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.location import Location
+from src.utils.config import settings
+from src.utils.logger import logger
+
+ENGINES = ["http", "bs4", "scrapy"]
+
+# Location IDs handed out by the load test; the stand-in serves any numeric ID
+LOCATION_ID_BASE = 9000000
+
+
+class LoadCell(BaseModel):
+    engine: str
+    concurrency: int
+    requests: int
+    succeeded: int = 0
+    failed: int = 0
+    duration_s: float = 0.0
+    throughput_per_s: float = 0.0
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    errors: Dict[str, int] = Field(default_factory=dict)
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), int(round(pct / 100 * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def summarize_cell(
+    engine: str,
+    concurrency: int,
+    requests: int,
+    latencies: List[float],
+    errors: Dict[str, int],
+    duration: float,
+) -> LoadCell:
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+
+    return LoadCell(
+        engine=engine,
+        concurrency=concurrency,
+        requests=requests,
+        succeeded=len(latencies),
+        failed=sum(errors.values()),
+        duration_s=round(duration, 3),
+        throughput_per_s=round(len(latencies) / duration, 3) if duration else 0.0,
+        p50_ms=ms(percentile(latencies, 50)),
+        p95_ms=ms(percentile(latencies, 95)),
+        p99_ms=ms(percentile(latencies, 99)),
+        max_ms=ms(max(latencies) if latencies else None),
+        errors=errors,
+    )
+
+
+def load_locations(count: int) -> List[Location]:
+    # Distinct IDs so single-flight and the forecast cache never merge requests
+    return [
+        Location(location_id=str(LOCATION_ID_BASE + i), name=f"Load {i}")
+        for i in range(count)
+    ]
+
+
+async def _run_concurrently(locations: List[Location], concurrency: int, scrape) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def one(location: Location):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await scrape(location)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(location) for location in locations))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def _http_cell(locations: List[Location], concurrency: int) -> tuple:
+    import httpx
+
+    from src.parsers.bbc_parser import BBCWeatherParser
+
+    parser = BBCWeatherParser()
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=settings.browser_timeout / 1000) as client:
+
+        async def scrape(location: Location):
+            response = await client.get(settings.get_weather_url(location.location_id))
+            response.raise_for_status()
+            await asyncio.to_thread(parser.parse_html, response.text, location.name)
+
+        return await _run_concurrently(locations, concurrency, scrape)
+
+
+async def _bs4_cell(locations: List[Location], concurrency: int) -> tuple:
+    from src.scrapers.bs4.scraper import BBCWeatherScraper
+
+    async with BBCWeatherScraper() as scraper:
+        return await _run_concurrently(locations, concurrency, scraper.scrape)
+
+
+def _scrapy_cell(locations: List[Location], concurrency: int, requests_per_minute: Optional[int]) -> tuple:
+    import scrapy.signals
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    from src.scrapers.scrapy_impl.spiders.bbc_spider import BBCWeatherSpider
+
+    crawl_settings = get_project_settings()
+    crawl_settings.setmodule("src.scrapers.scrapy_impl.settings")
+    crawl_settings.set("CONCURRENT_REQUESTS", concurrency)
+    crawl_settings.set("CONCURRENT_REQUESTS_PER_DOMAIN", concurrency)
+    crawl_settings.set("PLAYWRIGHT_MAX_PAGES_PER_CONTEXT", concurrency)
+    crawl_settings.set("DOWNLOAD_DELAY", 60 / requests_per_minute if requests_per_minute else 0)
+    crawl_settings.set("ITEM_PIPELINES", {})
+
+    started: Dict[str, float] = {}
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    def request_started(request, spider):
+        started[request.meta["location"].location_id] = time.perf_counter()
+
+    def item_scraped(item, response, spider):
+        latencies.append(time.perf_counter() - started[item.location_id])
+
+    def spider_error(failure, response, spider):
+        name = type(failure.value).__name__
+        errors[name] = errors.get(name, 0) + 1
+
+    process = CrawlerProcess(crawl_settings)
+    crawler = process.create_crawler(BBCWeatherSpider)
+    crawler.signals.connect(request_started, signal=scrapy.signals.request_reached_downloader)
+    crawler.signals.connect(item_scraped, signal=scrapy.signals.item_scraped)
+    crawler.signals.connect(spider_error, signal=scrapy.signals.spider_error)
+
+    start = time.perf_counter()
+    process.crawl(crawler, locations=locations)
+    process.start()
+    duration = time.perf_counter() - start
+
+    # Requests that never produced an item failed in the downloader
+    missing = len(locations) - len(latencies) - sum(errors.values())
+    if missing > 0:
+        errors["DownloadFailed"] = errors.get("DownloadFailed", 0) + missing
+
+    return latencies, errors, duration
+
+
+def _cell_main(engine: str, concurrency: int, requests: int, overrides: dict, results):
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+
+    locations = load_locations(requests)
+
+    try:
+        if engine == "scrapy":
+            latencies, errors, duration = _scrapy_cell(
+                locations, concurrency, overrides.get("requests_per_minute")
+            )
+        else:
+            from src.utils.rate_limiter import rate_limiter
+
+            rate_limiter.requests_per_minute = settings.requests_per_minute
+            cell = _http_cell if engine == "http" else _bs4_cell
+            latencies, errors, duration = asyncio.run(cell(locations, concurrency))
+
+        results.put(summarize_cell(engine, concurrency, requests, latencies, errors, duration).model_dump())
+
+    except Exception as e:
+        logger.error(f"Load test cell {engine} x{concurrency} failed: {e}")
+        results.put(
+            LoadCell(
+                engine=engine,
+                concurrency=concurrency,
+                requests=requests,
+                failed=requests,
+                errors={type(e).__name__: requests},
+            ).model_dump()
+        )
+
+
+class LoadTest:
+    def __init__(
+        self,
+        base_url: str,
+        engines: List[str],
+        concurrency_levels: List[int],
+        requests_per_level: int,
+        requests_per_minute: Optional[int] = None,
+        page_load_wait: int = 0,
+        cell_timeout: float = 600.0,
+    ):
+        self.base_url = base_url
+        self.engines = engines
+        self.concurrency_levels = concurrency_levels
+        self.requests_per_level = requests_per_level
+        self.requests_per_minute = requests_per_minute
+        self.page_load_wait = page_load_wait
+        self.cell_timeout = cell_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def _overrides(self) -> dict:
+        return {
+            "bbc_weather_base_url": self.base_url,
+            "page_load_wait": self.page_load_wait,
+            # Without an explicit budget the limiter is effectively off so the engine is measured
+            "requests_per_minute": self.requests_per_minute or 1_000_000,
+            "browser_daemon_enabled": False,
+            "cache_enabled": False,
+            "log_level": settings.log_level,
+            "log_file": settings.log_file,
+        }
+
+    def run_cell(self, engine: str, concurrency: int) -> LoadCell:
+        # Each cell runs in a fresh process: the Scrapy reactor cannot restart and
+        # browser state from one level must not warm up the next
+        results = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_cell_main,
+            args=(engine, concurrency, self.requests_per_level, self._overrides(), results),
+            daemon=True,
+        )
+        process.start()
+
+        try:
+            cell = LoadCell(**results.get(timeout=self.cell_timeout))
+        except queue_module.Empty:
+            logger.error(f"Load test cell {engine} x{concurrency} timed out")
+            process.terminate()
+            cell = LoadCell(
+                engine=engine,
+                concurrency=concurrency,
+                requests=self.requests_per_level,
+                failed=self.requests_per_level,
+                errors={"Timeout": self.requests_per_level},
+            )
+        finally:
+            process.join(timeout=10)
+
+        return cell
+
+    def run(self) -> List[LoadCell]:
+        cells = []
+        for engine in self.engines:
+            for concurrency in self.concurrency_levels:
+                logger.info(
+                    f"Load test: {engine} x{concurrency} ({self.requests_per_level} requests)"
+                )
+                cell = self.run_cell(engine, concurrency)
+                logger.info(
+                    f"Load test: {engine} x{concurrency} -> {cell.throughput_per_s}/s, "
+                    f"p99 {cell.p99_ms} ms, {cell.failed} failed"
+                )
+                cells.append(cell)
+        return cells
@@ -0,0 +1,253 @@
+"""
+Streaming scrape pipeline: fetch, parse and storage stages joined by bounded queues
+"""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from src.models.location import Location
+from src.models.weather import WeatherData
+from src.scrapers.base import BaseScraper
+from src.storage.base import BaseStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+pipeline_queue_depth = metrics.gauge("pipeline_queue_depth", "Items waiting between pipeline stages")
+
+_DONE = object()
+
+
+class ScrapeResult(BaseModel):
+    location: Location
+    data: Optional[WeatherData] = None
+    saved_path: Optional[Path] = None
+    error: Optional[str] = None
+    stage: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _Item:
+    __slots__ = ("location", "started", "html", "data")
+
+    def __init__(self, location: Location, started: float):
+        self.location = location
+        self.started = started
+        self.html: Optional[str] = None
+        self.data: Optional[WeatherData] = None
+
+
+class _Pipeline:
+    def __init__(
+        self,
+        locations: List[Location],
+        scraper: BaseScraper,
+        storage: Optional[BaseStorage],
+        fetch_concurrency: int,
+        parse_workers: int,
+        queue_size: int,
+        deadline: Optional[float],
+    ):
+        self.locations = iter(locations)
+        self.scraper = scraper
+        self.storage = storage
+        self.fetch_concurrency = fetch_concurrency
+        self.parse_workers = parse_workers
+        self.deadline = deadline
+
+        self.parse_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.store_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.results: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.tasks: List[asyncio.Task] = []
+        self._loop = asyncio.get_running_loop()
+
+        # Engines without a separate fetch step (Scrapy) do fetch and parse in one call
+        self._split = hasattr(scraper, "fetch_html") and hasattr(scraper, "parser")
+
+    def _track_depth(self):
+        pipeline_queue_depth.set(self.parse_queue.qsize(), stage="parse")
+        pipeline_queue_depth.set(self.store_queue.qsize(), stage="store")
+        pipeline_queue_depth.set(self.results.qsize(), stage="results")
+
+    def _remaining(self, item: _Item) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - (self._loop.time() - item.started)
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return remaining
+
+    async def _fail(self, item: _Item, stage: str, e: BaseException):
+        message = "deadline exceeded" if isinstance(e, asyncio.TimeoutError) else str(e)
+        logger.warning(f"Pipeline {stage} failed for {item.location.name}: {message}")
+        await self.results.put(
+            ScrapeResult(
+                location=item.location,
+                error=message,
+                stage=stage,
+                elapsed=self._loop.time() - item.started,
+            )
+        )
+
+    async def _done(self, item: _Item, saved_path: Optional[Path] = None):
+        await self.results.put(
+            ScrapeResult(
+                location=item.location,
+                data=item.data,
+                saved_path=saved_path,
+                elapsed=self._loop.time() - item.started,
+            )
+        )
+
+    async def _fetcher(self):
+        for location in self.locations:
+            item = _Item(location, self._loop.time())
+            try:
+                timeout = self._remaining(item)
+                if self._split:
+                    item.html = await asyncio.wait_for(self.scraper.fetch_html(location), timeout)
+                else:
+                    item.data = await asyncio.wait_for(self.scraper.scrape(location), timeout)
+            except Exception as e:
+                await self._fail(item, "fetch", e)
+                continue
+
+            # Blocks while parsing is behind, which is what throttles fetching
+            await self.parse_queue.put(item)
+            self._track_depth()
+
+    async def _parser(self):
+        while True:
+            item = await self.parse_queue.get()
+            if item is _DONE:
+                break
+
+            try:
+                if item.data is None:
+                    timeout = self._remaining(item)
+                    item.data = await asyncio.wait_for(asyncio.to_thread(self._parse, item), timeout)
+                    item.html = None
+            except Exception as e:
+                await self._fail(item, "parse", e)
+                continue
+
+            if self.storage is None:
+                await self._done(item)
+            else:
+                await self.store_queue.put(item)
+            self._track_depth()
+
+    def _parse(self, item: _Item) -> WeatherData:
+        data = self.scraper.parser.parse_html(item.html, item.location.name)
+        data.location_id = item.location.location_id
+        data.location_name = item.location.name
+        return data
+
+    async def _storer(self):
+        while True:
+            item = await self.store_queue.get()
+            if item is _DONE:
+                break
+
+            try:
+                timeout = self._remaining(item)
+                saved_path = await asyncio.wait_for(self.storage.save(item.data), timeout)
+            except Exception as e:
+                await self._fail(item, "store", e)
+                continue
+
+            await self._done(item, saved_path)
+            self._track_depth()
+
+    async def _run(self):
+        fetchers = [asyncio.ensure_future(self._fetcher()) for _ in range(self.fetch_concurrency)]
+        parsers = [asyncio.ensure_future(self._parser()) for _ in range(self.parse_workers)]
+        storer = asyncio.ensure_future(self._storer()) if self.storage else None
+        self.tasks.extend(fetchers + parsers + ([storer] if storer else []))
+
+        await asyncio.gather(*fetchers)
+        for _ in parsers:
+            await self.parse_queue.put(_DONE)
+        await asyncio.gather(*parsers)
+
+        if storer:
+            await self.store_queue.put(_DONE)
+            await storer
+
+        await self.results.put(_DONE)
+
+    async def __aiter__(self) -> AsyncIterator[ScrapeResult]:
+        runner = asyncio.ensure_future(self._run())
+        self.tasks.append(runner)
+
+        try:
+            while True:
+                result = await self.results.get()
+                if result is _DONE:
+                    break
+                self._track_depth()
+                yield result
+
+            # Surface unexpected stage crashes instead of ending quietly
+            await runner
+
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+async def scrape_many(
+    locations: Iterable[Location],
+    scraper: Optional[BaseScraper] = None,
+    storage: Optional[BaseStorage] = None,
+    fetch_concurrency: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> AsyncIterator[ScrapeResult]:
+    """Yield a ScrapeResult per location as each one completes.
+
+    Fetch, parse and (when storage is given) save run as separate stages with
+    bounded queues between them, so a slow sink or consumer throttles fetching
+    instead of buffering pages. deadline bounds each location end to end.
+    Closing the generator or cancelling the consumer cancels in-flight work.
+    """
+    # Duplicates would only repeat a scrape; keep the first occurrence
+    seen = set()
+    unique = []
+    for location in locations:
+        if location.location_id not in seen:
+            seen.add(location.location_id)
+            unique.append(location)
+
+    owns_scraper = scraper is None
+    if owns_scraper:
+        from src.scrapers.bs4.scraper import BBCWeatherScraper
+
+        scraper = BBCWeatherScraper()
+        await scraper.initialize()
+
+    pipeline = _Pipeline(
+        unique,
+        scraper,
+        storage,
+        fetch_concurrency=fetch_concurrency or settings.pipeline_fetch_concurrency,
+        parse_workers=parse_workers or settings.pipeline_parse_workers,
+        queue_size=queue_size or settings.pipeline_queue_size,
+        deadline=deadline if deadline is not None else settings.pipeline_item_deadline,
+    )
+
+    try:
+        async for result in pipeline:
+            yield result
+    finally:
+        if owns_scraper:
+            await scraper.cleanup()
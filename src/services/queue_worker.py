@@ -0,0 +1,101 @@
+"""
+Worker that pulls location jobs from the durable queue
+"""
+
+import asyncio
+import os
+import socket
+from typing import Optional
+
+from src.models.exceptions import QueueException
+from src.scrapers.base import BaseScraper
+from src.storage.base import BaseStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.memory_profiler import memory_profiler
+from .job_queue import Job, JobQueue
+
+
+class QueueWorker:
+    def __init__(
+        self,
+        queue: JobQueue,
+        scraper: BaseScraper,
+        storage: BaseStorage,
+        batch: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.scraper = scraper
+        self.storage = storage
+        self.batch = batch
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval or settings.queue_poll_interval
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self, wait: bool = False):
+        logger.info(f"Queue worker {self.worker_id} started")
+
+        while True:
+            job = self.queue.lease(self.worker_id, self.batch)
+
+            if job is None:
+                if not wait and not self.queue.has_unfinished(self.batch):
+                    break
+                # Jobs are backing off or leased elsewhere; check again shortly
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            await self._process(job)
+
+        logger.info(
+            f"Queue worker {self.worker_id} finished: {self.processed} done, {self.failed} failed"
+        )
+
+    async def _process(self, job: Job):
+        heartbeat = asyncio.ensure_future(self._keep_leased(job))
+        try:
+            with memory_profiler.location(job.location_id):
+                weather_data = await self.scraper.scrape(job.location)
+                saved_path = await self.storage.save(weather_data)
+
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            # Hand the job back so a restart picks it up without losing an attempt
+            if self._settle(job, self.queue.release, job, self.worker_id):
+                logger.warning(f"Released job {job.id} ({job.location_name}) on shutdown")
+            raise
+
+        except Exception as e:
+            self.failed += 1
+            self._settle(job, self.queue.nack, job, self.worker_id, str(e))
+            return
+
+        finally:
+            heartbeat.cancel()
+
+        if not self._settle(job, self.queue.ack, job, self.worker_id, str(saved_path)):
+            return
+        self.processed += 1
+        logger.info(f"Job {job.id} ({job.location_name}) done: {saved_path}")
+
+    async def _keep_leased(self, job: Job):
+        """Renew the lease while the job runs so a slow scrape is not handed to another worker"""
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.queue.extend_lease(job, self.worker_id)
+            except QueueException as e:
+                logger.warning(f"Could not renew lease on job {job.id} ({job.location_name}): {e}")
+                return
+
+    def _settle(self, job: Job, action, *args) -> bool:
+        try:
+            action(*args)
+        except QueueException as e:
+            # The lease expired and the job went back to the queue; another worker owns it now
+            logger.warning(f"Lost lease on job {job.id} ({job.location_name}), dropping its result: {e}")
+            return False
+        return True
@@ -0,0 +1,199 @@
+"""
+Refresh scheduler that polls each location when its forecast is likely to change
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.cache.forecast_cache import ForecastCache, forecast_cache
+from src.models.location import Location
+from src.models.weather import WeatherData
+from src.scrapers.base import BaseScraper
+from src.storage.base import BaseStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.memory_profiler import memory_profiler
+
+
+class LocationSchedule(BaseModel):
+    location_id: str
+    name: str
+    next_due: datetime
+    last_updated: Optional[datetime] = None
+    last_checked: Optional[datetime] = None
+    cadence_seconds: float
+    unchanged_streak: int = 0
+    failures: int = 0
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        scraper: BaseScraper,
+        storage: BaseStorage,
+        state_file: Optional[Path] = None,
+        cache: Optional[ForecastCache] = None,
+        jitter: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ):
+        self.scraper = scraper
+        self.storage = storage
+        self.state_file = state_file or settings.schedule_state_file
+        self.cache = cache or forecast_cache
+        self.jitter = settings.schedule_jitter if jitter is None else jitter
+        self.max_interval = max_interval or settings.schedule_max_interval
+        self.schedules: Dict[str, LocationSchedule] = {}
+        self._queue: List[Tuple[float, str]] = []
+        self._stop = asyncio.Event()
+
+    def load_state(self):
+        if not self.state_file.exists():
+            return
+
+        try:
+            raw = json.loads(self.state_file.read_text(encoding="utf-8"))
+            for item in raw.get("locations", []):
+                schedule = LocationSchedule(**item)
+                self.schedules[schedule.location_id] = schedule
+
+            logger.info(
+                f"Loaded schedule state for {len(self.schedules)} locations from {self.state_file}"
+            )
+
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schedule state {self.state_file}: {e}")
+
+    def save_state(self):
+        payload = {
+            "saved_at": _utcnow().isoformat(),
+            "locations": [s.model_dump(mode="json") for s in self.schedules.values()],
+        }
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_file)
+
+    def add_location(self, location: Location):
+        if location.location_id in self.schedules:
+            self.schedules[location.location_id].name = location.name
+            return
+
+        # Spread first polls so a fresh start does not burst every location at once
+        first_due = _utcnow() + timedelta(seconds=random.uniform(0, self.jitter))
+        self.schedules[location.location_id] = LocationSchedule(
+            location_id=location.location_id,
+            name=location.name,
+            next_due=first_due,
+            cadence_seconds=settings.forecast_update_interval,
+        )
+
+    def _push(self, schedule: LocationSchedule):
+        heapq.heappush(self._queue, (schedule.next_due.timestamp(), schedule.location_id))
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self):
+        if not self.schedules:
+            logger.warning("Refresh scheduler has no locations to poll")
+            return
+
+        self._queue = []
+        for schedule in self.schedules.values():
+            self._push(schedule)
+
+        logger.info(f"Refresh scheduler started for {len(self.schedules)} locations")
+
+        while not self._stop.is_set():
+            due_ts, location_id = self._queue[0]
+            delay = due_ts - _utcnow().timestamp()
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+            heapq.heappop(self._queue)
+            schedule = self.schedules[location_id]
+
+            await self._refresh(schedule)
+
+            self._push(schedule)
+            self.save_state()
+
+        logger.info("Refresh scheduler stopped")
+
+    async def _refresh(self, schedule: LocationSchedule):
+        location = Location(location_id=schedule.location_id, name=schedule.name)
+        now = _utcnow()
+
+        try:
+            with memory_profiler.location(location.location_id):
+                weather_data = await self.scraper.scrape(location)
+
+        except Exception as e:
+            schedule.failures += 1
+            backoff = min(
+                self.max_interval, settings.cache_min_ttl * (2 ** schedule.failures)
+            )
+            schedule.next_due = now + timedelta(seconds=self._jittered(backoff))
+            logger.warning(
+                f"Refresh failed for {schedule.name} ({schedule.failures} in a row), "
+                f"retrying in {backoff:.0f}s: {e}"
+            )
+            return
+
+        schedule.failures = 0
+        schedule.last_checked = now
+
+        changed = schedule.last_updated is None or weather_data.last_updated != schedule.last_updated
+        entry = self.cache.put(weather_data)
+        schedule.cadence_seconds = entry.cadence_seconds
+
+        if changed:
+            schedule.unchanged_streak = 0
+            schedule.last_updated = weather_data.last_updated
+            await self._store(weather_data)
+
+            # fresh_until is when the next BBC update is expected
+            interval = (entry.fresh_until - now).total_seconds()
+        else:
+            schedule.unchanged_streak += 1
+            interval = min(
+                self.max_interval,
+                settings.cache_min_ttl * (2 ** (schedule.unchanged_streak - 1)),
+            )
+            logger.info(
+                f"No forecast change for {schedule.name} since "
+                f"{schedule.last_updated.isoformat()}"
+            )
+
+        schedule.next_due = now + timedelta(seconds=self._jittered(interval))
+        logger.info(
+            f"Next refresh for {schedule.name} at {schedule.next_due.isoformat()}"
+        )
+
+    async def _store(self, weather_data: WeatherData):
+        try:
+            saved_path = await self.storage.save(weather_data)
+            logger.info(f"Stored updated forecast to: {saved_path}")
+        except Exception as e:
+            logger.error(f"Failed to store forecast for {weather_data.location_id}: {e}")
+
+    def _jittered(self, interval: float) -> float:
+        return max(0.0, interval + random.uniform(0, self.jitter))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,178 @@
+"""
+Supervisor that shards locations across worker processes, one browser each
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_module
+import zlib
+from typing import Dict, List, Set
+
+from pydantic import BaseModel, Field
+
+from src.models.location import Location
+from src.models.weather import WeatherData
+from src.storage.base import BaseStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+
+
+class ShardSummary(BaseModel):
+    saved: Dict[str, str] = Field(default_factory=dict)
+    failed: Dict[str, str] = Field(default_factory=dict)
+    restarts: int = 0
+
+
+def shard_for(location_id: str, num_shards: int) -> int:
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(location_id.encode("utf-8")) % num_shards
+
+
+def _worker_main(shard: int, locations: List[dict], results, overrides: dict):
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+
+    asyncio.run(_worker(shard, [Location(**loc) for loc in locations], results))
+
+
+async def _worker(shard: int, locations: List[Location], results):
+    from src.scrapers.bs4.scraper import BBCWeatherScraper
+
+    logger.info(f"Shard {shard} worker started with {len(locations)} locations")
+
+    async with BBCWeatherScraper() as scraper:
+        for location in locations:
+            try:
+                weather_data = await scraper.scrape(location)
+                results.put(("result", shard, location.location_id, weather_data.model_dump(mode="json")))
+
+            except Exception as e:
+                results.put(("error", shard, location.location_id, str(e)))
+
+    results.put(("done", shard, None, None))
+
+
+class Supervisor:
+    def __init__(
+        self,
+        locations: List[Location],
+        storage: BaseStorage,
+        workers: int,
+        max_restarts: int = 3,
+    ):
+        self.storage = storage
+        self.workers = max(1, min(workers, len(locations)))
+        self.max_restarts = max_restarts
+
+        self.shards: Dict[int, List[Location]] = {i: [] for i in range(self.workers)}
+        for location in locations:
+            self.shards[shard_for(location.location_id, self.workers)].append(location)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._pending: Dict[int, Set[str]] = {}
+        self._restarts: Dict[int, int] = {}
+        self.summary = ShardSummary()
+
+    def _overrides(self) -> dict:
+        # Each process has its own rate limiter, so split the global budget between them
+        return {
+            "headless": settings.headless,
+            "log_level": settings.log_level,
+            "requests_per_minute": max(1, settings.requests_per_minute // self.workers),
+        }
+
+    def _start(self, shard: int):
+        remaining = [loc for loc in self.shards[shard] if loc.location_id in self._pending[shard]]
+
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(shard, [loc.model_dump() for loc in remaining], self._results, self._overrides()),
+            name=f"weather-shard-{shard}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[shard] = process
+
+    async def run(self) -> ShardSummary:
+        for shard, locations in self.shards.items():
+            if not locations:
+                continue
+            self._pending[shard] = {loc.location_id for loc in locations}
+            self._restarts[shard] = 0
+            self._start(shard)
+
+        logger.info(
+            f"Supervisor started {len(self._processes)} workers for "
+            f"{sum(len(p) for p in self._pending.values())} locations"
+        )
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            while any(self._pending.values()):
+                try:
+                    message = await loop.run_in_executor(None, self._results.get, True, 0.5)
+                except queue_module.Empty:
+                    self._check_workers()
+                    continue
+
+                await self._handle(message)
+
+        finally:
+            for process in self._processes.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join(timeout=5)
+
+        logger.info(
+            f"Supervisor finished: {len(self.summary.saved)} saved, "
+            f"{len(self.summary.failed)} failed, {self.summary.restarts} restarts"
+        )
+        return self.summary
+
+    async def _handle(self, message: tuple):
+        kind, shard, location_id, payload = message
+
+        if kind == "done":
+            # Anything still pending was never reported; the worker lost it
+            for lost in self._pending.get(shard, set()):
+                self.summary.failed[lost] = "worker finished without a result"
+            self._pending[shard] = set()
+            return
+
+        self._pending[shard].discard(location_id)
+
+        if kind == "error":
+            self.summary.failed[location_id] = payload
+            logger.error(f"Shard {shard} failed for {location_id}: {payload}")
+            return
+
+        # A single writer in the supervisor keeps storage free of cross-process races
+        try:
+            saved_path = await self.storage.save(WeatherData(**payload))
+            self.summary.saved[location_id] = str(saved_path)
+        except Exception as e:
+            self.summary.failed[location_id] = str(e)
+            logger.error(f"Failed to store result for {location_id}: {e}")
+
+    def _check_workers(self):
+        for shard, process in list(self._processes.items()):
+            if process.is_alive() or not self._pending.get(shard):
+                continue
+
+            if self._restarts[shard] >= self.max_restarts:
+                logger.error(f"Shard {shard} crashed too often, giving up on {len(self._pending[shard])} locations")
+                for location_id in self._pending[shard]:
+                    self.summary.failed[location_id] = f"worker crashed (exit code {process.exitcode})"
+                self._pending[shard] = set()
+                continue
+
+            self._restarts[shard] += 1
+            self.summary.restarts += 1
+            logger.warning(
+                f"Shard {shard} worker exited with code {process.exitcode}, restarting "
+                f"({len(self._pending[shard])} locations left)"
+            )
+            self._start(shard)
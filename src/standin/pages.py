@@ -0,0 +1,169 @@
+"""
+Recorded and synthetic BBC Weather pages served by the stand-in server
+
+Recordings live in ``src/standin/recordings/<location_id>.html``. When a
+location has no recording, a synthetic page with the same structure (an
+embedded ``{"options": ..., "data": {"forecasts": ...}}`` script, 14 days of
+hourly reports and page-sized filler markup) is generated instead.
+"""
+
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+RECORDINGS_DIR = Path(__file__).resolve().parent / "recordings"
+
+_WEATHER_TYPES = [
+    (1, "Sunny"),
+    (3, "Sunny Intervals"),
+    (7, "Light Cloud"),
+    (8, "Thick Cloud"),
+    (12, "Light Rain Showers"),
+    (15, "Heavy Rain"),
+]
+_DIRECTIONS = [
+    ("N", "Northerly"),
+    ("NE", "North Easterly"),
+    ("E", "Easterly"),
+    ("SE", "South Easterly"),
+    ("S", "Southerly"),
+    ("SW", "South Westerly"),
+    ("W", "Westerly"),
+    ("NW", "North Westerly"),
+]
+
+
+def _hourly_report(rng: random.Random, day: date, hour: int) -> dict:
+    temp_c = rng.randint(-2, 24)
+    wind_kph = rng.randint(0, 60)
+    weather_type, weather_text = rng.choice(_WEATHER_TYPES)
+    abbreviation, full = rng.choice(_DIRECTIONS)
+    precip = rng.randint(0, 100)
+
+    return {
+        "localDate": day.isoformat(),
+        "timeslot": f"{hour:02d}:00",
+        "timeslotLength": 1,
+        "temperatureC": temp_c,
+        "temperatureF": round(temp_c * 9 / 5 + 32),
+        "feelsLikeTemperatureC": temp_c - rng.randint(0, 4),
+        "feelsLikeTemperatureF": round((temp_c - 2) * 9 / 5 + 32),
+        "enhancedWeatherDescription": f"{weather_text} and a {'gentle' if wind_kph < 20 else 'strong'} breeze",
+        "weatherType": weather_type,
+        "weatherTypeText": weather_text,
+        "extendedWeatherType": weather_type,
+        "precipitationProbabilityInPercent": precip,
+        "precipitationProbabilityText": "Precipitation is not expected" if precip < 10 else "A chance of rain",
+        "windSpeedKph": wind_kph,
+        "windSpeedMph": round(wind_kph / 1.609),
+        "gustSpeedKph": wind_kph + rng.randint(0, 25),
+        "gustSpeedMph": round((wind_kph + 10) / 1.609),
+        "windDirection": abbreviation,
+        "windDirectionAbbreviation": abbreviation,
+        "windDirectionFull": full,
+        "windDescription": "Gentle breeze" if wind_kph < 20 else "Strong wind",
+        "humidity": rng.randint(30, 100),
+        "pressure": rng.randint(980, 1040),
+        "visibility": rng.choice(["Good", "Moderate", "Poor", "Very Good"]),
+    }
+
+
+def build_forecast_json(
+    location_id: str,
+    issued_at: Optional[datetime] = None,
+    days: int = 14,
+    seed: Optional[int] = None,
+) -> dict:
+    issued_at = issued_at or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    rng = random.Random(seed if seed is not None else int(location_id or 0))
+    stamp = issued_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+    start = issued_at.date()
+
+    forecasts = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        # Today only has the remaining hours, like the live page
+        first_hour = issued_at.hour if offset == 0 else 0
+        reports = [_hourly_report(rng, day, hour) for hour in range(first_hour, 24)]
+
+        forecasts.append(
+            {
+                "detailed": {"issueDate": stamp, "lastUpdated": stamp, "reports": reports},
+                "summary": {
+                    "reports": [
+                        {
+                            "localDate": day.isoformat(),
+                            "temperatureC": max(r["temperatureC"] for r in reports),
+                            "weatherTypeText": reports[0]["weatherTypeText"],
+                        }
+                    ]
+                },
+            }
+        )
+
+    return {
+        "options": {"location_id": location_id, "day": "none", "locale": "en"},
+        "data": {"forecasts": forecasts},
+    }
+
+
+def build_page(
+    location_id: str,
+    name: Optional[str] = None,
+    issued_at: Optional[datetime] = None,
+    filler_kb: int = 600,
+    seed: Optional[int] = None,
+) -> str:
+    name = name or f"Location {location_id}"
+    payload = json.dumps(build_forecast_json(location_id, issued_at=issued_at, seed=seed))
+
+    # Live pages carry hundreds of KB of unrelated markup and scripts around the data
+    filler_block = '<div class="wr-day"><span class="wr-value">filler</span></div>\n'
+    filler = filler_block * max(0, filler_kb * 1024 // len(filler_block))
+    scripts = "".join(
+        f"<script>window.__bbc_module_{i} = {{\"id\": {i}, \"config\": \"{'x' * 200}\"}};</script>\n"
+        for i in range(40)
+    )
+
+    return (
+        "<!DOCTYPE html><html lang=\"en-GB\"><head>"
+        f"<title>{name} - BBC Weather</title>"
+        f"<meta property=\"og:title\" content=\"{name} - BBC Weather\">"
+        f"{scripts}</head><body>"
+        f"<div id=\"wr-forecast\" data-location-name=\"{name}\">{filler}</div>"
+        f"<script>window.__INITIAL_DATA__ = {payload};</script>"
+        "</body></html>"
+    )
+
+
+def load_page(
+    location_id: str, recordings_dir: Path = RECORDINGS_DIR, filler_kb: int = 600
+) -> str:
+    recording = recordings_dir / f"{location_id}.html"
+    if recording.exists():
+        return recording.read_text(encoding="utf-8")
+    return build_page(location_id, filler_kb=filler_kb)
+
+
+def record(location_ids: List[str], recordings_dir: Path = RECORDINGS_DIR) -> List[Path]:
+    import httpx
+
+    from src.utils.config import settings
+
+    recordings_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    with httpx.Client(
+        headers={"User-Agent": settings.user_agent}, follow_redirects=True, timeout=30
+    ) as client:
+        for location_id in location_ids:
+            response = client.get(settings.get_weather_url(location_id))
+            response.raise_for_status()
+
+            path = recordings_dir / f"{location_id}.html"
+            path.write_text(response.text, encoding="utf-8")
+            paths.append(path)
+
+    return paths
@@ -0,0 +1,220 @@
+"""
+Local stand-in for bbc.com/weather with latency, error and throttling injection
+
+Any ``/<location_id>`` path (or ``/weather/<location_id>``) is answered with a
+recorded or synthetic forecast page. Point the scrapers at it by setting
+``BBC_WEATHER_BASE_URL`` to ``StandInServer.base_url``. Counters are served
+as JSON from ``/__standin/stats``.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .pages import load_page
+
+STATS_PATH = "/__standin/stats"
+CHUNK_SIZE = 16 * 1024
+
+
+class StandInProfile(BaseModel):
+    latency: Literal["none", "fixed", "uniform", "exponential", "lognormal"] = "none"
+    latency_ms: float = Field(default=0.0, ge=0, description="Fixed, mean or median latency")
+    latency_spread_ms: float = Field(default=0.0, ge=0, description="Half-width for uniform latency")
+    latency_sigma: float = Field(default=0.5, ge=0, description="Shape of the lognormal tail")
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Share of 5xx responses")
+    throttle_rate: float = Field(default=0.0, ge=0, le=1, description="Share of random 429 responses")
+    throttle_rps: Optional[float] = Field(default=None, gt=0, description="Answer 429 above this request rate")
+    retry_after: int = Field(default=1, ge=0, description="Retry-After seconds sent with 429")
+    bandwidth_kbps: Optional[float] = Field(default=None, gt=0, description="Per-response KB/s limit")
+    filler_kb: int = Field(default=600, ge=0, description="Filler markup in synthetic pages")
+    seed: Optional[int] = None
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class StandInServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        profile: Optional[StandInProfile] = None,
+    ):
+        self.profile = profile or StandInProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._bucket = _TokenBucket(self.profile.throttle_rps) if self.profile.throttle_rps else None
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, int] = {"requests": 0, "bytes_sent": 0}
+
+        filler_kb = self.profile.filler_kb
+
+        @lru_cache(maxsize=32)
+        def page_bytes(location_id: str) -> bytes:
+            return load_page(location_id, filler_kb=filler_kb).encode("utf-8")
+
+        self._page_bytes = page_bytes
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def _latency_seconds(self) -> float:
+        profile = self.profile
+        with self._lock:
+            if profile.latency == "fixed":
+                ms = profile.latency_ms
+            elif profile.latency == "uniform":
+                ms = self._rng.uniform(
+                    profile.latency_ms - profile.latency_spread_ms,
+                    profile.latency_ms + profile.latency_spread_ms,
+                )
+            elif profile.latency == "exponential":
+                ms = self._rng.expovariate(1 / profile.latency_ms) if profile.latency_ms else 0.0
+            elif profile.latency == "lognormal":
+                ms = (
+                    self._rng.lognormvariate(math.log(profile.latency_ms), profile.latency_sigma)
+                    if profile.latency_ms
+                    else 0.0
+                )
+            else:
+                ms = 0.0
+        return max(0.0, ms) / 1000
+
+    def _fault(self) -> Optional[int]:
+        with self._lock:
+            if self._bucket and not self._bucket.take():
+                return 429
+            roll = self._rng.random()
+
+            if roll < self.profile.throttle_rate:
+                return 429
+            if roll < self.profile.throttle_rate + self.profile.error_rate:
+                return self._rng.choice([500, 502, 503])
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class StandInHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+
+                if path == STATS_PATH:
+                    with server._lock:
+                        body = json.dumps(server.stats).encode("utf-8")
+                    self._respond(200, body, "application/json")
+                    return
+
+                server._count("requests")
+                location_id = path.split("/")[-1]
+                if not location_id.isdigit():
+                    server._count("status_404")
+                    self._respond(404, b"Unknown location", "text/plain")
+                    return
+
+                delay = server._latency_seconds()
+                if delay:
+                    time.sleep(delay)
+
+                status = server._fault()
+                if status == 429:
+                    server._count("status_429")
+                    self._respond(
+                        429,
+                        b"Too Many Requests",
+                        "text/plain",
+                        {"Retry-After": str(server.profile.retry_after)},
+                    )
+                    return
+                if status:
+                    server._count(f"status_{status}")
+                    self._respond(status, b"Injected error", "text/plain")
+                    return
+
+                server._count("status_200")
+                self._respond(200, server._page_bytes(location_id), "text/html; charset=utf-8")
+
+            def _respond(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    for name, value in (headers or {}).items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self._write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    server._count("client_disconnects")
+
+            def _write(self, body: bytes):
+                bandwidth = server.profile.bandwidth_kbps
+                if not bandwidth:
+                    self.wfile.write(body)
+                    server._count("bytes_sent", len(body))
+                    return
+
+                # Pace the body in chunks so slow links are visible to the client
+                for offset in range(0, len(body), CHUNK_SIZE):
+                    chunk = body[offset : offset + CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                    server._count("bytes_sent", len(chunk))
+                    time.sleep(len(chunk) / (bandwidth * 1024))
+
+            def log_message(self, format, *args):
+                pass
+
+        return StandInHandler
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -1,11 +1,85 @@
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
+from typing import Optional
 
 from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+
+
+def partition_dir(day: date, location_id: str) -> Path:
+    return Path(f"date={day.isoformat()}") / f"location={location_id}"
+
+
+_side_channels: Optional[ThreadPoolExecutor] = None
+
+
+def _side_channel_executor() -> ThreadPoolExecutor:
+    # One thread: appends stay in save order and never race each other in-process
+    global _side_channels
+    if _side_channels is None:
+        _side_channels = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-side-channels")
+    return _side_channels
 
 
 class BaseStorage(ABC):
 
+    def output_path(self, weather_data: WeatherData, filename: str, suffix: str) -> Path:
+        """Where a snapshot is written; partitioned by save date and location unless STORAGE_LAYOUT=flat"""
+        now = datetime.now()
+        if not filename:
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            location_name = weather_data.location_name or weather_data.location_id
+            location_safe = location_name.lower().replace(" ", "_")
+            filename = f"weather_{location_safe}_{timestamp}"
+
+        if not filename.endswith(suffix):
+            filename = f"{filename}{suffix}"
+
+        directory = self.output_dir
+        if settings.storage_layout == "partitioned":
+            directory = directory / partition_dir(now.date(), weather_data.location_id)
+            directory.mkdir(parents=True, exist_ok=True)
+        return directory / filename
+
+    async def track_changes(self, weather_data: WeatherData):
+        """Run record_changes on a background thread; file locks and keyframe decoding stay off the event loop"""
+        if not (settings.diff_tracking or settings.delta_archive or settings.binary_store):
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_side_channel_executor(), self.record_changes, weather_data)
+
+    def record_changes(self, weather_data: WeatherData):
+        """Diff a just-saved forecast against the previous one when DIFF_TRACKING is on,
+        and append it to the delta archive / binary store when DELTA_ARCHIVE / BINARY_STORE is on"""
+        if settings.diff_tracking:
+            from src.analytics.diff import diff_tracker
+
+            try:
+                diff_tracker.observe(weather_data)
+            except Exception as e:
+                # Change tracking is a side channel; it must never fail the save itself
+                logger.warning(f"Forecast diff failed for {weather_data.location_id}: {e}")
+
+        if settings.delta_archive:
+            from .delta_archive import get_delta_archive
+
+            try:
+                get_delta_archive().append_weather(weather_data)
+            except Exception as e:
+                logger.warning(f"Delta archive append failed for {weather_data.location_id}: {e}")
+
+        if settings.binary_store:
+            from .binary_store import get_binary_store
+
+            try:
+                get_binary_store().append(weather_data)
+            except Exception as e:
+                logger.warning(f"Binary store append failed for {weather_data.location_id}: {e}")
+
     @abstractmethod
     async def save(self, weather_data: WeatherData, filename: str) -> Path:
         pass
@@ -0,0 +1,430 @@
+"""
+Append-only segments of fixed-width hourly records, read through mmap as NumPy structured arrays
+"""
+
+import fcntl
+import json
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.models.exceptions import StorageException
+from src.models.weather import DERIVED_FIELDS, WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+NUMERIC_FIELDS = (
+    "timeslot_length",
+    "temperature_c",
+    "temperature_f",
+    "feels_like_temperature_c",
+    "feels_like_temperature_f",
+    "weather_type",
+    "extended_weather_type",
+    "precipitation_probability_percent",
+    "wind_speed_kph",
+    "wind_speed_mph",
+    "gust_speed_kph",
+    "gust_speed_mph",
+    "humidity",
+    "pressure",
+)
+TEXT_FIELDS = (
+    "enhanced_weather_description",
+    "weather_type_text",
+    "precipitation_probability_text",
+    "wind_direction",
+    "wind_direction_abbreviation",
+    "wind_direction_full",
+    "wind_description",
+    "visibility",
+)
+
+# location: dictionary code of the location ID; slot: local forecast time in minutes
+# since 1970-01-01 00:00; updated: snapshot last_updated in UTC epoch seconds.
+# Derived metrics are NaN when absent; text fields are dictionary codes.
+RECORD = np.dtype(
+    [("location", "<u4"), ("slot", "<i4"), ("updated", "<i8")]
+    + [(field, "<i2") for field in NUMERIC_FIELDS]
+    + [(field, "<f4") for field in DERIVED_FIELDS]
+    + [(field, "<u4") for field in TEXT_FIELDS]
+)
+
+# magic, format version, record size, dtype fingerprint
+_HEADER = struct.Struct("<8sHHI48x")
+_MAGIC = b"WXBIN\x00\x00\x01"
+_FINGERPRINT = zlib.crc32(str(RECORD.descr).encode())
+
+binary_rows = metrics.counter("binary_store_rows_total", "Hourly records appended to the binary store")
+
+
+def _slot(local_date: date, timeslot: str) -> int:
+    hours, minutes = timeslot.split(":")
+    return (local_date.toordinal() - 719163) * 1440 + int(hours) * 60 + int(minutes)
+
+
+def slot_of(when) -> int:
+    """Store time slot of a local forecast time (datetime or ISO string, e.g. 2025-01-01T12:00)"""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    return _slot(when.date(), when.strftime("%H:%M"))
+
+
+def slot_label(slot: int) -> str:
+    day, minutes = divmod(int(slot), 1440)
+    return f"{date.fromordinal(day + 719163).isoformat()} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class _Segment:
+    """One segment file mapped read-only, plus its (location, slot) sort index"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self.records = np.empty(0, dtype=RECORD)
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.order = np.empty(0, dtype=np.int64)
+
+    def refresh(self) -> bool:
+        """Remap if records were appended since the last call; True when it changed"""
+        count = max(0, (self.path.stat().st_size - _HEADER.size) // RECORD.itemsize)
+        if count == self.count:
+            return False
+        with open(self.path, "rb") as f:
+            magic, _, itemsize, fingerprint = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or itemsize != RECORD.itemsize or fingerprint != _FINGERPRINT:
+            raise StorageException(f"{self.path} is not a binary store segment of this version")
+
+        # A trailing partial record (interrupted append) stays outside the view
+        # A plain ndarray view of the mapping: still zero-copy, without memmap's per-index overhead
+        self.records = np.memmap(
+            self.path, dtype=RECORD, mode="r", offset=_HEADER.size, shape=(count,)
+        ).view(np.ndarray)
+        self.count = count
+        self._index()
+        return True
+
+    def _index(self):
+        index_path = self.path.with_suffix(".idx.npy")
+        if index_path.exists():
+            order = np.load(index_path, mmap_mode="r")
+            if len(order) == self.count:
+                self.order = order
+                self.keys = self._keys()[order]
+                return
+        keys = self._keys()
+        # Stable, so rows of one (location, slot) stay in append order, oldest snapshot first
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def _keys(self) -> np.ndarray:
+        return (self.records["location"].astype(np.uint64) << np.uint64(32)) | (
+            self.records["slot"].astype(np.uint32).astype(np.uint64)
+        )
+
+    def seal(self):
+        """Persist the sort index once the segment is full, so later opens skip the sort"""
+        self.refresh()
+        np.save(self.path.with_suffix(".idx.npy"), np.asarray(self.order))
+
+    def rows(self, low: int, high: int) -> np.ndarray:
+        """Positions of records with low <= key < high, in key then append order"""
+        start, end = np.searchsorted(self.keys, np.array([low, high], dtype=np.uint64))
+        return self.order[start:end]
+
+
+class BinaryStoreStats(BaseModel):
+    segments: int
+    records: int
+    locations: int
+    strings: int
+    bytes: int
+
+
+class BinaryStore:
+    """Hourly reports as fixed-width records in append-only segment-NNNNNN.wxb files.
+
+    Strings (location IDs and text fields) are coded through strings.jsonl,
+    one JSON string per line, code = line number. Readers map each segment
+    and get structured-array views without parsing; lookups by location and
+    time binary-search a per-segment index sorted by (location, slot).
+    """
+
+    def __init__(self, directory: Optional[Path] = None, segment_records: Optional[int] = None):
+        self.directory = directory or settings.binary_dir
+        self.segment_records = segment_records or settings.binary_segment_records
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._strings_offset = 0
+        self._segments: Dict[Path, _Segment] = {}
+        self._listing: Tuple[int, List[Path]] = (-1, [])
+        self._lock = threading.Lock()
+
+    @property
+    def _strings_path(self) -> Path:
+        return self.directory / "strings.jsonl"
+
+    def _load_strings(self):
+        path = self._strings_path
+        if not path.exists() or path.stat().st_size == self._strings_offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._strings_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                value = json.loads(line)
+                self._codes.setdefault(value, len(self._strings))
+                self._strings.append(value)
+                self._strings_offset += len(line)
+
+    def _code_strings(self, values: List[str]) -> np.ndarray:
+        """Codes for values, appending unseen strings to the dictionary before any record uses them"""
+        new = [value for value in dict.fromkeys(values) if value not in self._codes]
+        if new:
+            with open(self._strings_path, "ab") as f:
+                f.truncate(self._strings_offset)
+                for value in new:
+                    line = (json.dumps(value, ensure_ascii=False) + "\n").encode("utf-8")
+                    f.write(line)
+                    self._codes[value] = len(self._strings)
+                    self._strings.append(value)
+                    self._strings_offset += len(line)
+        return np.array([self._codes[value] for value in values], dtype=np.uint32)
+
+    def strings(self, codes: np.ndarray) -> np.ndarray:
+        """Decode a code array to an object array of strings"""
+        self._load_strings()
+        return np.array(self._strings, dtype=object)[np.asarray(codes, dtype=np.int64)]
+
+    def code(self, value: str) -> Optional[int]:
+        self._load_strings()
+        return self._codes.get(value)
+
+    @contextmanager
+    def _writer(self) -> Iterator[None]:
+        # An exclusive lock file keeps writers in other processes from interleaving codes or records
+        with self._lock, open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._load_strings()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def segment_paths(self) -> List[Path]:
+        # The directory listing only changes when a segment is added
+        mtime = self.directory.stat().st_mtime_ns
+        if mtime != self._listing[0]:
+            self._listing = (mtime, sorted(self.directory.glob("segment-*.wxb")))
+        return self._listing[1]
+
+    def segments(self) -> List[_Segment]:
+        """Mapped segments; only the newest can still grow, so only it is re-checked"""
+        paths = self.segment_paths()
+        segments = []
+        for i, path in enumerate(paths):
+            segment = self._segments.get(path)
+            if segment is None:
+                segment = self._segments[path] = _Segment(path)
+                segment.refresh()
+            elif i == len(paths) - 1 or segment.count == 0:
+                segment.refresh()
+            segments.append(segment)
+        return segments
+
+    def scan(self) -> Iterator[np.ndarray]:
+        """Every segment as a zero-copy structured array view"""
+        for segment in self.segments():
+            yield segment.records
+
+    def _active_segment(self, rows: int) -> Path:
+        paths = self.segment_paths()
+        if paths:
+            path = paths[-1]
+            count = (path.stat().st_size - _HEADER.size) // RECORD.itemsize
+            if count + rows <= self.segment_records or count == 0:
+                return path
+            segment = self._segments.get(path) or _Segment(path)
+            segment.seal()
+        path = self.directory / f"segment-{len(paths) + 1:06d}.wxb"
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 1, RECORD.itemsize, _FINGERPRINT))
+        return path
+
+    def records_from_weather(self, weather_data: WeatherData) -> np.ndarray:
+        reports = weather_data.hourly_forecast
+        records = np.zeros(len(reports), dtype=RECORD)
+        if not reports:
+            return records
+        records["location"] = self._code_strings([weather_data.location_id])[0]
+        records["slot"] = [_slot(report.local_date, report.timeslot) for report in reports]
+        records["updated"] = _epoch(weather_data.last_updated)
+        for field in NUMERIC_FIELDS:
+            records[field] = [getattr(report, field) for report in reports]
+        for field in DERIVED_FIELDS:
+            records[field] = [np.nan if getattr(report, field) is None else getattr(report, field) for report in reports]
+        codes = self._code_strings([getattr(report, field) or "" for field in TEXT_FIELDS for report in reports])
+        for i, field in enumerate(TEXT_FIELDS):
+            records[field] = codes[i * len(reports):(i + 1) * len(reports)]
+        return records
+
+    def append(self, weather_data: WeatherData) -> int:
+        """Append one snapshot's hourly reports; returns the records written"""
+        if not weather_data.hourly_forecast:
+            return 0
+        try:
+            with self._writer():
+                records = self.records_from_weather(weather_data)
+                path = self._active_segment(len(records))
+                with open(path, "ab") as f:
+                    # Drop a partial record left by an interrupted append
+                    size = f.seek(0, 2)
+                    f.truncate(size - (size - _HEADER.size) % RECORD.itemsize)
+                    f.write(records.tobytes())
+        except OSError as e:
+            logger.error(f"Failed to append to binary store: {e}")
+            raise StorageException(f"Binary store write failed: {str(e)}") from e
+
+        binary_rows.inc(len(records))
+        return len(records)
+
+    def lookup(self, location_id: str, start, end=None, latest: bool = True) -> np.ndarray:
+        """Records of one location with start <= slot < end (one slot when end is None).
+
+        start and end are local forecast times. With latest, each slot keeps
+        only the record from the most recently updated snapshot; otherwise all
+        snapshots' records are returned, ordered by slot then update time.
+        """
+        code = self.code(location_id)
+        if code is None:
+            return np.empty(0, dtype=RECORD)
+        first = slot_of(start)
+        last = first + 1 if end is None else slot_of(end)
+        low = (code << 32) | (first & 0xFFFFFFFF)
+        high = (code << 32) | (last & 0xFFFFFFFF)
+
+        # Gathering from the mapped views is the only copy made
+        parts = []
+        for segment in self.segments():
+            positions = segment.rows(low, high)
+            if len(positions):
+                parts.append(segment.records[positions])
+        if not parts:
+            return np.empty(0, dtype=RECORD)
+        # Filled slice by slice: np.concatenate re-derives the structured dtype on every call
+        found = np.empty(sum(len(part) for part in parts), dtype=RECORD)
+        position = 0
+        for part in parts:
+            found[position:position + len(part)] = part
+            position += len(part)
+        order = np.lexsort((found["updated"], found["slot"]))
+        found = found[order]
+        if latest:
+            last_of_slot = np.r_[found["slot"][1:] != found["slot"][:-1], True]
+            found = found[last_of_slot]
+        return found
+
+    def latest_update(self, location_id: str) -> Optional[int]:
+        """Newest stored last_updated (epoch seconds) of a location"""
+        code = self.code(location_id)
+        if code is None:
+            return None
+        newest = None
+        for segment in self.segments():
+            positions = segment.rows(code << 32, (code + 1) << 32)
+            if len(positions):
+                value = int(segment.records["updated"][positions].max())
+                newest = value if newest is None else max(newest, value)
+        return newest
+
+    def decode(self, records: np.ndarray) -> List[dict]:
+        """Records as HourlyReport-shaped dicts plus location_id and last_updated"""
+        columns = {field: records[field].tolist() for field in NUMERIC_FIELDS}
+        for field in DERIVED_FIELDS:
+            columns[field] = [None if value != value else round(value, 2) for value in records[field].tolist()]
+        for field in TEXT_FIELDS:
+            columns[field] = self.strings(records[field]).tolist()
+        location_ids = self.strings(records["location"]).tolist()
+        rows = []
+        for i, (slot, updated) in enumerate(zip(records["slot"].tolist(), records["updated"].tolist())):
+            local_date, timeslot = slot_label(slot).split(" ")
+            row = {
+                "location_id": location_ids[i],
+                "last_updated": datetime.fromtimestamp(updated, timezone.utc).isoformat(),
+                "local_date": local_date,
+                "timeslot": timeslot,
+            }
+            row.update({field: column[i] for field, column in columns.items()})
+            rows.append(row)
+        return rows
+
+    def stats(self) -> BinaryStoreStats:
+        self._load_strings()
+        segments = self.segments()
+        locations = set()
+        for segment in segments:
+            locations.update(np.unique(segment.records["location"]).tolist())
+        return BinaryStoreStats(
+            segments=len(segments),
+            records=sum(segment.count for segment in segments),
+            locations=len(locations),
+            strings=len(self._strings),
+            bytes=sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file()),
+        )
+
+
+_store: Optional[BinaryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_binary_store() -> BinaryStore:
+    """Shared store for BINARY_STORE=true saves, created on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BinaryStore()
+    return _store
+
+
+def pack(
+    output_dir: Optional[Path] = None,
+    archive_dir: Optional[Path] = None,
+    store: Optional[BinaryStore] = None,
+) -> Tuple[int, int]:
+    """Append stored snapshots newer than what the store holds per location; returns (snapshots, records)"""
+    from .compaction import stored_snapshots
+
+    store = store or BinaryStore()
+    snapshots = records = 0
+    newest: Dict[str, Optional[int]] = {}
+    for location_id, snapshot, _ in stored_snapshots(output_dir, archive_dir):
+        if snapshot is None:
+            continue
+        if location_id not in newest:
+            newest[location_id] = store.latest_update(location_id)
+        data = WeatherData(**snapshot)
+        updated = _epoch(data.last_updated)
+        if newest[location_id] is not None and updated <= newest[location_id]:
+            continue
+        records += store.append(data)
+        snapshots += 1
+        newest[location_id] = updated
+
+    logger.info(f"Packed {snapshots} snapshots ({records} hourly records) into {store.directory}")
+    return snapshots, records
@@ -0,0 +1,407 @@
+"""
+Compaction of per-scrape snapshot files into gzip JSON-lines archives indexed by a SQLite manifest
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.models.exceptions import StorageException
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+SNAPSHOT_SUFFIXES = (".json", ".csv", ".jsonl")
+
+_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location_id TEXT NOT NULL,
+    location_name TEXT,
+    last_updated TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    source TEXT NOT NULL UNIQUE,
+    archive TEXT NOT NULL,
+    member_offset INTEGER NOT NULL,
+    member_length INTEGER NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_location ON snapshots (location_id, saved_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_archive ON snapshots (archive, member_offset);
+"""
+
+compacted_snapshots = metrics.counter("compacted_snapshots_total", "Snapshot files merged into archives")
+
+
+class ArchiveEntry(BaseModel):
+    location_id: str
+    location_name: Optional[str] = None
+    last_updated: str
+    saved_at: str
+    source: str
+    archive: str
+    member_offset: int
+    member_length: int
+    line: int
+
+
+class CompactionResult(BaseModel):
+    files: int = 0
+    skipped: int = 0
+    archives: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+class SnapshotArchive:
+    """Archives under archive_dir plus manifest.db, which maps every snapshot to its gzip member.
+
+    Each compaction run appends one gzip member per archive, so a single
+    snapshot is read by decompressing just that member, and a whole archive
+    is still an ordinary .jsonl.gz file.
+    """
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        self.archive_dir = archive_dir or settings.archive_dir
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.archive_dir / "manifest.db"), timeout=30, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE serializes appends, so two compactions never write the same archive at once
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        self._conn.close()
+
+    def archived(self, sources: Iterable[str]) -> set:
+        sources = list(sources)
+        found = set()
+        for start in range(0, len(sources), 500):
+            chunk = sources[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT source FROM snapshots WHERE source IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(row["source"] for row in rows)
+        return found
+
+    def append(self, archive: str, snapshots: Iterable[Tuple[str, str, dict]]) -> Tuple[int, int]:
+        """Write (source, saved_at, data) snapshots as one new gzip member; returns (snapshots, bytes)"""
+        path = self.archive_dir / archive
+        rows = []
+        with self._transaction() as conn:
+            end = conn.execute(
+                "SELECT MAX(member_offset + member_length) FROM snapshots WHERE archive = ?", (archive,)
+            ).fetchone()[0] or 0
+
+            with open(path, "a+b") as f:
+                # Drop any tail left by a run that died before its manifest rows were committed
+                f.truncate(end)
+                with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0) as member:
+                    for source, saved_at, data in snapshots:
+                        member.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                        member.write(b"\n")
+                        rows.append(
+                            (data["location_id"], data.get("location_name"), str(data["last_updated"]), saved_at, source, len(rows))
+                        )
+                f.flush()
+                os.fsync(f.fileno())
+                length = f.tell() - end
+
+            if not rows:
+                os.truncate(path, end)
+                return 0, 0
+
+            conn.executemany(
+                "INSERT INTO snapshots (location_id, location_name, last_updated, saved_at, source, line,"
+                " archive, member_offset, member_length) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row + (archive, end, length) for row in rows],
+            )
+        return len(rows), length
+
+    def entries(self, location_id: Optional[str] = None) -> List[ArchiveEntry]:
+        if location_id is None:
+            rows = self._conn.execute("SELECT * FROM snapshots ORDER BY location_id, saved_at")
+        else:
+            rows = self._conn.execute(
+                "SELECT * FROM snapshots WHERE location_id = ? ORDER BY saved_at", (location_id,)
+            )
+        return [ArchiveEntry(**{key: row[key] for key in row.keys() if key != "id"}) for row in rows]
+
+    def read(self, entries: List[ArchiveEntry]) -> Iterator[dict]:
+        """Snapshots as dicts in entry order, decompressing each gzip member once"""
+        members: Dict[Tuple[str, int], List[bytes]] = {}
+        for entry in entries:
+            key = (entry.archive, entry.member_offset)
+            if key not in members:
+                with open(self.archive_dir / entry.archive, "rb") as f:
+                    f.seek(entry.member_offset)
+                    members[key] = gzip.decompress(f.read(entry.member_length)).splitlines()
+            yield json.loads(members[key][entry.line])
+
+    def history(self, location_id: str) -> List[WeatherData]:
+        try:
+            return [WeatherData(**data) for data in self.read(self.entries(location_id))]
+        except (OSError, EOFError, ValueError) as e:
+            logger.error(f"Failed to read archived history for {location_id}: {e}")
+            raise StorageException(f"Archive read failed: {str(e)}") from e
+
+
+def _saved_at(path: Path) -> datetime:
+    match = _TIMESTAMP.search(path.stem)
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def _partition(path: Path, key: str) -> Optional[str]:
+    for part in path.parts:
+        if part.startswith(f"{key}="):
+            return part[len(key) + 1:]
+    return None
+
+
+def read_snapshot(path: Path) -> dict:
+    """A saved JSON or CSV snapshot as a WeatherData JSON dict"""
+    if path.suffix == ".csv":
+        from .csv_storage import CSVStorage
+
+        return asyncio.run(CSVStorage(path.parent).load(path)).model_dump(mode="json")
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_snapshot_lines(path: Path) -> Tuple[List[Tuple[int, dict, int]], int]:
+    """(line number, snapshot, bytes) of each snapshot in a JSON Lines crawl file, and how many lines were unreadable"""
+    rows, skipped = [], 0
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                data["location_id"]
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping unreadable line {number} of {path}: {e}")
+                skipped += 1
+                continue
+            rows.append((number, data, len(line.encode("utf-8"))))
+    return rows, skipped
+
+
+def loose_snapshots(output_dir: Path, exclude: Optional[Path] = None) -> Iterator[Tuple[Path, str, Optional[str], datetime]]:
+    """(path, day, location ID or None for flat files, saved_at) of every snapshot file under output_dir"""
+    exclude = (exclude or settings.archive_dir).resolve()
+    for path in output_dir.rglob("*"):
+        if path.suffix not in SNAPSHOT_SUFFIXES or not path.is_file() or exclude in path.resolve().parents:
+            continue
+        relative = path.relative_to(output_dir)
+        saved_at = _saved_at(path)
+        day = _partition(relative, "date") or saved_at.date().isoformat()
+        yield path, day, _partition(relative, "location"), saved_at
+
+
+def _remove_empty_dirs(output_dir: Path):
+    for directory in sorted((p for p in output_dir.rglob("*") if p.is_dir()), key=lambda p: -len(p.parts)):
+        try:
+            directory.rmdir()
+        except OSError:
+            pass
+
+
+def compact(
+    output_dir: Optional[Path] = None,
+    archive_dir: Optional[Path] = None,
+    by: Literal["location", "day"] = "location",
+    older_than_days: Optional[int] = None,
+    keep_sources: bool = False,
+) -> CompactionResult:
+    """Merge snapshot files saved at least older_than_days ago into one archive per location or per day.
+
+    Sources are deleted only after their manifest rows are committed; a file
+    already in the manifest (from an interrupted run) is deleted without being
+    archived twice.
+    """
+    output_dir = output_dir or settings.output_dir
+    archive = SnapshotArchive(archive_dir)
+    older_than_days = settings.compact_older_than_days if older_than_days is None else older_than_days
+    cutoff = date.today() - timedelta(days=older_than_days)
+    result = CompactionResult()
+
+    # Group by archive first; only flat files need opening to learn their location
+    groups: Dict[str, List[Tuple[str, datetime, Path, Optional[dict], int]]] = defaultdict(list)
+    # JSON Lines crawl files hold many snapshots: lines left to archive before the file can go
+    crawl_lines: Dict[Path, int] = {}
+    for path, day, location_id, saved_at in loose_snapshots(output_dir, archive.archive_dir):
+        if day > cutoff.isoformat():
+            continue
+        source = path.relative_to(output_dir).as_posix()
+
+        if path.suffix == ".jsonl":
+            try:
+                rows, skipped = read_snapshot_lines(path)
+            except OSError as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                result.skipped += 1
+                continue
+            result.skipped += skipped
+            if not skipped:
+                crawl_lines[path] = len(rows)
+            for number, data, size in rows:
+                key = f"date={day}.jsonl.gz" if by == "day" else f"location={data['location_id']}.jsonl.gz"
+                groups[key].append((f"{source}#{number}", saved_at, path, data, size))
+            continue
+
+        if by == "day":
+            key = f"date={day}.jsonl.gz"
+        else:
+            if location_id is None:
+                try:
+                    location_id = read_snapshot(path)["location_id"]
+                except (OSError, ValueError, KeyError, StorageException) as e:
+                    logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                    result.skipped += 1
+                    continue
+            key = f"location={location_id}.jsonl.gz"
+        groups[key].append((source, saved_at, path, None, 0))
+
+    try:
+        for key, files in sorted(groups.items()):
+            files.sort(key=lambda item: item[1])
+            done = archive.archived([source for source, *_ in files])
+            written: List[Path] = [path for source, _, path, _, _ in files if source in done]
+
+            def snapshots() -> Iterator[Tuple[str, str, dict]]:
+                for source, saved_at, path, data, size in files:
+                    if source in done:
+                        continue
+                    if data is None:
+                        try:
+                            data = read_snapshot(path)
+                        except (OSError, ValueError, KeyError, StorageException) as e:
+                            logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                            result.skipped += 1
+                            continue
+                        size = path.stat().st_size
+                    result.bytes_before += size
+                    written.append(path)
+                    yield source, saved_at.isoformat(), data
+
+            count, length = archive.append(key, snapshots())
+            if count:
+                result.files += count
+                result.archives += 1
+                result.bytes_after += length
+                compacted_snapshots.inc(count)
+                logger.debug("Compacted {} snapshots into {}", count, key)
+
+            if not keep_sources:
+                for path in written:
+                    if path.suffix == ".jsonl":
+                        # Kept while other lines are unarchived, or for good if some were unreadable
+                        remaining = crawl_lines.get(path)
+                        if remaining is None:
+                            continue
+                        crawl_lines[path] = remaining - 1
+                        if remaining > 1:
+                            continue
+                    path.unlink(missing_ok=True)
+
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Compaction failed: {e}")
+        raise StorageException(f"Compaction failed: {str(e)}") from e
+    finally:
+        archive.close()
+
+    if not keep_sources:
+        _remove_empty_dirs(output_dir)
+    logger.info(
+        f"Compacted {result.files} snapshots into {result.archives} archives "
+        f"({result.bytes_before} -> {result.bytes_after} bytes, {result.skipped} skipped)"
+    )
+    return result
+
+
+def stored_snapshots(
+    output_dir: Optional[Path] = None, archive_dir: Optional[Path] = None
+) -> Iterator[Tuple[str, Optional[dict], int]]:
+    """(location_id, snapshot dict, JSON size) for every stored snapshot, loose or compacted,
+    one location at a time in save order; the snapshot is None for unreadable files"""
+    output_dir = output_dir or settings.output_dir
+    archive_dir = archive_dir or settings.archive_dir
+
+    # Loose files only get opened here to learn a flat file's location
+    sources: Dict[str, List[Tuple[str, object]]] = defaultdict(list)
+    for path, _, location_id, saved_at in loose_snapshots(output_dir, archive_dir):
+        if path.suffix == ".jsonl":
+            try:
+                rows, skipped = read_snapshot_lines(path)
+            except OSError as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                rows, skipped = [], 1
+            for _ in range(skipped):
+                yield "", None, 0
+            for _, data, size in rows:
+                sources[data["location_id"]].append((saved_at.isoformat(), (data, size)))
+            continue
+
+        if location_id is None:
+            try:
+                location_id = read_snapshot(path)["location_id"]
+            except (OSError, ValueError, KeyError, StorageException) as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+                yield "", None, 0
+                continue
+        sources[location_id].append((saved_at.isoformat(), path))
+
+    archive = SnapshotArchive(archive_dir) if (archive_dir / "manifest.db").exists() else None
+    try:
+        if archive is not None:
+            for entry in archive.entries():
+                sources[entry.location_id].append((entry.saved_at, entry))
+
+        for location_id, items in sorted(sources.items()):
+            items.sort(key=lambda item: item[0])
+            for _, source in items:
+                if isinstance(source, Path):
+                    try:
+                        yield location_id, read_snapshot(source), source.stat().st_size
+                    except (OSError, ValueError, StorageException) as e:
+                        logger.warning(f"Skipping unreadable snapshot {source}: {e}")
+                        yield location_id, None, 0
+                elif isinstance(source, tuple):
+                    yield (location_id, *source)
+                else:
+                    snapshot = next(archive.read([source]))
+                    # Sized as JSONStorage would have written it
+                    yield location_id, snapshot, len(json.dumps(snapshot, indent=2, ensure_ascii=False).encode("utf-8"))
+    finally:
+        if archive is not None:
+            archive.close()
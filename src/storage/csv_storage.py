@@ -1,33 +1,27 @@
 import csv
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from src.models.weather import WeatherData, HourlyReport
+from src.models.weather import DERIVED_FIELDS as DERIVED_COLUMNS, WeatherData, HourlyReport
 from src.models.exceptions import StorageException
 from src.utils.config import settings
 from src.utils.logger import logger
+from src.utils.metrics import timed
 from .base import BaseStorage
 
 
 class CSVStorage(BaseStorage):
 
-    def __init__(self, output_dir: Path = None):
+    def __init__(self, output_dir: Path = None, derived_columns: Optional[bool] = None):
         self.output_dir = output_dir or settings.output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.derived_columns = settings.derived_metrics if derived_columns is None else derived_columns
 
+    @timed("storage_save")
     async def save(self, weather_data: WeatherData, filename: str = None) -> Path:
         try:
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                location_name = weather_data.location_name or weather_data.location_id
-                location_safe = location_name.lower().replace(" ", "_")
-                filename = f"weather_{location_safe}_{timestamp}"
-
-            if not filename.endswith(".csv"):
-                filename = f"{filename}.csv"
-
-            filepath = self.output_dir / filename
+            filepath = self.output_path(weather_data, filename, ".csv")
 
             rows = self._flatten_hourly_reports(weather_data)
 
@@ -40,6 +34,7 @@ class CSVStorage(BaseStorage):
                 writer.writerows(rows)
 
             logger.info(f"Weather data saved to: {filepath} ({len(rows)} rows)")
+            await self.track_changes(weather_data)
             return filepath
 
         except Exception as e:
@@ -80,6 +75,9 @@ class CSVStorage(BaseStorage):
                 "pressure": report.pressure,
                 "visibility": report.visibility,
             }
+            if self.derived_columns:
+                for column in DERIVED_COLUMNS:
+                    row[column] = getattr(report, column)
             rows.append(row)
 
         return rows
@@ -122,6 +120,11 @@ class CSVStorage(BaseStorage):
                     humidity=int(row["humidity"]),
                     pressure=int(row["pressure"]),
                     visibility=row["visibility"],
+                    **{
+                        column: float(row[column])
+                        for column in DERIVED_COLUMNS
+                        if row.get(column)
+                    },
                 )
                 hourly_reports.append(report)
 
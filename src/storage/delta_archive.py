@@ -0,0 +1,452 @@
+"""
+Per-location snapshot history stored as compressed keyframes plus deltas against the previous snapshot
+"""
+
+import bisect
+import fcntl
+import gzip
+import json
+import lzma
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.cache.lru import LRUCache
+from src.models.exceptions import StorageException
+from src.models.weather import WeatherData
+from src.utils.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+KEYFRAME = 0
+DELTA = 1
+
+# Row tables and the fields that identify a row within them
+TABLES = {
+    "hourly_forecast": ("local_date", "timeslot"),
+    "daily_summaries": ("local_date",),
+}
+
+# magic, kind, codec, last_updated (epoch seconds), raw length, stored length
+_HEADER = struct.Struct("<2sBBqII")
+_MAGIC = b"WD"
+_CODECS = {"gzip": 1, "lzma": 2, "zstd": 3}
+_MISSING = object()
+
+delta_records = metrics.counter("delta_archive_records_total", "Snapshots appended to delta archives")
+delta_bytes = metrics.counter("delta_archive_bytes_total", "Compressed bytes appended to delta archives")
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise StorageException("DELTA_CODEC=zstd needs the zstandard package (pip install zstandard)") from e
+    return zstandard
+
+
+def _compress(codec: int, raw: bytes) -> bytes:
+    if codec == 1:
+        return gzip.compress(raw, compresslevel=9, mtime=0)
+    if codec == 2:
+        return lzma.compress(raw, preset=6)
+    return _zstd().ZstdCompressor(level=10).compress(raw)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == 1:
+        return gzip.decompress(data)
+    if codec == 2:
+        return lzma.decompress(data)
+    return _zstd().ZstdDecompressor().decompress(data)
+
+
+def _epoch(value) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+# A snapshot state is {"scalars": {...}, "tables": {name: (fields, {row_key: row_values})}}.
+# Row value lists are never mutated once stored, so states share them freely.
+
+def _state(snapshot: dict) -> dict:
+    tables = {}
+    for name, key_fields in TABLES.items():
+        records = snapshot.get(name) or []
+        fields = tuple(dict.fromkeys(field for record in records for field in record))
+        rows = {}
+        for record in records:
+            key = "T".join(str(record.get(field)) for field in key_fields)
+            while key in rows:
+                key += "#"
+            rows[key] = [record.get(field) for field in fields]
+        tables[name] = (fields, rows)
+
+    scalars = {key: value for key, value in snapshot.items() if key not in TABLES}
+    current = scalars.get("current_conditions")
+    fields, rows = tables["hourly_forecast"]
+    if current is not None and tuple(current) == fields:
+        # current_conditions is normally one of the hourly rows; keep a reference instead of a copy
+        values = [current.get(field) for field in fields]
+        for key, row in rows.items():
+            if row == values:
+                scalars["current_conditions"] = {"$row": key}
+                break
+    return {"scalars": scalars, "tables": tables}
+
+
+def _snapshot(state: dict) -> dict:
+    snapshot = {}
+    for key, value in state["scalars"].items():
+        if isinstance(value, dict) and "$row" in value:
+            fields, rows = state["tables"]["hourly_forecast"]
+            value = dict(zip(fields, rows[value["$row"]]))
+        snapshot[key] = value
+    for name, (fields, rows) in state["tables"].items():
+        snapshot[name] = [dict(zip(fields, row)) for row in rows.values()]
+    return snapshot
+
+
+def _keyframe(state: dict) -> dict:
+    return {
+        "scalars": state["scalars"],
+        "tables": {
+            name: {"fields": list(fields), "keys": list(rows), "rows": list(rows.values())}
+            for name, (fields, rows) in state["tables"].items()
+        },
+    }
+
+
+def _from_keyframe(payload: dict) -> dict:
+    return {
+        "scalars": payload["scalars"],
+        "tables": {
+            name: (tuple(table["fields"]), dict(zip(table["keys"], table["rows"])))
+            for name, table in payload["tables"].items()
+        },
+    }
+
+
+def _delta(previous: dict, current: dict) -> dict:
+    delta = {}
+    scalars = {key: value for key, value in current["scalars"].items() if previous["scalars"].get(key, _MISSING) != value}
+    removed = [key for key in previous["scalars"] if key not in current["scalars"]]
+    if scalars:
+        delta["scalars"] = scalars
+    if removed:
+        delta["unset"] = removed
+
+    tables = {}
+    for name, (fields, rows) in current["tables"].items():
+        old_fields, old_rows = previous["tables"].get(name, ((), {}))
+        if fields != old_fields:
+            tables[name] = {"fields": list(fields), "keys": list(rows), "rows": list(rows.values())}
+            continue
+
+        table = {}
+        dropped = [key for key in old_rows if key not in rows]
+        changed = {}
+        added = []
+        for key, row in rows.items():
+            old = old_rows.get(key)
+            if old is None:
+                added.append([key, row])
+            elif old != row:
+                changed[key] = [[i, value] for i, (was, value) in enumerate(zip(old, row)) if was != value]
+
+        if dropped:
+            table["drop"] = dropped
+        if changed:
+            table["set"] = changed
+        if added:
+            table["add"] = added
+        # Order is implied when kept rows stay in place and new ones are appended
+        dropped_keys = set(dropped)
+        implied = [key for key in old_rows if key not in dropped_keys] + [key for key, _ in added]
+        if implied != list(rows):
+            table["order"] = list(rows)
+        if table:
+            tables[name] = table
+    if tables:
+        delta["tables"] = tables
+    return delta
+
+
+def _apply(state: dict, delta: dict) -> dict:
+    scalars = dict(state["scalars"])
+    scalars.update(delta.get("scalars", {}))
+    for key in delta.get("unset", ()):
+        scalars.pop(key, None)
+
+    tables = dict(state["tables"])
+    for name, table in delta.get("tables", {}).items():
+        if "fields" in table:
+            tables[name] = (tuple(table["fields"]), dict(zip(table["keys"], table["rows"])))
+            continue
+        fields, rows = tables.get(name, ((), {}))
+        dropped = set(table.get("drop", ()))
+        rows = {key: row for key, row in rows.items() if key not in dropped}
+        for key, changes in table.get("set", {}).items():
+            row = list(rows[key])
+            for index, value in changes:
+                row[index] = value
+            rows[key] = row
+        for key, row in table.get("add", ()):
+            rows[key] = row
+        if "order" in table:
+            rows = {key: rows[key] for key in table["order"]}
+        tables[name] = (fields, rows)
+    return {"scalars": scalars, "tables": tables}
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class DeltaRecord(BaseModel):
+    offset: int
+    kind: int
+    codec: int
+    last_updated: int
+    raw_length: int
+    length: int
+
+
+class DeltaArchive:
+    """One append-only <location_id>.wxd file per location in directory.
+
+    A file is a sequence of records, each a fixed header followed by one
+    compressed JSON payload: a keyframe holding the whole snapshot, or a delta
+    against the snapshot before it. A keyframe is written every
+    keyframe_interval snapshots (or when a delta would be half a keyframe),
+    so reading any snapshot decompresses at most that many records.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        codec: Optional[Literal["gzip", "lzma", "zstd"]] = None,
+        keyframe_interval: Optional[int] = None,
+    ):
+        self.directory = directory or settings.delta_dir
+        self.codec = _CODECS[codec or settings.delta_codec]
+        self.keyframe_interval = keyframe_interval or settings.delta_keyframe_interval
+        if self.codec == _CODECS["zstd"]:
+            _zstd()
+        self._index: Dict[str, Tuple[int, List[DeltaRecord]]] = {}
+        self._last: Dict[str, Tuple[int, dict]] = {}
+        # Decoded states by (location, index): repeat and nearby reads start from the closest one
+        self._states = LRUCache(64)
+        self._lock = threading.Lock()
+
+    def path(self, location_id: str) -> Path:
+        return self.directory / f"{location_id}.wxd"
+
+    def locations(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("*.wxd"))
+
+    def records(self, location_id: str) -> List[DeltaRecord]:
+        """Record headers, rescanned only when the file has grown since the last call"""
+        path = self.path(location_id)
+        size = path.stat().st_size if path.exists() else 0
+        cached = self._index.get(location_id)
+        if cached and cached[0] == size:
+            return cached[1]
+
+        records = list(cached[1]) if cached and cached[0] < size else []
+        offset = records[-1].offset + _HEADER.size + records[-1].length if records else 0
+        if size > offset:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                while offset + _HEADER.size <= size:
+                    magic, kind, codec, updated, raw_length, length = _HEADER.unpack(f.read(_HEADER.size))
+                    if magic != _MAGIC or offset + _HEADER.size + length > size:
+                        # A torn final record from an interrupted append; the next append overwrites it
+                        break
+                    records.append(DeltaRecord(
+                        offset=offset, kind=kind, codec=codec, last_updated=updated, raw_length=raw_length, length=length
+                    ))
+                    offset += _HEADER.size + length
+                    f.seek(offset)
+        self._index[location_id] = (size, records)
+        return records
+
+    def count(self, location_id: str) -> int:
+        return len(self.records(location_id))
+
+    def _payload(self, f, record: DeltaRecord) -> dict:
+        f.seek(record.offset + _HEADER.size)
+        return json.loads(_decompress(record.codec, f.read(record.length)))
+
+    def _state_at(self, location_id: str, index: int) -> dict:
+        records = self.records(location_id)
+        start, state = index, self._states.get((location_id, index))
+        while state is None and records[start].kind != KEYFRAME:
+            start -= 1
+            state = self._states.get((location_id, start))
+        if state is not None and start == index:
+            return state
+
+        with open(self.path(location_id), "rb") as f:
+            if state is None:
+                state = _from_keyframe(self._payload(f, records[start]))
+                self._states.set((location_id, start), state)
+            for record in records[start + 1:index + 1]:
+                state = _apply(state, self._payload(f, record))
+        self._states.set((location_id, index), state)
+        return state
+
+    def get(self, location_id: str, index: int = -1) -> dict:
+        """Snapshot number index (negative counts from the newest) as a WeatherData JSON dict"""
+        count = self.count(location_id)
+        if not -count <= index < count:
+            raise IndexError(f"No snapshot {index} for {location_id} ({count} stored)")
+        try:
+            return _snapshot(self._state_at(location_id, index % count))
+        except (OSError, EOFError, ValueError, KeyError, lzma.LZMAError) as e:
+            logger.error(f"Failed to read delta archive for {location_id}: {e}")
+            raise StorageException(f"Delta archive read failed: {str(e)}") from e
+
+    def at(self, location_id: str, when) -> dict:
+        """The newest snapshot last updated at or before when"""
+        times = [record.last_updated for record in self.records(location_id)]
+        index = bisect.bisect_right(times, _epoch(when)) - 1
+        if index < 0:
+            raise IndexError(f"No snapshot of {location_id} updated at or before {when}")
+        return self.get(location_id, index)
+
+    def history(self, location_id: str, start: int = 0) -> Iterator[dict]:
+        """Every snapshot from start onwards, applying each delta once"""
+        records = self.records(location_id)
+        if not records or start >= len(records):
+            return
+        state = self._state_at(location_id, start)
+        yield _snapshot(state)
+        with open(self.path(location_id), "rb") as f:
+            for record in records[start + 1:]:
+                payload = self._payload(f, record)
+                state = _from_keyframe(payload) if record.kind == KEYFRAME else _apply(state, payload)
+                yield _snapshot(state)
+
+    def load(self, location_id: str, index: int = -1) -> WeatherData:
+        return WeatherData(**self.get(location_id, index))
+
+    @contextmanager
+    def _writer(self, location_id: str) -> Iterator[BinaryIO]:
+        # Queue workers and shards append from other processes; an exclusive lock on the
+        # location's file keeps them from interleaving records or deltas against a stale state
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path(location_id), "ab", buffering=0) as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def append(self, snapshot: dict) -> bool:
+        """Add a snapshot (a WeatherData JSON dict); False if it is older than or identical to the newest stored"""
+        location_id = snapshot["location_id"]
+        updated = _epoch(snapshot["last_updated"])
+        try:
+            with self._writer(location_id) as f:
+                records = self.records(location_id)
+                if records and updated < records[-1].last_updated:
+                    logger.debug("Skipping {} snapshot from {}: older than the archive", location_id, snapshot["last_updated"])
+                    return False
+
+                state = _state(snapshot)
+                kind, raw = KEYFRAME, None
+                if records:
+                    # The cached state is only trusted if no other writer appended since
+                    count, previous = self._last.get(location_id, (0, None))
+                    if previous is None or count != len(records):
+                        previous = self._state_at(location_id, len(records) - 1)
+
+                    delta = _delta(previous, state)
+                    if not delta:
+                        return False
+                    since_keyframe = next(i for i, record in enumerate(reversed(records)) if record.kind == KEYFRAME)
+                    raw = _encode(delta)
+                    if since_keyframe + 1 < self.keyframe_interval and len(raw) * 2 < records[-1 - since_keyframe].raw_length:
+                        kind = DELTA
+
+                if kind == KEYFRAME:
+                    raw = _encode(_keyframe(state))
+                data = _compress(self.codec, raw)
+                end = records[-1].offset + _HEADER.size + records[-1].length if records else 0
+                # Cut off a torn record left by an interrupted append before writing after it
+                f.truncate(end)
+                f.write(_HEADER.pack(_MAGIC, kind, self.codec, updated, len(raw), len(data)) + data)
+
+                self._last[location_id] = (len(records) + 1, state)
+        except OSError as e:
+            logger.error(f"Failed to append to delta archive: {e}")
+            raise StorageException(f"Delta archive write failed: {str(e)}") from e
+
+        delta_records.inc()
+        delta_bytes.inc(_HEADER.size + len(data))
+        return True
+
+    def append_weather(self, weather_data: WeatherData) -> bool:
+        return self.append(weather_data.model_dump(mode="json"))
+
+
+_archive: Optional[DeltaArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_delta_archive() -> DeltaArchive:
+    """Shared archive for DELTA_ARCHIVE=true saves, created on first use"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = DeltaArchive()
+    return _archive
+
+
+class PackResult(BaseModel):
+    snapshots: int = 0
+    skipped: int = 0
+    locations: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def pack(
+    output_dir: Optional[Path] = None,
+    archive_dir: Optional[Path] = None,
+    archive: Optional[DeltaArchive] = None,
+) -> PackResult:
+    """Append every stored snapshot (loose files and compacted archives) to the delta archives.
+
+    Snapshots are taken per location in save order, so rerunning only adds
+    snapshots newer than what each delta archive already holds.
+    """
+    from .compaction import stored_snapshots
+
+    archive = archive or DeltaArchive()
+    result = PackResult()
+    touched = set()
+    for location_id, snapshot, size in stored_snapshots(output_dir, archive_dir):
+        if snapshot is None:
+            result.skipped += 1
+        elif archive.append(snapshot):
+            result.snapshots += 1
+            result.bytes_before += size
+            touched.add(location_id)
+    result.locations = len(touched)
+
+    result.bytes_after = sum(archive.path(location_id).stat().st_size for location_id in archive.locations())
+    logger.info(
+        f"Packed {result.snapshots} snapshots of {result.locations} locations into {archive.directory} "
+        f"({result.skipped} skipped)"
+    )
+    return result
@@ -1,11 +1,11 @@
 import json
 from pathlib import Path
-from datetime import datetime
 
 from src.models.weather import WeatherData
 from src.models.exceptions import StorageException
 from src.utils.config import settings
 from src.utils.logger import logger
+from src.utils.metrics import timed
 from .base import BaseStorage
 
 
@@ -15,23 +15,16 @@ class JSONStorage(BaseStorage):
         self.output_dir = output_dir or settings.output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    @timed("storage_save")
     async def save(self, weather_data: WeatherData, filename: str = None) -> Path:
         try:
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                location_name = weather_data.location_name or weather_data.location_id
-                location_safe = location_name.lower().replace(" ", "_")
-                filename = f"weather_{location_safe}_{timestamp}"
-
-            if not filename.endswith(".json"):
-                filename = f"{filename}.json"
-
-            filepath = self.output_dir / filename
+            filepath = self.output_path(weather_data, filename, ".json")
             data_dict = weather_data.model_dump(mode="json")
             with open(filepath, "w", encoding="utf-8") as f:
                 json.dump(data_dict, f, indent=2, ensure_ascii=False, default=str)
 
             logger.info(f"Weather data saved to: {filepath}")
+            await self.track_changes(weather_data)
             return filepath
 
         except Exception as e:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,6 +14,23 @@ class Settings(BaseSettings):
         default=3000, description="Additional wait after page load in ms"
     )
 
+    browser_daemon_enabled: bool = Field(
+        default=True, description="Attach to a running browser daemon when available"
+    )
+    browser_daemon_url: Optional[str] = Field(
+        default=None, description="CDP endpoint of the browser daemon (overrides state file)"
+    )
+    browser_daemon_port: int = Field(
+        default=9222, description="CDP port the browser daemon listens on"
+    )
+    browser_daemon_idle_timeout: float = Field(
+        default=900.0, description="Shut the daemon down after this many idle seconds (0 = never)"
+    )
+    browser_daemon_state_file: Path = Field(
+        default=Path("state/browser_daemon.json"),
+        description="File where the running browser daemon publishes its endpoint",
+    )
+
     user_agent: str = Field(
         default="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         description="User agent string for requests",
@@ -46,8 +63,184 @@ class Settings(BaseSettings):
     output_dir: Path = Field(
         default=Path("data"), description="Output directory for scraped data"
     )
+    storage_layout: Literal["partitioned", "flat"] = Field(
+        default="partitioned",
+        description="partitioned: output_dir/date=YYYY-MM-DD/location=<id>/; flat: all files in output_dir",
+    )
+    archive_dir: Path = Field(
+        default=Path("archive"),
+        description="Compacted snapshot archives (*.jsonl.gz) and their manifest.db",
+    )
+    compact_older_than_days: int = Field(
+        default=1, description="Only compact date partitions at least this many days old"
+    )
+    delta_dir: Path = Field(
+        default=Path("state/deltas"),
+        description="Keyframe + delta snapshot history, one <location_id>.wxd per location",
+    )
+    delta_codec: Literal["gzip", "lzma", "zstd"] = Field(
+        default="lzma", description="Compression for delta archive records (zstd needs zstandard)"
+    )
+    delta_keyframe_interval: int = Field(
+        default=24, description="Snapshots per keyframe; bounds records decoded per random read"
+    )
+    delta_archive: bool = Field(
+        default=False, description="Also append every saved forecast to the delta archive"
+    )
+    binary_dir: Path = Field(
+        default=Path("state/binary"),
+        description="Fixed-width hourly record segments (*.wxb) and their string dictionary",
+    )
+    binary_segment_records: int = Field(
+        default=1_000_000, description="Hourly records per binary store segment before a new one starts"
+    )
+    binary_store: bool = Field(
+        default=False, description="Also append every saved forecast to the binary store"
+    )
+    scrapy_batch_size: int = Field(
+        default=20, description="Scraped items buffered before the Scrapy storage pipeline writes them"
+    )
+    scrapy_flush_interval: float = Field(
+        default=5.0, description="Seconds an item may wait in the Scrapy storage buffer before a flush (0 disables)"
+    )
+    scrapy_output_mode: Literal["per_location", "consolidated"] = Field(
+        default="per_location",
+        description="per_location: one file per scraped location; consolidated: one JSON Lines file per crawl",
+    )
+
+    cache_enabled: bool = Field(
+        default=True, description="Reuse fresh cached forecasts instead of scraping"
+    )
+    cache_dir: Path = Field(
+        default=Path("cache"), description="Directory for the on-disk forecast cache"
+    )
+    cache_max_entries: int = Field(
+        default=256, description="Maximum forecasts held in the in-memory cache"
+    )
+    cache_disk_max_entries: int = Field(
+        default=10000, description="Maximum forecasts held in the on-disk cache"
+    )
+    cache_min_ttl: int = Field(
+        default=300, description="Minimum time a fetched forecast stays fresh in seconds"
+    )
+    cache_max_ttl: int = Field(
+        default=10800, description="Maximum time a fetched forecast stays fresh in seconds"
+    )
+    cache_stale_ttl: int = Field(
+        default=21600, description="How long a stale forecast may still be served in seconds"
+    )
+    cache_serve_stale: bool = Field(
+        default=False,
+        description="Serve stale forecasts while revalidating in the background",
+    )
+    forecast_update_interval: int = Field(
+        default=3600,
+        description="Assumed BBC forecast update cadence in seconds until one is observed",
+    )
+
+    schedule_state_file: Path = Field(
+        default=Path("state/schedule.json"),
+        description="File where the refresh scheduler persists its state",
+    )
+    schedule_jitter: float = Field(
+        default=60.0, description="Maximum random delay added to each refresh in seconds"
+    )
+    schedule_max_interval: float = Field(
+        default=3600.0,
+        description="Maximum time between refreshes of one location in seconds",
+    )
+
+    queue_db_path: Path = Field(
+        default=Path("state/queue.db"), description="SQLite database for the job queue"
+    )
+    queue_lease_seconds: float = Field(
+        default=300.0, description="How long a worker holds a job before it is retried"
+    )
+    queue_max_attempts: int = Field(
+        default=3, description="Attempts per job before it is dead-lettered"
+    )
+    queue_poll_interval: float = Field(
+        default=2.0, description="Worker poll interval while jobs are pending elsewhere"
+    )
+
+    incremental_parse: bool = Field(
+        default=True,
+        description="Reuse parsed models of forecast days unchanged since the last scrape",
+    )
+    parse_cache_locations: int = Field(
+        default=256, description="Locations whose parsed forecast days are kept for reuse"
+    )
+
+    derived_metrics: bool = Field(
+        default=True,
+        description="Compute dew point, heat index, wind chill and pressure tendency at ingest",
+    )
+
+    diff_tracking: bool = Field(
+        default=False,
+        description="Diff every saved forecast against the previous one for its location",
+    )
+    diff_dir: Path = Field(
+        default=Path("state/diffs"),
+        description="Last snapshot per location and the diff log (<location_id>.ndjson)",
+    )
+
+    catalog_path: Path = Field(
+        default=Path("state/locations.catalog"),
+        description="Compiled location catalog (built from a GeoNames dump)",
+    )
+
+    pipeline_fetch_concurrency: int = Field(
+        default=2, description="Pages fetched concurrently by scrape_many"
+    )
+    pipeline_parse_workers: int = Field(
+        default=2, description="Parser threads used by scrape_many"
+    )
+    pipeline_queue_size: int = Field(
+        default=4, description="Items buffered between scrape_many stages"
+    )
+    pipeline_item_deadline: Optional[float] = Field(
+        default=None, description="End-to-end time limit per location in scrape_many (seconds)"
+    )
+
+    api_host: str = Field(default="127.0.0.1", description="Interface the forecast API binds to")
+    api_port: int = Field(default=8080, description="Port the forecast API listens on")
+    api_response_cache_entries: int = Field(
+        default=1024, description="Pre-serialized forecast responses kept in memory"
+    )
+    api_hot_window: float = Field(
+        default=900.0, description="Window in seconds over which API hits make a location hot"
+    )
+    api_hot_min_hits: int = Field(
+        default=3, description="Hits within the window that make a location hot"
+    )
+    api_refresh_ahead: float = Field(
+        default=120.0,
+        description="Refresh hot locations this many seconds before they go stale",
+    )
+
+    stream_max_queue: int = Field(
+        default=256, description="Events buffered per stream subscriber before dropping the oldest"
+    )
+    stream_heartbeat: float = Field(
+        default=15.0, description="Seconds between keep-alive messages on idle streams"
+    )
+
+    metrics_file: Optional[Path] = Field(
+        default=None, description="Write Prometheus text metrics here when a command exits"
+    )
+    metrics_json: Optional[Path] = Field(
+        default=None, description="Write a JSON metrics dump here when a command exits"
+    )
+    metrics_port: Optional[int] = Field(
+        default=None, description="Serve Prometheus metrics on this local port"
+    )
 
     log_level: str = Field(default="INFO", description="Logging level")
+    log_mode: Literal["development", "production"] = Field(
+        default="development",
+        description="production: background sinks, no diagnose/backtrace",
+    )
     log_file: Path = Field(
         default=Path("logs/weather_scraper.log"), description="Log file path"
     )
@@ -75,5 +268,3 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
-
-settings.ensure_directories()
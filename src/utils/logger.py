@@ -1,35 +1,65 @@
 import sys
-from loguru import logger
+from loguru import logger as _logger
 
 from .config import settings
 
 
+_configured = False
+
+
 def setup_logger():
-    logger.remove()
+    global _configured
+    _configured = True
+
+    settings.ensure_directories()
+
+    # Production mode hands records for both sinks to loguru's worker thread,
+    # so console writes, file writes, rotation and zip compression stay off
+    # the caller; tracebacks skip variable inspection
+    production = settings.log_mode == "production"
+
+    _logger.remove()
 
-    logger.add(
-        sys.stdout,
+    # Console logs go to stderr so stdout carries only command output (e.g. --json)
+    _logger.add(
+        sys.stderr,
         format=settings.log_format,
         level=settings.log_level,
         colorize=True,
-        backtrace=True,
-        diagnose=True,
+        backtrace=not production,
+        diagnose=not production,
+        enqueue=production,
     )
 
-    logger.add(
+    _logger.add(
         settings.log_file,
         format=settings.log_format,
         level=settings.log_level,
         rotation=settings.log_rotation,
         retention=settings.log_retention,
         compression="zip",
-        backtrace=True,
-        diagnose=True,
+        backtrace=not production,
+        diagnose=not production,
+        enqueue=production,
     )
 
-    logger.info("Logger initialized")
-    logger.debug(f"Log level: {settings.log_level}")
-    logger.debug(f"Log file: {settings.log_file}")
+    _logger.info("Logger initialized")
+    _logger.debug("Log level: {} ({} mode)", settings.log_level, settings.log_mode)
+    _logger.debug("Log file: {}", settings.log_file)
+
+
+def debug_enabled() -> bool:
+    """Whether DEBUG records reach a sink; guards work done only to build a message"""
+    return _logger.level(settings.log_level.upper()).no <= _logger.level("DEBUG").no
+
+
+class _LazyLogger:
+    """Loguru logger whose sinks are opened on first use instead of at import"""
+
+    def __getattr__(self, name):
+        if not _configured:
+            setup_logger()
+        return getattr(_logger, name)
 
 
-setup_logger()
+logger = _LazyLogger()
@@ -0,0 +1,208 @@
+"""
+Memory profiling for scrape runs: tracemalloc and RSS checkpoints per stage
+"""
+
+import gc
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .logger import logger
+from .metrics import add_span_listener, browser_rss, process_rss
+
+MB = 1024 * 1024
+
+
+class MemoryCheckpoint(BaseModel):
+    stage: str
+    location_id: Optional[str] = None
+    traced_bytes: int
+    traced_peak_bytes: int
+    rss_bytes: Optional[int] = None
+    browser_rss_bytes: Optional[int] = None
+
+
+class AllocationSite(BaseModel):
+    site: str
+    size_bytes: int
+    size_diff_bytes: int = 0
+    count: int
+
+
+class LocationMemory(BaseModel):
+    location_id: str
+    traced_growth_bytes: int
+    rss_growth_bytes: Optional[int] = None
+    browser_rss_growth_bytes: Optional[int] = None
+    top_sites: List[AllocationSite] = Field(default_factory=list)
+
+
+class MemoryReport(BaseModel):
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    checkpoints: List[MemoryCheckpoint] = Field(default_factory=list)
+    locations: List[LocationMemory] = Field(default_factory=list)
+    top_sites: List[AllocationSite] = Field(default_factory=list)
+    peak_traced_bytes: int = 0
+    peak_rss_bytes: Optional[int] = None
+
+
+def _sites(stats, limit: int) -> List[AllocationSite]:
+    sites = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        sites.append(
+            AllocationSite(
+                site=f"{frame.filename}:{frame.lineno}",
+                size_bytes=stat.size,
+                size_diff_bytes=getattr(stat, "size_diff", 0),
+                count=stat.count,
+            )
+        )
+    return sites
+
+
+# Per task, so overlapping scrapes (serve, schedule, queue workers) tag their own checkpoints
+_current_location: ContextVar[Optional[str]] = ContextVar("memory_profiler_location", default=None)
+
+
+class MemoryProfiler:
+    def __init__(self, frames: int = 1, top: int = 10):
+        self.frames = frames
+        self.top = top
+        self.enabled = False
+        self.report: Optional[MemoryReport] = None
+
+    def start(self):
+        if self.enabled:
+            return
+
+        tracemalloc.start(self.frames)
+        self.enabled = True
+        self.report = MemoryReport(started_at=datetime.now(timezone.utc))
+        add_span_listener(self._on_span)
+        self.checkpoint("start")
+        logger.info("Memory profiling enabled (tracemalloc, process and Chromium RSS)")
+
+    def _on_span(self, name: str):
+        if self.enabled:
+            self.checkpoint(name)
+
+    def checkpoint(self, stage: str) -> Optional[MemoryCheckpoint]:
+        if not self.enabled:
+            return None
+
+        traced, peak = tracemalloc.get_traced_memory()
+        # Each checkpoint reports the peak since the previous one, i.e. of its own stage
+        tracemalloc.reset_peak()
+        rss = process_rss()
+        chromium = browser_rss()
+        checkpoint = MemoryCheckpoint(
+            stage=stage,
+            location_id=_current_location.get(),
+            traced_bytes=traced,
+            traced_peak_bytes=peak,
+            rss_bytes=rss,
+            browser_rss_bytes=chromium,
+        )
+        self.report.checkpoints.append(checkpoint)
+        self.report.peak_traced_bytes = max(self.report.peak_traced_bytes, peak)
+        if rss is not None:
+            self.report.peak_rss_bytes = max(self.report.peak_rss_bytes or 0, rss)
+
+        logger.debug(
+            "Memory at {}: traced {:.1f} MB (peak {:.1f} MB), RSS {} MB, Chromium {} MB",
+            stage,
+            traced / MB,
+            peak / MB,
+            f"{rss / MB:.1f}" if rss is not None else "n/a",
+            f"{chromium / MB:.1f}" if chromium is not None else "n/a",
+        )
+        return checkpoint
+
+    @contextmanager
+    def location(self, location_id: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        # Collect first so growth reflects retained objects, not pending garbage
+        gc.collect()
+        before_snapshot = tracemalloc.take_snapshot()
+        before = self.checkpoint("location_start")
+        token = _current_location.set(location_id)
+        try:
+            yield
+        finally:
+            _current_location.reset(token)
+            gc.collect()
+            after = self.checkpoint("location_end")
+            after.location_id = location_id
+            diff = tracemalloc.take_snapshot().compare_to(before_snapshot, "lineno")
+
+            def growth(field: str) -> Optional[int]:
+                start, end = getattr(before, field), getattr(after, field)
+                return end - start if start is not None and end is not None else None
+
+            self.report.locations.append(
+                LocationMemory(
+                    location_id=location_id,
+                    traced_growth_bytes=after.traced_bytes - before.traced_bytes,
+                    rss_growth_bytes=growth("rss_bytes"),
+                    browser_rss_growth_bytes=growth("browser_rss_bytes"),
+                    top_sites=_sites([stat for stat in diff if stat.size_diff > 0], self.top),
+                )
+            )
+
+    def stop(self) -> Optional[MemoryReport]:
+        if not self.enabled:
+            return None
+
+        gc.collect()
+        self.checkpoint("finish")
+        self.report.top_sites = _sites(tracemalloc.take_snapshot().statistics("lineno"), self.top)
+        self.report.finished_at = datetime.now(timezone.utc)
+        tracemalloc.stop()
+        self.enabled = False
+        return self.report
+
+
+def format_report(report: MemoryReport) -> List[str]:
+    def mb(value: Optional[int]) -> str:
+        return f"{value / MB:.1f}" if value is not None else "n/a"
+
+    lines = [
+        f"{'Stage':<24} {'Location':<12} {'Traced MB':>10} {'Peak MB':>9} {'RSS MB':>8} {'Chromium MB':>12}",
+        "-" * 80,
+    ]
+    for cp in report.checkpoints:
+        lines.append(
+            f"{cp.stage:<24} {cp.location_id or '-':<12} {mb(cp.traced_bytes):>10} "
+            f"{mb(cp.traced_peak_bytes):>9} {mb(cp.rss_bytes):>8} {mb(cp.browser_rss_bytes):>12}"
+        )
+
+    if report.locations:
+        lines += ["", f"{'Location':<12} {'Traced +MB':>11} {'RSS +MB':>9} {'Chromium +MB':>13}", "-" * 48]
+        for loc in report.locations:
+            lines.append(
+                f"{loc.location_id:<12} {mb(loc.traced_growth_bytes):>11} "
+                f"{mb(loc.rss_growth_bytes):>9} {mb(loc.browser_rss_growth_bytes):>13}"
+            )
+            for site in loc.top_sites[:3]:
+                lines.append(f"    +{site.size_diff_bytes / 1024:.1f} KB  {site.site}")
+
+    lines += ["", "Top allocation sites still held at finish:"]
+    for site in report.top_sites:
+        lines.append(f"  {site.size_bytes / 1024:>10.1f} KB  {site.count:>7} blocks  {site.site}")
+
+    lines.append(
+        f"\nPeak traced: {mb(report.peak_traced_bytes)} MB, peak RSS: {mb(report.peak_rss_bytes)} MB"
+    )
+    return lines
+
+
+memory_profiler = MemoryProfiler()
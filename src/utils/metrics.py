@@ -0,0 +1,341 @@
+"""
+In-process metrics: timing spans, counters and gauges with Prometheus/JSON export
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {_format_labels(key) or "_": value for key, value in self._values.items()}
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, help_text)
+        self._callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def _sample(self):
+        if self._callback:
+            value = self._callback()
+            if value is not None:
+                self.set(value)
+
+    def render(self) -> List[str]:
+        self._sample()
+        return super().render()
+
+    def snapshot(self) -> dict:
+        self._sample()
+        return super().snapshot()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+        self._max: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+            self._max[key] = max(self._max.get(key, 0.0), value)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}")
+                total = cumulative + counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {total}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {total}")
+        return lines
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for key, counts in self._counts.items():
+                count = sum(counts)
+                result[_format_labels(key) or "_"] = {
+                    "count": count,
+                    "sum": round(self._sums[key], 6),
+                    "mean": round(self._sums[key] / count, 6) if count else 0.0,
+                    "max": round(self._max[key], 6),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._max.clear()
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "weather_scraper"):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", help_text))
+
+    def gauge(self, name: str, help_text: str, callback: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", help_text, callback))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", help_text, buckets))
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        return {
+            name: {"type": metric.kind, "values": metric.snapshot()}
+            for name, metric in self._metrics.items()
+        }
+
+    def write_prometheus(self, path: Path):
+        # Atomic replace so a textfile collector never reads a half-written file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.render_prometheus(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def write_json(self, path: Path, **metadata):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"metadata": metadata, "metrics": self.snapshot()}
+        path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def _child_pids() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_rss() -> Optional[float]:
+    return _rss_bytes(os.getpid())
+
+
+def browser_rss() -> Optional[float]:
+    """Summed RSS of Chromium processes launched from this process (Linux only)"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = _child_pids()
+    total = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/comm", encoding="utf-8") as f:
+                name = f.read().strip().lower()
+        except OSError:
+            continue
+        if "chrom" in name or "headless_shell" in name:
+            total += _rss_bytes(pid) or 0
+    return total
+
+
+metrics = MetricsRegistry()
+
+span_seconds = metrics.histogram("span_seconds", "Duration of instrumented scrape stages")
+span_failures = metrics.counter("span_failures_total", "Instrumented stages that raised")
+scrape_failures = metrics.counter("scrape_failures_total", "Scrape attempts that failed")
+retries = metrics.counter("retries_total", "Retry attempts scheduled by tenacity")
+rate_limit_waits = metrics.counter("rate_limit_waits_total", "Requests delayed by the rate limiter")
+rate_limit_wait_seconds = metrics.counter("rate_limit_wait_seconds_total", "Time spent waiting on the rate limiter")
+cache_requests = metrics.counter("cache_requests_total", "Forecast cache lookups by result")
+pages_in_flight = metrics.gauge("pages_in_flight", "Browser pages currently open")
+metrics.gauge("process_rss_bytes", "Resident memory of this process", process_rss)
+metrics.gauge("browser_rss_bytes", "Resident memory of child Chromium processes", browser_rss)
+
+
+_span_listeners: List[Callable[[str], None]] = []
+
+
+def add_span_listener(listener: Callable[[str], None]):
+    """Call listener(name) whenever a span ends, e.g. to checkpoint memory per stage"""
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        span_failures.inc(span=name)
+        raise
+    finally:
+        span_seconds.observe(time.perf_counter() - start, span=name)
+        for listener in _span_listeners:
+            listener(name)
+
+
+def timed(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return sync_wrapper
+
+    return decorator
@@ -9,6 +9,7 @@ from typing import Optional
 
 from .config import settings
 from .logger import logger
+from .metrics import rate_limit_wait_seconds, rate_limit_waits
 
 
 class RateLimiter:
@@ -31,8 +32,10 @@ class RateLimiter:
                 wait_seconds = (wait_until - now).total_seconds()
 
                 if wait_seconds > 0:
+                    rate_limit_waits.inc()
+                    rate_limit_wait_seconds.inc(wait_seconds)
                     logger.debug(
-                        f"Rate limit reached. Waiting {wait_seconds:.2f} seconds..."
+                        "Rate limit reached. Waiting {:.2f} seconds...", wait_seconds
                     )
                     await asyncio.sleep(wait_seconds)
 
@@ -16,6 +16,12 @@ from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
 
 from .config import settings
 from .logger import logger
+from .metrics import retries
+
+
+def _before_sleep(retry_state):
+    retries.inc(function=getattr(retry_state.fn, "__name__", "unknown"))
+    before_sleep_log(logger, log_level="WARNING")(retry_state)
 
 
 def retry_on_exception(
@@ -34,7 +40,7 @@ def retry_on_exception(
             stop=stop_after_attempt(max_attempts),
             wait=wait_exponential(multiplier=initial_wait, max=60, exp_base=backoff),
             retry=retry_if_exception_type(exception_types),
-            before_sleep=before_sleep_log(logger, log_level="WARNING"),
+            before_sleep=_before_sleep,
             after=after_log(logger, log_level="DEBUG"),
             reraise=True,
         )
@@ -46,7 +52,7 @@ def retry_on_exception(
             stop=stop_after_attempt(max_attempts),
             wait=wait_exponential(multiplier=initial_wait, max=60, exp_base=backoff),
             retry=retry_if_exception_type(exception_types),
-            before_sleep=before_sleep_log(logger, log_level="WARNING"),
+            before_sleep=_before_sleep,
             after=after_log(logger, log_level="DEBUG"),
             reraise=True,
         )
@@ -64,8 +70,13 @@ def retry_on_exception(
 
 
 def retry_on_browser_error(max_attempts: int = 3) -> Callable:
+    from src.models.exceptions import TransientBrowserException
+
+    # BrowserService raises TransientBrowserException only for timeouts and flaky network
+    # errors; other BrowserExceptions (bad URL, DNS, closed browser) fail straight away
     return retry_on_exception(
         exception_types=(
+            TransientBrowserException,
             PlaywrightTimeoutError,
             TimeoutError,
             ConnectionError,
@@ -0,0 +1,75 @@
+"""
+Single-flight call coalescing for concurrent async work
+"""
+
+import asyncio
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .logger import logger
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            logger.debug("Joining in-flight call for {}", key)
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shield so one cancelled caller does not cancel the shared call
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # The last caller gave up; nobody is left to retrieve the result
+                if not task.done():
+                    logger.debug("Cancelling abandoned call for {}", key)
+                    task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def _instance_flights(owner: Any) -> SingleFlight:
+    flights = owner.__dict__.get("_single_flights")
+    if flights is None:
+        flights = owner.__dict__["_single_flights"] = SingleFlight()
+    return flights
+
+
+def single_flight(
+    key: Callable[..., Hashable], group: Optional[SingleFlight] = None
+) -> Callable:
+    """Coalesce concurrent calls with the same key.
+
+    Without an explicit group the decorated method gets one group per instance,
+    so calls are only shared between callers of the same scraper.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            flights = group if group is not None else _instance_flights(args[0])
+            return await flights.do(key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
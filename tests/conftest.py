@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.parsers.bbc_parser import BBCWeatherParser
+from src.standin.pages import build_page
+
+ISSUED = datetime(2026, 3, 1, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def make_weather():
+    """WeatherData parsed from a stand-in page, as a scrape would produce it"""
+    parser = BBCWeatherParser()
+
+    def make(location_id: str = "2643743", issued_at: datetime = ISSUED, name: str = "London"):
+        return parser.parse_html(build_page(location_id, issued_at=issued_at, filler_kb=0), name)
+
+    return make
@@ -0,0 +1,72 @@
+import copy
+from datetime import datetime, timezone
+
+import pytest
+
+from src.parsers import bbc_parser
+from src.parsers.bbc_parser import BBCWeatherParser
+from src.standin.pages import build_forecast_json
+from src.utils.config import settings
+
+ISSUED = datetime(2026, 3, 1, 6, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def incremental_parse(monkeypatch):
+    monkeypatch.setattr(settings, "incremental_parse", True)
+    bbc_parser._day_cache.clear()
+
+
+def counts():
+    return bbc_parser.parse_days.value(result="built"), bbc_parser.parse_days.value(result="reused")
+
+
+def restamp(page: dict, stamp: str) -> dict:
+    page = copy.deepcopy(page)
+    for block in page["data"]["forecasts"]:
+        block["detailed"]["issueDate"] = stamp
+        block["detailed"]["lastUpdated"] = stamp
+    return page
+
+
+def test_reissue_with_only_new_timestamps_reuses_every_day():
+    parser = BBCWeatherParser()
+    page = build_forecast_json("2643743", issued_at=ISSUED, seed=1)
+    first = parser.build_response(page)
+
+    built, reused = counts()
+    second = parser.build_response(restamp(page, "2026-03-01T07:00:00Z"))
+
+    assert counts() == (built, reused + len(page["data"]["forecasts"]))
+    for old, new in zip(first.data.forecasts, second.data.forecasts):
+        assert new.detailed.issue_date == datetime(2026, 3, 1, 7, tzinfo=timezone.utc)
+        assert new.detailed.last_updated == datetime(2026, 3, 1, 7, tzinfo=timezone.utc)
+        assert old.detailed.issue_date == ISSUED
+        assert new.detailed.reports == old.detailed.reports
+        assert new.summary == old.summary
+
+
+def test_reused_days_match_a_full_parse():
+    parser = BBCWeatherParser()
+    page = build_forecast_json("2643743", issued_at=ISSUED, seed=1)
+    parser.build_response(page)
+    reissued = restamp(page, "2026-03-01T07:00:00Z")
+    reissued["data"]["forecasts"][3]["detailed"]["reports"][0]["temperatureC"] += 5
+
+    built, reused = counts()
+    incremental = parser.build_response(reissued)
+    assert counts() == (built + 1, reused + len(page["data"]["forecasts"]) - 1)
+
+    settings.incremental_parse = False
+    full = parser.build_response(reissued)
+    assert incremental.model_dump() == full.model_dump()
+
+
+def test_reused_reports_are_fresh_objects():
+    parser = BBCWeatherParser()
+    page = build_forecast_json("2643743", issued_at=ISSUED, seed=1)
+    first = parser.build_response(page)
+    first.data.forecasts[0].detailed.reports[0].dew_point_c = 1.5
+
+    second = parser.build_response(page)
+    assert second.data.forecasts[0].detailed.reports[0].dew_point_c is None
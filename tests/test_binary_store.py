@@ -0,0 +1,127 @@
+import asyncio
+import multiprocessing
+from datetime import timedelta
+
+from src.analytics.frame import ForecastFrame
+from src.parsers.bbc_parser import BBCWeatherParser
+from src.standin.pages import build_page
+from src.storage.binary_store import RECORD, BinaryStore, pack
+from src.storage.json_storage import JSONStorage
+from src.utils.config import settings
+from src.utils.logger import logger
+from tests.conftest import ISSUED
+
+
+def test_store_inside_archive_dir_is_not_read_as_snapshots(tmp_path, monkeypatch, make_weather):
+    archive_dir = tmp_path / "archive"
+    monkeypatch.setattr(settings, "binary_dir", archive_dir / "binary")
+    monkeypatch.setattr(settings, "storage_layout", "flat")
+    weather = make_weather()
+    BinaryStore().append(weather)
+    asyncio.run(JSONStorage(archive_dir).save(weather))
+
+    warnings = []
+    sink = logger.add(warnings.append, level="WARNING")
+    try:
+        frame = ForecastFrame.from_directory(archive_dir)
+    finally:
+        logger.remove(sink)
+    assert warnings == []
+    assert frame.snapshots == 1
+    assert len(frame) == len(weather.hourly_forecast)
+
+
+def test_lookup_returns_latest_snapshot_per_slot(tmp_path, make_weather):
+    store = BinaryStore(tmp_path)
+    first = make_weather()
+    second = make_weather(issued_at=ISSUED + timedelta(hours=1))
+    second.hourly_forecast[0].temperature_c = first.hourly_forecast[1].temperature_c + 3
+    store.append(first)
+    store.append(second)
+
+    latest = store.lookup("2643743", "2026-03-01T07:00")
+    assert latest["temperature_c"].tolist() == [second.hourly_forecast[0].temperature_c]
+    both = store.lookup("2643743", "2026-03-01T07:00", latest=False)
+    assert both["temperature_c"].tolist() == [first.hourly_forecast[1].temperature_c, second.hourly_forecast[0].temperature_c]
+    assert store.lookup("2643743", "2026-03-01T06:00", "2026-03-02T00:00").size == 18
+    assert store.lookup("0000000", "2026-03-01T07:00").size == 0
+    assert store.latest_update("2643743") == int(second.last_updated.timestamp())
+
+
+def test_decode_round_trips_reports(tmp_path, make_weather):
+    store = BinaryStore(tmp_path)
+    weather = make_weather()
+    store.append(weather)
+
+    rows = store.decode(store.lookup("2643743", "2026-03-01T00:00", "2026-03-03T00:00"))
+    assert len(rows) == 42
+    for row, report in zip(rows, weather.hourly_forecast):
+        assert row["location_id"] == "2643743"
+        assert (row["local_date"], row["timeslot"]) == (report.local_date.isoformat(), report.timeslot)
+        assert row["temperature_c"] == report.temperature_c
+        assert row["wind_direction_full"] == report.wind_direction_full
+        assert row["dew_point_c"] == round(report.dew_point_c, 2)
+
+
+def test_segments_roll_over_and_survive_reopening(tmp_path, make_weather):
+    store = BinaryStore(tmp_path, segment_records=400)
+    for hour in range(3):
+        store.append(make_weather(issued_at=ISSUED + timedelta(hours=hour)))
+
+    paths = store.segment_paths()
+    assert len(paths) == 3
+    assert all(path.with_suffix(".idx.npy").exists() for path in paths[:-1])
+
+    reopened = BinaryStore(tmp_path)
+    assert reopened.stats().records == store.stats().records
+    assert reopened.lookup("2643743", "2026-03-01T12:00", latest=False).size == 3
+
+
+def test_partial_trailing_record_is_ignored_then_overwritten(tmp_path, make_weather):
+    store = BinaryStore(tmp_path)
+    weather = make_weather()
+    store.append(weather)
+    with open(store.segment_paths()[-1], "ab") as f:
+        f.write(b"\x01" * (RECORD.itemsize // 2))
+
+    reopened = BinaryStore(tmp_path)
+    assert reopened.stats().records == len(weather.hourly_forecast)
+    reopened.append(make_weather(issued_at=ISSUED + timedelta(hours=1)))
+    assert BinaryStore(tmp_path).stats().records == len(weather.hourly_forecast) * 2 - 1
+
+
+def test_pack_appends_only_newer_snapshots(tmp_path, monkeypatch, make_weather):
+    monkeypatch.setattr(settings, "storage_layout", "flat")
+    output_dir = tmp_path / "data"
+    storage = JSONStorage(output_dir)
+    for hour in range(2):
+        asyncio.run(storage.save(make_weather(issued_at=ISSUED + timedelta(hours=hour)), f"london_{hour}"))
+
+    store = BinaryStore(tmp_path / "binary")
+    assert pack(output_dir, tmp_path / "archive", store) == (2, 330 + 329)
+    assert pack(output_dir, tmp_path / "archive", store) == (0, 0)
+
+
+def _append_location(directory, location_id):
+    store = BinaryStore(directory)
+    parser = BBCWeatherParser()
+    for hour in range(3):
+        page = build_page(location_id, issued_at=ISSUED + timedelta(hours=hour), filler_kb=0)
+        store.append(parser.parse_html(page, location_id))
+
+
+def test_concurrent_processes_share_one_string_dictionary(tmp_path):
+    location_ids = ["2643743", "2643123", "2653822", "2655603"]
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_location, args=(tmp_path, location_id)) for location_id in location_ids]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert [worker.exitcode for worker in workers] == [0] * len(workers)
+
+    store = BinaryStore(tmp_path)
+    assert store.stats().locations == len(location_ids)
+    for location_id in location_ids:
+        rows = store.decode(store.lookup(location_id, "2026-03-01T09:00", latest=False))
+        assert [row["location_id"] for row in rows] == [location_id] * 3
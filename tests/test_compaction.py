@@ -0,0 +1,132 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.storage.base import partition_dir
+from src.storage.compaction import SnapshotArchive, compact, stored_snapshots
+from tests.conftest import ISSUED
+
+LONDON, LEEDS = "2643743", "2644688"
+SAVED = datetime(2026, 3, 1, 6, 5)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    return tmp_path / "data", tmp_path / "archive"
+
+
+def write_snapshot(output_dir, weather, saved_at=SAVED):
+    directory = output_dir / partition_dir(saved_at.date(), weather.location_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"weather_{weather.location_id}_{saved_at:%Y%m%d_%H%M%S}.json"
+    path.write_text(weather.model_dump_json(), encoding="utf-8")
+    return path
+
+
+def write_crawl(output_dir, snapshots, extra_lines=(), saved_at=SAVED):
+    path = output_dir / f"crawl_{saved_at:%Y%m%d_%H%M%S}.jsonl"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(weather.model_dump_json() + "\n" for weather in snapshots)
+        f.writelines(extra_lines)
+    return path
+
+
+def test_compact_by_location_round_trips_and_removes_sources(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    london = [make_weather(LONDON, ISSUED + timedelta(hours=hour)) for hour in range(2)]
+    leeds = make_weather(LEEDS, name="Leeds")
+    for hour, weather in enumerate(london):
+        write_snapshot(output_dir, weather, SAVED + timedelta(hours=hour))
+    write_snapshot(output_dir, leeds)
+
+    result = compact(output_dir, archive_dir, older_than_days=0)
+    assert (result.files, result.archives, result.skipped) == (3, 2, 0)
+    assert 0 < result.bytes_after < result.bytes_before
+    assert sorted(path.name for path in archive_dir.glob("*.jsonl.gz")) == [
+        f"location={LONDON}.jsonl.gz",
+        f"location={LEEDS}.jsonl.gz",
+    ]
+    assert list(output_dir.iterdir()) == []
+
+    archive = SnapshotArchive(archive_dir)
+    assert archive.history(LONDON) == london
+    assert archive.history(LEEDS) == [leeds]
+    assert compact(output_dir, archive_dir, older_than_days=0).files == 0
+
+
+def test_compact_by_day_respects_cutoff(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    saved_at = datetime.now() - timedelta(days=3)
+    old = write_snapshot(output_dir, make_weather(LONDON), saved_at)
+    recent = write_snapshot(output_dir, make_weather(LEEDS, name="Leeds"), datetime.now())
+
+    result = compact(output_dir, archive_dir, by="day", older_than_days=1)
+    assert (result.files, result.archives) == (1, 1)
+    assert (archive_dir / f"date={saved_at.date().isoformat()}.jsonl.gz").exists()
+    assert not old.exists() and recent.exists()
+
+
+def test_sources_already_in_manifest_are_not_archived_twice(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    path = write_snapshot(output_dir, make_weather(LONDON))
+
+    assert compact(output_dir, archive_dir, older_than_days=0, keep_sources=True).files == 1
+    assert path.exists()
+    # As if a run died after committing the manifest but before deleting its sources
+    assert compact(output_dir, archive_dir, older_than_days=0).files == 0
+    assert not path.exists()
+    assert len(SnapshotArchive(archive_dir).entries(LONDON)) == 1
+
+
+def test_crawl_file_lines_are_archived_individually(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    snapshots = [make_weather(LONDON), make_weather(LEEDS, name="Leeds")]
+    path = write_crawl(output_dir, snapshots)
+
+    result = compact(output_dir, archive_dir, older_than_days=0)
+    assert (result.files, result.archives) == (2, 2)
+    assert not path.exists()
+    entries = SnapshotArchive(archive_dir).entries()
+    assert sorted(entry.source for entry in entries) == [f"{path.name}#0", f"{path.name}#1"]
+    assert SnapshotArchive(archive_dir).history(LEEDS) == snapshots[1:]
+
+
+def test_crawl_file_with_unreadable_lines_is_kept(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    path = write_crawl(output_dir, [make_weather(LONDON)], ['{"truncated": \n'])
+
+    result = compact(output_dir, archive_dir, older_than_days=0)
+    assert (result.files, result.skipped) == (1, 1)
+    assert path.exists()
+    assert compact(output_dir, archive_dir, older_than_days=0).files == 0
+
+
+def test_uncommitted_archive_tail_is_dropped(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    write_snapshot(output_dir, make_weather(LONDON))
+    compact(output_dir, archive_dir, older_than_days=0)
+    archive_path = archive_dir / f"location={LONDON}.jsonl.gz"
+    with open(archive_path, "ab") as f:
+        f.write(b"\x1f\x8b partial member")
+
+    later = make_weather(LONDON, ISSUED + timedelta(hours=1))
+    write_snapshot(output_dir, later, SAVED + timedelta(hours=1))
+    compact(output_dir, archive_dir, older_than_days=0)
+    assert SnapshotArchive(archive_dir).history(LONDON)[-1] == later
+
+
+def test_stored_snapshots_merges_loose_files_and_archives(dirs, make_weather):
+    output_dir, archive_dir = dirs
+    first = make_weather(LONDON)
+    second = make_weather(LONDON, ISSUED + timedelta(hours=1))
+    write_snapshot(output_dir, first)
+    compact(output_dir, archive_dir, older_than_days=0)
+    write_crawl(output_dir, [second], saved_at=SAVED + timedelta(hours=1))
+
+    found = [(location_id, data["last_updated"]) for location_id, data, _ in stored_snapshots(output_dir, archive_dir)]
+    assert found == [
+        (LONDON, json.loads(first.model_dump_json())["last_updated"]),
+        (LONDON, json.loads(second.model_dump_json())["last_updated"]),
+    ]
@@ -0,0 +1,77 @@
+import multiprocessing
+from datetime import datetime
+
+import pytest
+
+from benchmarks.delta_archive import evolving_history
+from src.storage.delta_archive import DeltaArchive, KEYFRAME
+
+LOCATION_ID = "2643743"
+
+
+@pytest.fixture(scope="module")
+def history():
+    return list(evolving_history(LOCATION_ID, 30))
+
+
+@pytest.mark.parametrize("codec", ["gzip", "lzma"])
+def test_history_round_trips(tmp_path, history, codec):
+    archive = DeltaArchive(tmp_path, codec=codec, keyframe_interval=8)
+    assert all(archive.append(snapshot) for snapshot in history)
+
+    reopened = DeltaArchive(tmp_path, codec=codec, keyframe_interval=8)
+    assert list(reopened.history(LOCATION_ID)) == history
+    assert reopened.get(LOCATION_ID, 17) == history[17]
+    assert reopened.get(LOCATION_ID, -1) == history[-1]
+    kinds = [record.kind for record in reopened.records(LOCATION_ID)]
+    assert kinds[0] == KEYFRAME and kinds.count(KEYFRAME) >= len(history) // 8
+
+
+def test_at_picks_newest_snapshot_not_after(tmp_path, history):
+    archive = DeltaArchive(tmp_path, codec="gzip", keyframe_interval=8)
+    for snapshot in history:
+        archive.append(snapshot)
+
+    when = datetime.fromisoformat(history[10]["last_updated"].replace("Z", "+00:00"))
+    assert archive.at(LOCATION_ID, when) == history[10]
+    with pytest.raises(IndexError):
+        archive.at(LOCATION_ID, datetime(2000, 1, 1))
+
+
+def test_identical_and_older_snapshots_are_skipped(tmp_path, history):
+    archive = DeltaArchive(tmp_path, codec="gzip")
+    assert archive.append(history[5])
+    assert not archive.append(history[5])
+    assert not archive.append(history[2])
+    assert archive.count(LOCATION_ID) == 1
+
+
+def test_torn_record_is_overwritten(tmp_path, history):
+    archive = DeltaArchive(tmp_path, codec="gzip", keyframe_interval=8)
+    for snapshot in history[:5]:
+        archive.append(snapshot)
+    with open(archive.path(LOCATION_ID), "ab") as f:
+        f.write(b"WD\x01\x01partial")
+
+    reopened = DeltaArchive(tmp_path, codec="gzip", keyframe_interval=8)
+    assert reopened.count(LOCATION_ID) == 5
+    assert reopened.append(history[5])
+    assert list(DeltaArchive(tmp_path, codec="gzip").history(LOCATION_ID)) == history[:6]
+
+
+def _append_all(directory, snapshots):
+    archive = DeltaArchive(directory, codec="gzip", keyframe_interval=8)
+    for snapshot in snapshots:
+        archive.append(snapshot)
+
+
+def test_concurrent_processes_append_each_snapshot_once(tmp_path, history):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_all, args=(tmp_path, history)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert [worker.exitcode for worker in workers] == [0] * len(workers)
+
+    assert list(DeltaArchive(tmp_path, codec="gzip").history(LOCATION_ID)) == history
@@ -0,0 +1,176 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from src.models.exceptions import QueueException
+from src.models.location import Location
+from src.services.job_queue import DEAD, DONE, LEASED, PENDING, JobQueue
+from src.services.queue_worker import QueueWorker
+from src.utils.config import settings
+
+LOCATIONS = [Location(location_id=str(2643740 + i), name=f"Location {i}") for i in range(5)]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "retry_initial_wait", 0)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "queue.db", lease_seconds=30, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_skips_locations_already_in_the_batch(queue):
+    assert queue.enqueue(LOCATIONS[:3]) == 3
+    assert queue.enqueue(LOCATIONS) == 2
+    assert queue.enqueue(LOCATIONS[:2], batch="other") == 2
+    assert queue.stats() == {PENDING: 7, LEASED: 0, DONE: 0, DEAD: 0}
+    assert queue.stats("other")[PENDING] == 2
+
+
+def test_lease_hands_out_each_job_once_in_order(queue):
+    queue.enqueue(LOCATIONS[:2])
+    first = queue.lease("a")
+    second = queue.lease("b")
+    assert [first.location_id, second.location_id] == [LOCATIONS[0].location_id, LOCATIONS[1].location_id]
+    assert first.attempts == 1 and first.lease_owner == "a"
+    assert queue.lease("c") is None
+
+    queue.ack(first, "a", "data/london.json")
+    assert queue.stats() == {PENDING: 0, LEASED: 1, DONE: 1, DEAD: 0}
+    assert queue.has_unfinished()
+
+
+def test_only_the_lease_owner_can_settle_a_job(queue):
+    queue.enqueue(LOCATIONS[:1])
+    job = queue.lease("a")
+    for action in (lambda: queue.ack(job, "b"), lambda: queue.nack(job, "b", "boom"), lambda: queue.release(job, "b")):
+        with pytest.raises(QueueException):
+            action()
+    queue.ack(job, "a")
+    with pytest.raises(QueueException):
+        queue.ack(job, "a")
+
+
+def test_failed_jobs_retry_then_dead_letter(queue):
+    queue.enqueue(LOCATIONS[:1])
+    assert queue.nack(queue.lease("a"), "a", "timeout") == PENDING
+    job = queue.lease("a")
+    assert job.attempts == 2
+    assert queue.nack(job, "a", "timeout again") == DEAD
+    assert queue.lease("a") is None
+    assert not queue.has_unfinished()
+
+    [dead] = queue.dead_jobs()
+    assert dead.last_error == "timeout again"
+    assert queue.retry_dead() == 1
+    assert queue.lease("a").attempts == 1
+
+
+def test_release_does_not_spend_an_attempt(queue):
+    queue.enqueue(LOCATIONS[:1])
+    queue.release(queue.lease("a"), "a")
+    assert queue.lease("b").attempts == 1
+
+
+def test_expired_lease_goes_to_another_worker(tmp_path):
+    queue = JobQueue(tmp_path / "queue.db", lease_seconds=0.05, max_attempts=3)
+    queue.enqueue(LOCATIONS[:1])
+    stale = queue.lease("a")
+    time.sleep(0.1)
+
+    job = queue.lease("b")
+    assert job.id == stale.id and job.attempts == 2
+    assert job.last_error == "lease expired"
+    with pytest.raises(QueueException):
+        queue.ack(stale, "a")
+    queue.ack(job, "b")
+    queue.close()
+
+
+def test_expired_lease_on_last_attempt_dead_letters(tmp_path):
+    queue = JobQueue(tmp_path / "queue.db", lease_seconds=0.05, max_attempts=1)
+    queue.enqueue(LOCATIONS[:1])
+    queue.lease("a")
+    time.sleep(0.1)
+
+    assert queue.lease("b") is None
+    assert queue.stats()[DEAD] == 1
+    queue.close()
+
+
+def _drain(db_path, worker_id, results):
+    queue = JobQueue(db_path, lease_seconds=30)
+    while (job := queue.lease(worker_id)) is not None:
+        queue.ack(job, worker_id, worker_id)
+        results.put(job.location_id)
+    queue.close()
+
+
+def test_concurrent_workers_never_share_a_job(tmp_path):
+    locations = [Location(location_id=str(i), name=f"Location {i}") for i in range(200)]
+    queue = JobQueue(tmp_path / "queue.db")
+    queue.enqueue(locations)
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_drain, args=(tmp_path / "queue.db", f"w{i}", results)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    leased = [results.get(timeout=60) for _ in locations]
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert sorted(leased, key=int) == [location.location_id for location in locations]
+    assert queue.stats() == {PENDING: 0, LEASED: 0, DONE: 200, DEAD: 0}
+    queue.close()
+
+
+class FakeScraper:
+    def __init__(self, failing=(), delay=0.0):
+        self.failing = set(failing)
+        self.delay = delay
+
+    async def scrape(self, location):
+        await asyncio.sleep(self.delay)
+        if location.location_id in self.failing:
+            raise RuntimeError(f"no forecast for {location.location_id}")
+        return location
+
+
+class FakeStorage:
+    async def save(self, weather_data):
+        return f"data/{weather_data.location_id}.json"
+
+
+def test_worker_acks_successes_and_dead_letters_failures(queue):
+    queue.enqueue(LOCATIONS)
+    failing = LOCATIONS[1].location_id
+    worker = QueueWorker(queue, FakeScraper(failing=[failing]), FakeStorage(), worker_id="w", poll_interval=0.01)
+
+    asyncio.run(worker.run())
+    assert (worker.processed, worker.failed) == (4, 2)
+    assert queue.stats() == {PENDING: 0, LEASED: 0, DONE: 4, DEAD: 1}
+    [dead] = queue.dead_jobs()
+    assert dead.location_id == failing and "no forecast" in dead.last_error
+
+
+def test_worker_renews_the_lease_of_a_slow_job(tmp_path):
+    queue = JobQueue(tmp_path / "queue.db", lease_seconds=0.15, max_attempts=1)
+    queue.enqueue(LOCATIONS[:1])
+    slow = QueueWorker(queue, FakeScraper(delay=0.5), FakeStorage(), worker_id="slow", poll_interval=0.01)
+    # Polls throughout the slow job, so an expired lease would be taken over (and dead-lettered)
+    other = QueueWorker(queue, FakeScraper(), FakeStorage(), worker_id="other", poll_interval=0.01)
+
+    async def run_both():
+        await asyncio.gather(slow.run(), other.run())
+
+    asyncio.run(run_both())
+    assert (slow.processed, other.processed) == (1, 0)
+    assert queue.stats()[DONE] == 1
+    queue.close()